@@ -1,7 +1,11 @@
 # LinkedIn Profile Scraper
 import os
+import copy
 import json
 import re
+import time
+import atexit
+import threading
 from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.webdriver.common.by import By
@@ -14,16 +18,134 @@ from selenium.common.exceptions import NoSuchElementException, TimeoutException,
 from time import sleep
 from dotenv import load_dotenv
 
-def scrape_linkedin_profile(profile_url):
+# Logged-in browsers kept open between scrapes (and opened ahead of the first
+# one by warm_up()), so a scrape skips browser startup and the LinkedIn login.
+# 0 opens and closes a browser for every scrape.
+SCRAPER_POOL_SIZE = int(os.getenv("SCRAPER_POOL_SIZE", "1"))
+# Idle browsers older than this are closed instead of reused, as their LinkedIn session may have lapsed
+SCRAPER_POOL_MAX_IDLE = float(os.getenv("SCRAPER_POOL_MAX_IDLE", "900"))
+
+# Common options for all browsers
+COMMON_ARGS = [
+    # "--headless",
+    "--disable-gpu",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--disable-extensions",
+    "--disable-notifications"
+]
+
+# Browsers in the order they are tried, with their options classes
+BROWSERS = (("Chrome", ChromeOptions), ("Edge", EdgeOptions), ("Firefox", FirefoxOptions))
+
+# The browser that last started, tried first so later launches skip the discovery
+_browser = None
+# (driver, time it became idle) of the logged-in browsers waiting for a scrape
+_idle_drivers = []
+_pool_lock = threading.Lock()
+
+def launch_driver():
     """
-    Scrape LinkedIn profile data based on the provided URL
-
-    Args:
-        profile_url (str): LinkedIn profile URL to scrape
+    Start a browser: the one that started last time, otherwise the first of
+    Chrome, Edge and Firefox that is installed.
 
     Returns:
-        dict: Profile data including name, headline, about, experience, education, and skills
+        WebDriver: The new browser session.
     """
+    global _browser
+    for name, options_class in sorted(BROWSERS, key=lambda browser: browser[0] != _browser):
+        options = options_class()
+        for arg in COMMON_ARGS:
+            options.add_argument(arg)
+        try:
+            driver = getattr(webdriver, name)(options=options)
+        except WebDriverException:
+            continue
+        print(f"Using {name} WebDriver")
+        _browser = name
+        return driver
+    raise Exception("Could not initialize any WebDriver. Please make sure Chrome, Edge, or Firefox WebDriver is installed.")
+
+def login(driver):
+    """
+    Log a browser in to LinkedIn with EMAIL and PASSWORD, unless its session already is.
+
+    Raises:
+        Exception: If the login fails.
+    """
+    print(f"Navigating to LinkedIn login page...")
+    driver.get('https://www.linkedin.com/login')
+
+    # Wait for the page to load
+    sleep(2)
+
+    # Check if we're already logged in
+    if "Feed" in driver.title:
+        print("Already logged in to LinkedIn")
+        return
+
+    print("Logging in to LinkedIn...")
+    # Find username and password fields
+    try:
+        # Wait for the username field to be present
+        wait = WebDriverWait(driver, 10)
+        email_field = wait.until(EC.presence_of_element_located((By.ID, 'username')))
+        email_field.clear()
+        email_field.send_keys(os.environ['EMAIL'])
+
+        # Find and fill password field
+        password_field = driver.find_element(By.ID, 'password')
+        password_field.clear()
+        password_field.send_keys(os.environ['PASSWORD'])
+
+        # Submit the form
+        password_field.submit()
+        sleep(30)
+        # Wait for login to complete
+        print("Waiting for login to complete...")
+        wait.until(EC.url_contains('feed'))
+        print("Login successful")
+    except Exception as e:
+        print(f"Login error: {e}")
+        # Take a screenshot for debugging
+        driver.save_screenshot('login_error.png')
+        raise Exception(f"Failed to login: {e}")
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception as e:
+        print(f"Error closing browser: {e}")
+
+def _take_driver():
+    """
+    Return (driver, logged_in): an idle pooled browser that is still
+    running, or a newly launched one that still has to log in.
+    """
+    while True:
+        with _pool_lock:
+            if not _idle_drivers:
+                break
+            driver, idle_since = _idle_drivers.pop()
+        if time.monotonic() - idle_since <= SCRAPER_POOL_MAX_IDLE:
+            try:
+                driver.title  # Fails when the browser has been closed or crashed
+                return driver, True
+            except WebDriverException:
+                pass
+        _quit(driver)
+    return launch_driver(), False
+
+def _return_driver(driver, reusable):
+    # Keep a logged-in browser for the next scrape while the pool has room
+    if reusable:
+        with _pool_lock:
+            if len(_idle_drivers) < SCRAPER_POOL_SIZE:
+                _idle_drivers.append((driver, time.monotonic()))
+                return
+    _quit(driver)
+
+def _check_credentials():
     # Load environment variables
     load_dotenv()
 
@@ -31,87 +153,78 @@ def scrape_linkedin_profile(profile_url):
     if 'EMAIL' not in os.environ or 'PASSWORD' not in os.environ:
         raise ValueError("LinkedIn credentials not found in environment variables")
 
-    # Try to initialize a driver with available browsers
-    driver = None
-    browser_options = None
-
-    # Common options for all browsers
-    common_args = [
-        # "--headless",
-        "--disable-gpu",
-        "--no-sandbox",
-        "--disable-dev-shm-usage",
-        "--disable-extensions",
-        "--disable-notifications"
-    ]
-
-    # Try Chrome first
-    try:
-        chrome_options = ChromeOptions()
-        for arg in common_args:
-            chrome_options.add_argument(arg)
-        driver = webdriver.Chrome(options=chrome_options)
-        print("Using Chrome WebDriver")
-    except WebDriverException:
-        # Try Edge next
+def warm_up(browsers=None):
+    """
+    Find a working browser, then launch and log in browsers ahead of the
+    first scrape and leave them in the pool.
+
+    Args:
+        browsers (int): How many to open; defaults to SCRAPER_POOL_SIZE. With
+            0 a browser is only started once, to find which one is installed.
+
+    Returns:
+        dict: The browser used, how many are logged in and waiting, and the seconds it took.
+    """
+    _check_credentials()
+    start = time.perf_counter()
+    count = SCRAPER_POOL_SIZE if browsers is None else browsers
+    if count <= 0:
+        _quit(launch_driver())
+    for _ in range(count):
+        driver = launch_driver()
         try:
-            edge_options = EdgeOptions()
-            for arg in common_args:
-                edge_options.add_argument(arg)
-            driver = webdriver.Edge(options=edge_options)
-            print("Using Edge WebDriver")
-        except WebDriverException:
-            # Try Firefox as last resort
-            try:
-                firefox_options = FirefoxOptions()
-                for arg in common_args:
-                    firefox_options.add_argument(arg)
-                driver = webdriver.Firefox(options=firefox_options)
-                print("Using Firefox WebDriver")
-            except WebDriverException:
-                raise Exception("Could not initialize any WebDriver. Please make sure Chrome, Edge, or Firefox WebDriver is installed.")
+            login(driver)
+        except BaseException:
+            _quit(driver)
+            raise
+        _return_driver(driver, True)
+    return {"browser": _browser, "logged_in": len(_idle_drivers), "seconds": round(time.perf_counter() - start, 4)}
+
+def close_idle_browsers():
+    """
+    Quit the browsers waiting in the pool, e.g. when the worker shuts down.
+    """
+    with _pool_lock:
+        drivers = [driver for driver, _ in _idle_drivers]
+        _idle_drivers.clear()
+    for driver in drivers:
+        _quit(driver)
 
-    if not driver:
-        raise Exception("Failed to initialize WebDriver")
+atexit.register(close_idle_browsers)
 
-    try:
-        # Login to LinkedIn
-        print(f"Navigating to LinkedIn login page...")
-        driver.get('https://www.linkedin.com/login')
+def visible_text(element):
+    """
+    Return an element's text once. LinkedIn renders most text twice, in an
+    aria-hidden span and again in a visually-hidden span for screen readers,
+    and get_text() would return both copies run together.
+    """
+    if not element.find(attrs={'aria-hidden': 'true'}):
+        return element.get_text().strip()
+    element = copy.copy(element)
+    for hidden in element.find_all(class_='visually-hidden'):
+        hidden.decompose()
+    return element.get_text().strip()
 
-        # Wait for the page to load
-        sleep(2)
+def scrape_linkedin_profile(profile_url):
+    """
+    Scrape LinkedIn profile data based on the provided URL
 
-        # Check if we're already logged in
-        if "Feed" in driver.title:
-            print("Already logged in to LinkedIn")
-        else:
-            print("Logging in to LinkedIn...")
-            # Find username and password fields
-            try:
-                # Wait for the username field to be present
-                wait = WebDriverWait(driver, 10)
-                email_field = wait.until(EC.presence_of_element_located((By.ID, 'username')))
-                email_field.clear()
-                email_field.send_keys(os.environ['EMAIL'])
-
-                # Find and fill password field
-                password_field = driver.find_element(By.ID, 'password')
-                password_field.clear()
-                password_field.send_keys(os.environ['PASSWORD'])
-
-                # Submit the form
-                password_field.submit()
-                sleep(30)
-                # Wait for login to complete
-                print("Waiting for login to complete...")
-                wait.until(EC.url_contains('feed'))
-                print("Login successful")
-            except Exception as e:
-                print(f"Login error: {e}")
-                # Take a screenshot for debugging
-                driver.save_screenshot('login_error.png')
-                raise Exception(f"Failed to login: {e}")
+    Args:
+        profile_url (str): LinkedIn profile URL to scrape
+
+    Returns:
+        dict: Profile data including name, headline, about, experience, education, and skills
+    """
+    _check_credentials()
+
+    # Reuse a logged-in browser from the pool, or start one
+    driver, logged_in = _take_driver()
+    reusable = False
+
+    try:
+        # Login to LinkedIn
+        if not logged_in:
+            login(driver)
 
         # Navigate to the profile URL
         print(f"Navigating to profile: {profile_url}")
@@ -159,7 +272,7 @@ def scrape_linkedin_profile(profile_url):
                     name_element = main_content.find('h1')
 
             if name_element:
-                name = name_element.get_text().strip()
+                name = visible_text(name_element)
                 profile_data['name'] = name
                 print(f"Found name: {name}")
             else:
@@ -191,7 +304,7 @@ def scrape_linkedin_profile(profile_url):
                         break
 
             if headline_element:
-                headline = headline_element.get_text().strip()
+                headline = visible_text(headline_element)
                 profile_data['headline'] = headline
                 print(f"Found headline: {headline}")
             else:
@@ -257,7 +370,7 @@ def scrape_linkedin_profile(profile_url):
                             break
 
             if about_element:
-                about_text = about_element.get_text().strip()
+                about_text = visible_text(about_element)
                 profile_data['about'] = about_text
                 print(f"Found about section: {about_text[:50]}...")
             else:
@@ -429,12 +542,12 @@ def scrape_linkedin_profile(profile_url):
             print(f"Error extracting skills: {e}")
 
         # Return the profile data
+        reusable = True
         return profile_data
     except Exception as e:
         print(f"Error scraping LinkedIn profile: {e}")
         return {"error": str(e)}
     finally:
-        # Always close the driver
-        if driver:
-            driver.quit()
+        # Keep the browser for the next scrape, or close it after a failure
+        _return_driver(driver, reusable)
 
@@ -0,0 +1,434 @@
+"""
+Admission control for the expensive endpoints.
+
+Each endpoint gets a limiter that runs at most `limit` requests at once and
+keeps at most `queue` more waiting, each for at most `queue_timeout`
+seconds. A request that finds the queue full or waits too long is turned
+away with 429 and a Retry-After estimated from how long requests have
+recently held a slot, so a burst sheds load quickly instead of starting
+a browser or an LLM call for every request.
+
+Defaults are sized per kind of work: browser-bound endpoints by MAX_BROWSERS
+(a comparison drives two browsers), LLM-bound ones by LLM_CONCURRENCY and
+CPU-bound ones by CPU_CONCURRENCY. They can be changed while the server runs
+by writing the limits file, which every worker re-reads when it changes:
+
+    python admission.py set compare --limit 1 --queue 2 --queue-timeout 5
+    python admission.py show
+    python admission.py reset [endpoint]
+
+Limits are per worker process.
+"""
+import os
+import sys
+import json
+import math
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+import threading
+from collections import deque
+
+# metrics lives in python/; added here as well so the CLI runs on its own
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'python')))
+import metrics
+
+logger = logging.getLogger(__name__)
+
+ADMISSION_CONTROL = os.getenv("ADMISSION_CONTROL", "1").lower() in ("1", "true", "yes")
+# Chrome instances per worker; each one takes several hundred MB
+MAX_BROWSERS = max(1, int(os.getenv("MAX_BROWSERS", "4")))
+# Gemini calls in flight per worker; they cost memory and quota, not CPU
+LLM_CONCURRENCY = max(1, int(os.getenv("LLM_CONCURRENCY", "16")))
+# Extraction and scoring requests per worker
+CPU_CONCURRENCY = max(1, int(os.getenv("CPU_CONCURRENCY", str(2 * (os.cpu_count() or 1)))))
+# Waiting requests allowed per running one, and how long they may wait
+ADMISSION_QUEUE_FACTOR = float(os.getenv("ADMISSION_QUEUE_FACTOR", "2"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "10"))
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+DEFAULT_LIMITS_PATH = os.getenv("ADMISSION_LIMITS_PATH", os.path.join(DATA_DIR, "admission_limits.json"))
+# Seconds between checks of the limits file for changes
+RELOAD_INTERVAL = 1.0
+MAX_RETRY_AFTER = 120
+
+# Kind of work each limited endpoint waits on. /api/process-cv only parses
+# in its default mode and asks Gemini in the others, so it has one limiter
+# of each kind (see process_cv_endpoint)
+ENDPOINT_CLASSES = {
+    'scrape': 'browser',
+    'compare': 'browser',
+    'process-cv': 'cpu',
+    'process-cv-analyze': 'llm',
+    'analyze-resume': 'llm',
+    'ats-score': 'cpu',
+    'resumes-search': 'cpu'
+}
+
+# Reasons a request is turned away
+QUEUE_FULL, QUEUE_TIMEOUT = "queue_full", "queue_timeout"
+
+REJECTED = metrics.registry.counter(
+    "admission_rejected_total", "Requests turned away with 429, by endpoint and reason (queue_full, queue_timeout).",
+    ("endpoint", "reason"))
+QUEUE_SECONDS = metrics.registry.histogram(
+    "admission_queue_seconds", "Time admitted requests waited for a slot, by endpoint.", ("endpoint",))
+
+def process_cv_endpoint(mode):
+    """
+    Return the limiter key of a /api/process-cv request: 'process-cv' for
+    parsing alone, 'process-cv-analyze' when the mode calls Gemini.
+    """
+    return 'process-cv' if (mode or 'parse').strip().lower() == 'parse' else 'process-cv-analyze'
+
+def default_limits(endpoint):
+    """
+    Return the default {'limit', 'queue', 'queue_timeout'} of an endpoint from its kind of work.
+    """
+    kind = ENDPOINT_CLASSES[endpoint]
+    if kind == 'browser':
+        # A comparison scrapes two profiles at once
+        limit = MAX_BROWSERS if endpoint == 'scrape' else max(1, MAX_BROWSERS // 2)
+    elif kind == 'llm':
+        limit = LLM_CONCURRENCY
+    else:
+        limit = CPU_CONCURRENCY
+    return {'limit': limit, 'queue': int(math.ceil(limit * ADMISSION_QUEUE_FACTOR)),
+            'queue_timeout': ADMISSION_QUEUE_TIMEOUT}
+
+class Rejected(Exception):
+    """
+    Raised when a request is not admitted.
+
+    Attributes:
+        reason (str): QUEUE_FULL or QUEUE_TIMEOUT.
+        retry_after (int): Suggested seconds before retrying.
+    """
+
+    def __init__(self, endpoint, reason, retry_after):
+        super().__init__(f"{endpoint} is overloaded ({reason})")
+        self.endpoint = endpoint
+        self.reason = reason
+        self.retry_after = retry_after
+
+class _Waiter:
+    __slots__ = ('event', 'loop', 'future', 'granted')
+
+    def __init__(self, event=None, loop=None, future=None):
+        self.event = event
+        self.loop = loop
+        self.future = future
+        self.granted = False
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+class ConcurrencyLimiter:
+    """
+    Bounded FIFO admission for one endpoint, usable from threads (acquire)
+    and from coroutines (acquire_async). A released slot is handed straight
+    to the oldest waiter, so a queued request cannot be overtaken by a new one.
+    """
+
+    def __init__(self, endpoint, limit, queue, queue_timeout):
+        self.endpoint = endpoint
+        self.limit = limit
+        self.queue = queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self._waiters = deque()
+        self._lock = threading.Lock()
+        # Moving average of the seconds a request holds its slot, for Retry-After
+        self._hold_seconds = 1.0
+
+    @property
+    def queued(self):
+        return len(self._waiters)
+
+    def configure(self, limit, queue, queue_timeout):
+        """
+        Change the limits in place. Raising the limit admits waiters at once;
+        lowering it lets running requests finish and admits no more until
+        they are below the new limit.
+        """
+        with self._lock:
+            self.limit = limit
+            self.queue = queue
+            self.queue_timeout = queue_timeout
+            self._grant()
+
+    def retry_after(self):
+        """Seconds a client should wait before retrying, from the current backlog."""
+        estimate = self._hold_seconds * (len(self._waiters) + 1) / max(self.limit, 1)
+        return max(1, min(MAX_RETRY_AFTER, int(math.ceil(estimate))))
+
+    def _grant(self):
+        # Called with the lock held
+        while self._waiters and self.active < self.limit:
+            waiter = self._waiters.popleft()
+            waiter.granted = True
+            self.active += 1
+            if waiter.future is not None:
+                waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+            else:
+                waiter.event.set()
+
+    def _admit_or_enqueue(self, waiter):
+        """
+        Take a free slot (returns None), or queue waiter (returns it).
+
+        Raises:
+            Rejected: If the queue is full.
+        """
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+            return None
+        if len(self._waiters) >= self.queue:
+            REJECTED.labels(self.endpoint, QUEUE_FULL).inc()
+            raise Rejected(self.endpoint, QUEUE_FULL, self.retry_after())
+        self._waiters.append(waiter)
+        return waiter
+
+    def _abandon(self, waiter):
+        """
+        Give up waiting. Returns True when the slot was granted meanwhile and is now held.
+        """
+        with self._lock:
+            if waiter.granted:
+                return True
+            self._waiters.remove(waiter)
+            return False
+
+    def _timed_out(self):
+        REJECTED.labels(self.endpoint, QUEUE_TIMEOUT).inc()
+        with self._lock:
+            return Rejected(self.endpoint, QUEUE_TIMEOUT, self.retry_after())
+
+    def acquire(self):
+        """
+        Wait for a slot, blocking the calling thread.
+
+        Returns:
+            float: The time the slot was taken, to pass to release().
+
+        Raises:
+            Rejected: If the queue is full or the wait exceeds queue_timeout.
+        """
+        start = time.perf_counter()
+        with self._lock:
+            waiter = self._admit_or_enqueue(_Waiter(event=threading.Event()))
+            timeout = self.queue_timeout
+        if waiter is not None:
+            waiter.event.wait(timeout)
+            if not self._abandon(waiter):
+                raise self._timed_out()
+        admitted = time.perf_counter()
+        QUEUE_SECONDS.labels(self.endpoint).observe(admitted - start)
+        return admitted
+
+    async def acquire_async(self):
+        """
+        Wait for a slot without blocking the event loop. See acquire().
+        """
+        start = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            waiter = self._admit_or_enqueue(_Waiter(loop=loop, future=loop.create_future()))
+            timeout = self.queue_timeout
+        if waiter is not None:
+            try:
+                await asyncio.wait_for(waiter.future, timeout)
+            except asyncio.TimeoutError:
+                if not self._abandon(waiter):
+                    raise self._timed_out()
+            except BaseException:
+                # Cancelled (the client went away): hand back a slot granted meanwhile
+                if self._abandon(waiter):
+                    self.release(None)
+                raise
+        admitted = time.perf_counter()
+        QUEUE_SECONDS.labels(self.endpoint).observe(admitted - start)
+        return admitted
+
+    def release(self, admitted):
+        """
+        Free the slot taken at admitted and admit the next waiter.
+        """
+        with self._lock:
+            self.active -= 1
+            if admitted is not None:
+                self._hold_seconds = 0.8 * self._hold_seconds + 0.2 * (time.perf_counter() - admitted)
+            self._grant()
+
+    def snapshot(self):
+        return {'limit': self.limit, 'queue': self.queue, 'queue_timeout': self.queue_timeout,
+                'active': self.active, 'queued': len(self._waiters),
+                'avg_hold_seconds': round(self._hold_seconds, 3)}
+
+def read_limits_file(path=DEFAULT_LIMITS_PATH):
+    """
+    Return the overrides in the limits file as {endpoint: {setting: value}}, or {} when there is none.
+    """
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            overrides = json.load(f)
+    except FileNotFoundError:
+        return {}
+    if not isinstance(overrides, dict):
+        raise ValueError(f"{path} must hold a JSON object of endpoint settings")
+    return overrides
+
+def _validated(endpoint, settings):
+    limit = int(settings['limit'])
+    queue = int(settings['queue'])
+    queue_timeout = float(settings['queue_timeout'])
+    if limit < 1 or queue < 0 or queue_timeout < 0:
+        raise ValueError(f"Invalid admission limits for {endpoint}: {settings}")
+    return limit, queue, queue_timeout
+
+class AdmissionController:
+    """
+    The limiters of all endpoints, with their limits taken from the
+    defaults and the limits file, re-read at most every RELOAD_INTERVAL
+    seconds when its modification time changes.
+    """
+
+    def __init__(self, path=DEFAULT_LIMITS_PATH):
+        self.path = path
+        self._limiters = {}
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._checked_at = 0.0
+        self.refresh(force=True)
+        metrics.registry.register_collector(self.collect_metrics)
+
+    def refresh(self, force=False):
+        """
+        Apply the limits file if it changed since it was last read. A file
+        that cannot be read or parsed is logged and the current limits kept.
+        """
+        now = time.monotonic()
+        if not force and now - self._checked_at < RELOAD_INTERVAL:
+            return
+        with self._lock:
+            self._checked_at = now
+            try:
+                mtime = os.path.getmtime(self.path)
+            except OSError:
+                mtime = None
+            if not force and mtime == self._mtime:
+                return
+            try:
+                overrides = read_limits_file(self.path) if mtime is not None else {}
+                settings = {endpoint: _validated(endpoint, {**default_limits(endpoint), **overrides.get(endpoint, {})})
+                            for endpoint in ENDPOINT_CLASSES}
+            except (ValueError, TypeError, KeyError) as e:
+                logger.error(f"Ignoring admission limits in {self.path}: {e}")
+                self._mtime = mtime
+                return
+            self._mtime = mtime
+            for endpoint, (limit, queue, queue_timeout) in settings.items():
+                limiter = self._limiters.get(endpoint)
+                if limiter is None:
+                    self._limiters[endpoint] = ConcurrencyLimiter(endpoint, limit, queue, queue_timeout)
+                elif (limiter.limit, limiter.queue, limiter.queue_timeout) != (limit, queue, queue_timeout):
+                    limiter.configure(limit, queue, queue_timeout)
+                    logger.info(f"Admission limits for {endpoint}: limit={limit} queue={queue} "
+                                f"queue_timeout={queue_timeout}")
+
+    def limiter(self, endpoint):
+        self.refresh()
+        return self._limiters[endpoint]
+
+    def snapshot(self):
+        """Return the limits and current load of every endpoint."""
+        return {endpoint: limiter.snapshot() for endpoint, limiter in self._limiters.items()}
+
+    def collect_metrics(self):
+        limiters = list(self._limiters.values())
+        return [
+            ("admission_active", "gauge", "Requests holding an admission slot, by endpoint.",
+             [({"endpoint": limiter.endpoint}, limiter.active) for limiter in limiters]),
+            ("admission_queued", "gauge", "Requests waiting for an admission slot, by endpoint.",
+             [({"endpoint": limiter.endpoint}, limiter.queued) for limiter in limiters]),
+            ("admission_limit", "gauge", "Concurrent requests admitted, by endpoint.",
+             [({"endpoint": limiter.endpoint}, limiter.limit) for limiter in limiters])
+        ]
+
+_controller = None
+_controller_lock = threading.Lock()
+
+def get_controller():
+    """
+    Return the admission controller of this process, creating it on first use.
+    """
+    global _controller
+    if _controller is None:
+        with _controller_lock:
+            if _controller is None:
+                _controller = AdmissionController(DEFAULT_LIMITS_PATH)
+    return _controller
+
+def rejection_body(rejected):
+    """
+    Return the (body, status, headers) answer for a rejected request.
+    """
+    return ({'error': f'The server is busy with other {rejected.endpoint} requests. '
+                      f'Retry in {rejected.retry_after} seconds.'},
+            429, {'Retry-After': str(rejected.retry_after)})
+
+def write_limits_file(overrides, path=DEFAULT_LIMITS_PATH):
+    """
+    Replace the limits file atomically, so workers never read half of it.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix='.tmp')
+    with os.fdopen(descriptor, 'w', encoding='utf-8') as f:
+        json.dump(overrides, f, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+def main():
+    parser = argparse.ArgumentParser(description="Show or change the admission limits of the running backend")
+    parser.add_argument('--path', default=DEFAULT_LIMITS_PATH, help="Limits file (default: %(default)s)")
+    commands = parser.add_subparsers(dest='command', required=True)
+    commands.add_parser('show', help="Print the effective limits of every endpoint")
+    set_parser = commands.add_parser('set', help="Override the limits of an endpoint")
+    set_parser.add_argument('endpoint', choices=sorted(ENDPOINT_CLASSES))
+    set_parser.add_argument('--limit', type=int, help="Requests run at once")
+    set_parser.add_argument('--queue', type=int, help="Requests allowed to wait")
+    set_parser.add_argument('--queue-timeout', type=float, help="Seconds a request may wait")
+    reset_parser = commands.add_parser('reset', help="Return an endpoint (default: all) to its default limits")
+    reset_parser.add_argument('endpoint', nargs='?', choices=sorted(ENDPOINT_CLASSES))
+    args = parser.parse_args()
+
+    overrides = read_limits_file(args.path)
+    if args.command == 'set':
+        settings = {key: value for key, value in (('limit', args.limit), ('queue', args.queue),
+                                                  ('queue_timeout', args.queue_timeout)) if value is not None}
+        if not settings:
+            parser.error("Give at least one of --limit, --queue and --queue-timeout")
+        updated = {**overrides.get(args.endpoint, {}), **settings}
+        try:
+            _validated(args.endpoint, {**default_limits(args.endpoint), **updated})
+        except ValueError as e:
+            parser.error(str(e))
+        overrides[args.endpoint] = updated
+        write_limits_file(overrides, args.path)
+    elif args.command == 'reset':
+        if args.endpoint:
+            overrides.pop(args.endpoint, None)
+        else:
+            overrides = {}
+        write_limits_file(overrides, args.path)
+
+    for endpoint, kind in ENDPOINT_CLASSES.items():
+        settings = {**default_limits(endpoint), **overrides.get(endpoint, {})}
+        source = "override" if endpoint in overrides else "default"
+        print(f"{endpoint:<16} {kind:<8} limit={settings['limit']:<4} queue={settings['queue']:<4} "
+              f"queue_timeout={settings['queue_timeout']}s ({source})")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,397 @@
+import os
+import re
+import json
+import time
+import glob
+import sqlite3
+import argparse
+import logging
+import threading
+from datetime import datetime, timezone
+from urllib.parse import urlparse, unquote
+
+from models import Profile, Analysis, dumps, loads
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+DEFAULT_DB_PATH = os.getenv("ANALYSIS_DB_PATH", os.path.join(DATA_DIR, "analyses.db"))
+# Milliseconds a writer waits for another process's write transaction to finish
+BUSY_TIMEOUT_MS = int(os.getenv("ANALYSIS_DB_BUSY_TIMEOUT_MS", "5000"))
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# Bump when the schema changes; stored in PRAGMA user_version
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    name TEXT,
+    headline TEXT,
+    data TEXT NOT NULL,
+    scraped_at REAL NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS analyses (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    user_profile_id TEXT NOT NULL REFERENCES profiles(id),
+    reference_profile_id TEXT NOT NULL REFERENCES profiles(id),
+    job_role TEXT NOT NULL COLLATE NOCASE,
+    target_company TEXT COLLATE NOCASE,
+    created_at REAL NOT NULL,
+    failed INTEGER NOT NULL DEFAULT 0,
+    analysis TEXT NOT NULL,
+    source TEXT UNIQUE
+);
+
+CREATE INDEX IF NOT EXISTS analyses_created ON analyses (created_at, id);
+CREATE INDEX IF NOT EXISTS analyses_user ON analyses (user_profile_id, created_at, id);
+CREATE INDEX IF NOT EXISTS analyses_reference ON analyses (reference_profile_id, created_at, id);
+CREATE INDEX IF NOT EXISTS analyses_role ON analyses (job_role, created_at, id);
+CREATE INDEX IF NOT EXISTS analyses_company ON analyses (target_company, created_at, id);
+"""
+
+# Query filters accepted by list_analyses and the columns they match
+FILTER_COLUMNS = {
+    "user": "a.user_profile_id",
+    "reference": "a.reference_profile_id",
+    "role": "a.job_role",
+    "company": "a.target_company"
+}
+
+def profile_id_from_url(url):
+    """
+    Return the profile id for a LinkedIn profile URL: the lower-cased handle
+    after /in/, so URLs that differ only in case, query string or trailing
+    slash map to the same profile.
+    """
+    path = unquote(urlparse(url).path).strip('/')
+    parts = path.split('/')
+    if len(parts) >= 2 and parts[0] == 'in':
+        return parts[1].lower()
+    return (parts[-1] or url).lower()
+
+def _timestamp(value):
+    return datetime.fromtimestamp(value, timezone.utc).isoformat()
+
+def _parse_time(value):
+    """Parse an ISO 8601 date or datetime (naive values are UTC) into epoch seconds."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid time '{value}'. Use ISO 8601, e.g. 2025-04-13 or 2025-04-13T10:30:00")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+def _encode_cursor(created_at, analysis_id):
+    return f"{created_at!r}:{analysis_id}"
+
+def _decode_cursor(cursor):
+    created_at, _, analysis_id = cursor.partition(':')
+    return float(created_at), int(analysis_id)
+
+class AnalysisStore:
+    """
+    SQLite store of scraped profiles and the comparisons run between them.
+
+    Each profile is stored once under its LinkedIn handle (the latest scrape
+    replaces earlier ones), and each analysis references its two profiles
+    by id. Analyses are indexed by user, reference, role, company and time
+    and listed newest first with keyset pagination, so any page costs the
+    same whatever its depth.
+
+    The database runs in WAL mode: readers never block, and writers in other
+    threads or worker processes wait up to BUSY_TIMEOUT_MS for each other
+    instead of failing. Every thread gets its own connection.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        connection = self._connection()
+        if connection.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+            connection.executescript(SCHEMA)
+            connection.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            # Autocommit mode; writes open their own IMMEDIATE transactions
+            connection = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            connection.row_factory = sqlite3.Row
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.execute("PRAGMA foreign_keys = ON")
+            self._local.connection = connection
+        return connection
+
+    def _write(self, statements):
+        """
+        Run (sql, params) pairs in one write transaction and return the cursor
+        of the last statement. BEGIN IMMEDIATE takes the write lock up front,
+        so concurrent writers queue on busy_timeout rather than deadlocking.
+        """
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            cursor = None
+            for sql, params in statements:
+                cursor = connection.execute(sql, params)
+            connection.execute("COMMIT")
+            return cursor
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _profile_statement(profile, url=None, scraped_at=None):
+        profile = Profile.from_dict(profile)
+        url = url or profile.url or ''
+        return (
+            """
+            INSERT INTO profiles (id, url, name, headline, data, scraped_at) VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT(id) DO UPDATE SET url = excluded.url, name = excluded.name,
+                headline = excluded.headline, data = excluded.data, scraped_at = excluded.scraped_at
+            WHERE excluded.scraped_at >= profiles.scraped_at
+            """,
+            (profile_id_from_url(url), url, profile.name, profile.headline,
+             dumps(profile).decode('utf-8'), scraped_at or time.time())
+        )
+
+    def save_profile(self, profile, url=None, scraped_at=None):
+        """
+        Store a scraped profile (a Profile or the scraper's dict, which is
+        normalized) under its LinkedIn handle, replacing an older scrape.
+
+        Returns:
+            str: The profile id.
+        """
+        statement = self._profile_statement(profile, url, scraped_at)
+        self._write([statement])
+        return statement[1][0]
+
+    def save_analysis(self, user_profile, reference_profile, job_role, target_company, analysis,
+                      user_url=None, reference_url=None, created_at=None, source=None):
+        """
+        Store both profiles and the analysis comparing them in one transaction.
+
+        Args:
+            source (str): Name of the file an imported analysis came from;
+                importing the same file again is a no-op.
+
+        Returns:
+            int: The analysis id, or None if source was already imported.
+        """
+        created_at = created_at or time.time()
+        user_statement = self._profile_statement(user_profile, user_url, created_at)
+        reference_statement = self._profile_statement(reference_profile, reference_url, created_at)
+        cursor = self._write([
+            user_statement,
+            reference_statement,
+            (
+                """
+                INSERT OR IGNORE INTO analyses (user_profile_id, reference_profile_id, job_role, target_company,
+                                                created_at, failed, analysis, source)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (user_statement[1][0], reference_statement[1][0], job_role, target_company, created_at,
+                 int(isinstance(analysis, dict) and 'error' in analysis),
+                 dumps(analysis).decode('utf-8'), source)
+            )
+        ])
+        return cursor.lastrowid if cursor.rowcount else None
+
+    def get_profile(self, profile_id):
+        """
+        Return a stored profile in its normalized JSON form, with its id and
+        scrape time, or None.
+        """
+        row = self._connection().execute(
+            "SELECT id, data, scraped_at FROM profiles WHERE id = ?", (profile_id.lower(),)).fetchone()
+        if row is None:
+            return None
+        # Rows stored before profiles were normalized are normalized on the way
+        # out and left as they are in the database
+        profile = Profile.from_dict(loads(row['data'])).to_dict()
+        profile['id'] = row['id']
+        profile['scraped_at'] = _timestamp(row['scraped_at'])
+        return profile
+
+    def get_analysis(self, analysis_id):
+        """
+        Return an analysis with both profiles, its id and creation time as
+        an Analysis, or None.
+        """
+        row = self._connection().execute(
+            """
+            SELECT a.id, a.job_role, a.target_company, a.created_at, a.analysis,
+                   u.data AS user_profile, r.data AS reference_profile
+            FROM analyses a
+            JOIN profiles u ON u.id = a.user_profile_id
+            JOIN profiles r ON r.id = a.reference_profile_id
+            WHERE a.id = ?
+            """,
+            (analysis_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        return Analysis(
+            user_profile=Profile.from_dict(loads(row['user_profile'])),
+            reference_profile=Profile.from_dict(loads(row['reference_profile'])),
+            job_role=row['job_role'],
+            target_company=row['target_company'],
+            analysis=loads(row['analysis']),
+            id=row['id'],
+            created_at=_timestamp(row['created_at'])
+        )
+
+    def list_analyses(self, filters=None, since=None, until=None, limit=DEFAULT_PAGE_SIZE, cursor=None):
+        """
+        List analyses newest first, as summaries without the profile and analysis bodies.
+
+        Args:
+            filters (dict): Exact (case-insensitive) matches on the keys of FILTER_COLUMNS.
+            since (str): ISO 8601 time; only analyses created at or after it.
+            until (str): ISO 8601 time; only analyses created before it.
+            limit (int): Page size, capped at MAX_PAGE_SIZE.
+            cursor (str): The next_cursor of the previous page.
+
+        Returns:
+            dict: 'analyses' and 'next_cursor' (None on the last page).
+
+        Raises:
+            ValueError: If a filter, time or cursor is malformed.
+        """
+        conditions = []
+        params = []
+        for key, value in (filters or {}).items():
+            if key not in FILTER_COLUMNS:
+                raise ValueError(f"Unknown filter '{key}'. Use one of: {', '.join(FILTER_COLUMNS)}")
+            if key in ("user", "reference"):
+                value = profile_id_from_url(value) if value.startswith('http') else value.lower()
+            conditions.append(f"{FILTER_COLUMNS[key]} = ?")
+            params.append(value)
+        if since:
+            conditions.append("a.created_at >= ?")
+            params.append(_parse_time(since))
+        if until:
+            conditions.append("a.created_at < ?")
+            params.append(_parse_time(until))
+        if cursor:
+            try:
+                created_at, analysis_id = _decode_cursor(cursor)
+            except ValueError:
+                raise ValueError("Invalid cursor")
+            conditions.append("(a.created_at, a.id) < (?, ?)")
+            params.extend((created_at, analysis_id))
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self._connection().execute(
+            f"""
+            SELECT a.id, a.job_role, a.target_company, a.created_at, a.failed,
+                   u.id AS user_id, u.name AS user_name, u.headline AS user_headline, u.url AS user_url,
+                   r.id AS reference_id, r.name AS reference_name, r.headline AS reference_headline,
+                   r.url AS reference_url
+            FROM analyses a
+            JOIN profiles u ON u.id = a.user_profile_id
+            JOIN profiles r ON r.id = a.reference_profile_id
+            {where}
+            ORDER BY a.created_at DESC, a.id DESC
+            LIMIT ?
+            """,
+            (*params, limit + 1)
+        ).fetchall()
+
+        analyses = [{
+            'id': row['id'],
+            'created_at': _timestamp(row['created_at']),
+            'user_profile': {'id': row['user_id'], 'name': row['user_name'],
+                             'headline': row['user_headline'], 'url': row['user_url']},
+            'reference_profile': {'id': row['reference_id'], 'name': row['reference_name'],
+                                  'headline': row['reference_headline'], 'url': row['reference_url']},
+            'job_role': row['job_role'],
+            'target_company': row['target_company'],
+            'failed': bool(row['failed'])
+        } for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = _encode_cursor(last['created_at'], last['id'])
+        return {'analyses': analyses, 'next_cursor': next_cursor}
+
+    def stats(self):
+        connection = self._connection()
+        return {
+            "path": self.path,
+            "profiles": connection.execute("SELECT COUNT(*) FROM profiles").fetchone()[0],
+            "analyses": connection.execute("SELECT COUNT(*) FROM analyses").fetchone()[0]
+        }
+
+def import_data_dir(store, data_dir=DATA_DIR):
+    """
+    Import the profile files (<handle>.json) and timestamped analysis files
+    (analysis_%Y%m%d_%H%M%S.json) the server used to write. Files that were
+    already imported are skipped, so the import can be re-run safely.
+
+    Returns:
+        dict: Counts of imported profiles and analyses, and of skipped files.
+    """
+    counts = {"profiles": 0, "analyses": 0, "skipped": 0}
+    for path in sorted(glob.glob(os.path.join(data_dir, '*.json'))):
+        name = os.path.basename(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Skipping {name}: {e}")
+            counts["skipped"] += 1
+            continue
+
+        match = re.fullmatch(r'analysis_(\d{8}_\d{6})\.json', name)
+        if match:
+            if 'user_profile' not in data or 'reference_profile' not in data:
+                logger.warning(f"Skipping {name}: not an analysis file")
+                counts["skipped"] += 1
+                continue
+            # The server named these files by its local time
+            created_at = datetime.strptime(match.group(1), '%Y%m%d_%H%M%S').timestamp()
+            analysis_id = store.save_analysis(
+                data['user_profile'], data['reference_profile'], data.get('job_role', ''),
+                data.get('target_company'), data.get('analysis', {}), created_at=created_at, source=name)
+            counts["analyses" if analysis_id is not None else "skipped"] += 1
+        elif isinstance(data, dict) and data.get('url'):
+            store.save_profile(data, scraped_at=os.path.getmtime(path))
+            counts["profiles"] += 1
+        else:
+            logger.warning(f"Skipping {name}: not a profile or analysis file")
+            counts["skipped"] += 1
+    return counts
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the store of scraped profiles and profile comparisons")
+    parser.add_argument('--db', default=DEFAULT_DB_PATH, help="Database file (default: %(default)s)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="Import the JSON files the server wrote to backend/data")
+    import_parser.add_argument('data_dir', nargs='?', default=DATA_DIR)
+
+    subparsers.add_parser("info", help="Show store statistics")
+    args = parser.parse_args()
+
+    store = AnalysisStore(args.db)
+    if args.command == "import":
+        counts = import_data_dir(store, args.data_dir)
+        print(f"\n✅ Imported {counts['analyses']} analyses and {counts['profiles']} profiles "
+              f"({counts['skipped']} files skipped) into {args.db}")
+    else:
+        print(json.dumps(store.stats(), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -1,66 +1,468 @@
 import os
 import sys
+import time
 import logging
+import threading
+import functools
 import traceback
+from contextlib import contextmanager
 from datetime import datetime
-from flask import Flask, request, jsonify
+from tempfile import SpooledTemporaryFile
+from flask import Flask, Request, Response, g, request, jsonify, stream_with_context
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("scraper.log"),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger(__name__)
+from werkzeug.exceptions import RequestEntityTooLarge
 
 # Add the directory containing CV.py to the Python path
 cv_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'python'))
 sys.path.append(cv_path)
+
+# Configure logging: records go through a queue to a background thread that
+# writes JSON lines to stdout and a size-rotated scraper.log
+from log_config import configure_logging, new_request_id, log_payload
+configure_logging(log_file="scraper.log")
+import metrics
+logger = logging.getLogger(__name__)
+
+# Seconds spent importing each module at startup and warming up each dependency
+# in the background, reported in the log and by /api/health
+STARTUP_TIMINGS = {"imports": {}, "warm_up": {}}
+
+@contextmanager
+def timed_import(name):
+    start = time.perf_counter()
+    yield
+    STARTUP_TIMINGS["imports"][name] = round(time.perf_counter() - start, 4)
+
 logger.info(f"Added CV directory to path: {cv_path}")
-logger.info(f"Current Python path: {sys.path}")  # Debug: Print Python path
+logger.debug(f"Current Python path: {sys.path}")
 
-# Debug: List files in the CV directory
 try:
-    logger.info(f"Files in CV directory: {os.listdir(cv_path)}")
+    logger.debug(f"Files in CV directory: {os.listdir(cv_path)}")
 except Exception as e:
     logger.error(f"Failed to list files in CV directory: {e}")
 
-# Import CV processing functionality
+# Import CV processing functionality. CV.py loads its PDF/DOCX libraries and
+# the Gemini client on first use, so this import is cheap and cannot fail on a
+# missing API key.
 try:
-    from CV import process_cv  # Ensure the file is named CV.py (case-sensitive)
+    with timed_import("CV"):
+        import CV  # Ensure the file is named CV.py (case-sensitive)
+        from CV import (process_cv, PROCESS_CV_MODES, load_resume, get_cached_resume,
+                        analyze_resume, analyze_resume_hybrid)
     logger.info("Successfully imported process_cv from CV.py")
 except ImportError as e:
     logger.error(f"Failed to import process_cv from CV.py: {e}")
     raise
 
 import json
-from gemini_api import analyze_profiles
+from resume_cache import is_resume_hash
+with timed_import("ats_pool"):
+    import ats_pool
+
+with timed_import("resume_index"):
+    from resume_index import ResumeIndex, SEARCH_METHODS, DEFAULT_INDEX_PATH as RESUME_INDEX_PATH
+
+from analysis_store import AnalysisStore, DEFAULT_DB_PATH as ANALYSIS_DB_PATH
+from http_cache import conditional_json_response
+import idempotency
+from idempotency import IdempotencyStore, request_fingerprint, resolve_key, client_identity
+import admission
+import models
+from models import Profile
+
+with timed_import("gemini_api"):
+    import gemini_api
+    from gemini_api import analyze_profiles
 
 scrapper_path = os.path.join(os.path.dirname(__file__), '..', 'Scrapper')
 sys.path.append(scrapper_path)
 logger.info(f"Added Scrapper directory to path: {scrapper_path}")
 
-# Import the scraper function
-try:
-    from scrapper import scrape_linkedin_profile
-    logger.info("Successfully imported scrape_linkedin_profile function")
-except ImportError as e:
-    logger.error(f"Failed to import scrape_linkedin_profile: {e}")
-    raise
+_scrapper = None
+_scrapper_lock = threading.Lock()
+
+def load_scrapper():
+    """
+    Import the scraper module (Selenium, BeautifulSoup and lxml) on first use.
+    """
+    global _scrapper
+    if _scrapper is None:
+        with _scrapper_lock:
+            if _scrapper is None:
+                start = time.perf_counter()
+                import scrapper
+                STARTUP_TIMINGS["imports"]["scrapper"] = round(time.perf_counter() - start, 4)
+                logger.info("Successfully imported scrape_linkedin_profile function")
+                _scrapper = scrapper
+    return _scrapper
+
+ENV_PATH = os.path.join(os.path.dirname(__file__), '.env')
+
+def credentials_configured():
+    """
+    Return True when backend/.env, which holds the LinkedIn EMAIL and PASSWORD, exists.
+    """
+    return os.path.exists(ENV_PATH)
+
+def scrape_linkedin_profile(profile_url):
+    """
+    Scrape a LinkedIn profile with the Selenium scraper, importing it on first use.
+    """
+    with metrics.time_stage("scrape"):
+        return load_scrapper().scrape_linkedin_profile(profile_url)
+
+# Subsystems initialized in the background at startup, so the first request
+# does not pay for them: scraper (browser discovery, pre-launched logged-in
+# browsers), nlp (NLTK corpora, tagger and synonym data), cv (document
+# libraries), ats (scoring worker processes) and llm (Gemini client).
+# Subsystems left out are loaded on first use.
+WARM_UP_SUBSYSTEMS = ("scraper", "nlp", "cv", "ats", "llm")
+WARM_UP = [name.strip() for name in os.environ.get('WARM_UP', ",".join(WARM_UP_SUBSYSTEMS)).split(",")
+           if name.strip() in WARM_UP_SUBSYSTEMS]
+
+# Readiness of each subsystem in WARM_UP: 'cold' until start_warm_up() runs
+# (servers started without it load everything on first use), 'starting'
+# until its warm-up has finished, then 'ready', or 'degraded' when it failed
+# (it is retried on first use)
+WARM_UP_STATUS = {name: "cold" for name in WARM_UP}
+
+def _warm_up_nlp():
+    import new
+    return new.warm_up()
+
+def _warm_up_scraper():
+    return load_scrapper().warm_up()
+
+WARM_UP_STEPS = {
+    "scraper": _warm_up_scraper,
+    "nlp": _warm_up_nlp,
+    "cv": CV.warm_up,
+    "ats": ats_pool.warm_up,
+    "llm": gemini_api.warm_up
+}
+
+def _warm_up_subsystem(name):
+    start = time.perf_counter()
+    try:
+        result = WARM_UP_STEPS[name]()
+    except Exception as e:
+        logger.warning(f"Warm-up of {name} failed: {e}")
+        STARTUP_TIMINGS["warm_up"][name] = f"error: {e}"
+        WARM_UP_STATUS[name] = "degraded"
+        return
+    STARTUP_TIMINGS["warm_up"][name] = result if isinstance(result, dict) else round(time.perf_counter() - start, 4)
+    # Steps that report per-part timings return the error of a part that failed in its place
+    failed = isinstance(result, dict) and any(str(value).startswith("error") for value in result.values())
+    WARM_UP_STATUS[name] = "degraded" if failed else "ready"
+
+def warm_up_dependencies():
+    """
+    Initialize the subsystems in WARM_UP concurrently, recording each one's
+    readiness in WARM_UP_STATUS for /api/health. A subsystem that fails to
+    warm up is logged, reported as degraded and left to load on first use.
+    """
+    # The ATS worker processes are forked first, on their own: a fork while
+    # another warm-up thread holds an import lock leaves the worker stuck
+    if "ats" in WARM_UP:
+        _warm_up_subsystem("ats")
+    threads = [threading.Thread(target=_warm_up_subsystem, args=(name,), name=f"warm-up-{name}", daemon=True)
+               for name in WARM_UP if name != "ats"]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    logger.info(f"Warm-up completed: {WARM_UP_STATUS} {STARTUP_TIMINGS['warm_up']}")
+
+_warm_up_started = False
+
+def start_warm_up():
+    """
+    Start warm_up_dependencies() on a background thread, once per process.
+    """
+    global _warm_up_started
+    if not _warm_up_started:
+        _warm_up_started = True
+        for name in WARM_UP:
+            WARM_UP_STATUS[name] = "starting"
+        threading.Thread(target=warm_up_dependencies, name="warm-up", daemon=True).start()
+
+def health_status():
+    """
+    Return the /api/health answer: 'starting' with 503 while any subsystem
+    is still warming up, so load balancers hold traffic back, then 'ready',
+    or 'degraded' when a subsystem failed to warm up (both 200, as the
+    other endpoints work). A server that never started the warm-up (flask
+    run, other WSGI servers) is 'ready' with its subsystems 'cold'.
+
+    Returns:
+        tuple: (response body, HTTP status).
+    """
+    subsystems = dict(WARM_UP_STATUS)
+    if "starting" in subsystems.values():
+        status = "starting"
+    elif "degraded" in subsystems.values():
+        status = "degraded"
+    else:
+        status = "ready"
+    messages = {"starting": "Server is warming up", "ready": "Server is running",
+                "degraded": "Server is running, but some subsystems failed to warm up"}
+    body = {"status": status, "message": messages[status], "subsystems": subsystems, "startup": STARTUP_TIMINGS}
+    return body, 503 if status == "starting" else 200
+
+logger.info(f"Module import times (seconds): {STARTUP_TIMINGS['imports']}")
+
+# Uploads larger than this are rejected with 413 before they are read
+MAX_UPLOAD_BYTES = int(os.environ.get('MAX_UPLOAD_BYTES', str(10 * 1024 * 1024)))
+# Uploaded files are kept in memory and only spill to disk above this size
+UPLOAD_SPOOL_BYTES = int(os.environ.get('UPLOAD_SPOOL_BYTES', str(2 * 1024 * 1024)))
+
+class UploadRequest(Request):
+    """Request that buffers uploaded files in memory up to UPLOAD_SPOOL_BYTES."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        return SpooledTemporaryFile(max_size=UPLOAD_SPOOL_BYTES, mode='rb+')
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    jsonify() through models.dumps (orjson when installed), which also
+    serializes the profile and analysis models. Keys stay sorted and the
+    output compact, as with Flask's default provider.
+    """
+
+    def dumps(self, obj, **kwargs):
+        return models.dumps(obj, indent=bool(kwargs.get('indent')), sort_keys=self.sort_keys,
+                            default=self.default).decode('utf-8')
 
 app = Flask(__name__)
+app.json = FastJSONProvider(app)
+app.request_class = UploadRequest
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES
 CORS(app)  # Enable CORS for all routes
+# Request counts, errors, latency and in-flight gauges, served by /api/metrics
+app.wsgi_app = metrics.WsgiMetricsMiddleware(app.wsgi_app)
+
+@app.before_request
+def assign_request_id():
+    """Tag every log record of this request with a correlation ID."""
+    g.request_id = new_request_id(request.headers.get('X-Request-ID'))
+
+@app.after_request
+def add_request_id_header(response):
+    response.headers['X-Request-ID'] = g.get('request_id', '')
+    return response
+
+@app.before_request
+def reject_oversized_uploads():
+    """Reject oversized bodies before any handler starts working on them."""
+    if request.content_length is not None and request.content_length > MAX_UPLOAD_BYTES:
+        raise RequestEntityTooLarge()
+    if request.mimetype == 'multipart/form-data':
+        # Parse uploads here so a body without a declared length that runs past
+        # the limit also fails with 413 instead of inside a handler
+        request.files
+
+@app.errorhandler(RequestEntityTooLarge)
+def request_too_large(e):
+    logger.warning(f"Rejected request body larger than {MAX_UPLOAD_BYTES} bytes")
+    return jsonify({'error': f'Request body too large. The limit is {MAX_UPLOAD_BYTES} bytes.'}), 413
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    """Simple health check endpoint"""
-    return jsonify({"status": "ok", "message": "Server is running"})
+    """
+    Readiness check: the overall status ('starting', 'ready' or 'degraded'),
+    the status of each warmed-up subsystem and the startup timings.
+    """
+    body, status = health_status()
+    return jsonify(body), status
+
+@app.route('/api/metrics', methods=['GET'])
+def metrics_endpoint():
+    """Request, stage and cache metrics of this worker process in Prometheus text format"""
+    return Response(metrics.registry.render(), content_type=metrics.CONTENT_TYPE)
+
+_idempotency_store = None
+_idempotency_store_lock = threading.Lock()
+
+def get_idempotency_store():
+    """
+    Return the idempotency key store, opening it on first use.
+    """
+    global _idempotency_store
+    if _idempotency_store is None:
+        with _idempotency_store_lock:
+            if _idempotency_store is None:
+                _idempotency_store = IdempotencyStore(idempotency.DEFAULT_DB_PATH)
+    return _idempotency_store
+
+def idempotency_error(state):
+    """
+    Return the (body, status, headers) answer for a key that cannot be run or replayed.
+    """
+    if state == idempotency.MISMATCH:
+        return {'error': f'{idempotency.HEADER} was already used for a different request'}, 422, {}
+    return ({'error': f'A request with this {idempotency.HEADER} is still being processed. Retry later.'},
+            409, {'Retry-After': '5'})
+
+def idempotent(view):
+    """
+    Run a POST endpoint at most once per idempotency key: the client's
+    Idempotency-Key header or, when IDEMPOTENCY_AUTO_KEYS is on, a hash of
+    the request and its client. A duplicate waits (up to IDEMPOTENCY_WAIT)
+    for the original to finish and gets its response, marked with an
+    Idempotent-Replayed header.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        header = request.headers.get(idempotency.HEADER)
+        if header is None and not idempotency.IDEMPOTENCY_AUTO_KEYS:
+            return view(*args, **kwargs)
+        fingerprint = request_fingerprint(request.path, request.get_json(silent=True),
+                                          request.form.items(multi=True), request.files.items(multi=True))
+        try:
+            key, ttl = resolve_key(request.path, header, fingerprint,
+                                   client_identity(request.access_route, request.headers.get('User-Agent')))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        store = get_idempotency_store()
+        state, stored = store.acquire(key, fingerprint)
+        if state == idempotency.DONE:
+            logger.info(f"Replaying the stored response for a repeated {request.path} request")
+            idempotency.REPLAYS.labels(request.path).inc()
+            status, content_type, body = stored
+            return Response(body, status=status, content_type=content_type,
+                            headers={idempotency.REPLAYED_HEADER: 'true'})
+        if state != idempotency.NEW:
+            body, status, headers = idempotency_error(state)
+            return jsonify(body), status, headers
+
+        try:
+            response = app.make_response(view(*args, **kwargs))
+        except BaseException:
+            store.abandon(key)
+            raise
+        if response.is_streamed:
+            store.abandon(key)
+        else:
+            store.complete(key, response.status_code, response.content_type, response.get_data(), ttl)
+        return response
+    return wrapper
+
+def admission_controlled(endpoint):
+    """
+    Run an endpoint only when admission control gives it one of its slots,
+    and answer 429 with Retry-After when the endpoint is saturated. A
+    streamed response keeps its slot until the server has sent all of it.
+
+    Args:
+        endpoint (str or callable): Key of the endpoint in
+            admission.ENDPOINT_CLASSES, or a function of the current
+            request that returns it.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            if not admission.ADMISSION_CONTROL:
+                return view(*args, **kwargs)
+            name = endpoint() if callable(endpoint) else endpoint
+            limiter = admission.get_controller().limiter(name)
+            try:
+                admitted = limiter.acquire()
+            except admission.Rejected as e:
+                logger.warning(f"Rejected {name} request: {e.reason}, retry after {e.retry_after}s")
+                body, status, headers = admission.rejection_body(e)
+                return jsonify(body), status, headers
+
+            try:
+                response = app.make_response(view(*args, **kwargs))
+            except BaseException:
+                limiter.release(admitted)
+                raise
+            if response.is_streamed:
+                response.call_on_close(lambda: limiter.release(admitted))
+            else:
+                limiter.release(admitted)
+            return response
+        return wrapper
+    return decorator
+
+LINKEDIN_PROFILE_PREFIX = 'https://www.linkedin.com/in/'
+LINKEDIN_CREDENTIALS_ERROR = 'LinkedIn credentials not configured. Please create a .env file with EMAIL and PASSWORD.'
+
+def json_response(answer):
+    """Return the Flask response for a (response body, HTTP status) tuple."""
+    body, status = answer
+    return jsonify(body), status
+
+# The request validation and response building below are shared with asgi.py,
+# whose handlers differ from these only in awaiting the slow calls. Each
+# returns plain dicts, so either framework turns them into its own response.
+
+def server_error(e, failed, action):
+    """
+    Log an unexpected handler error and return the 500 answer for it.
+
+    Args:
+        e (Exception): The error.
+        failed (str): What the handler was doing, for the log ('processing CV').
+        action (str): The same for the client ('processing the CV').
+
+    Returns:
+        tuple: (response body, HTTP status).
+    """
+    logger.error(f"Error {failed}: {str(e)}")
+    logger.error(traceback.format_exc())
+    return {
+        'error': str(e),
+        'message': f'An error occurred while {action}. Please check the server logs for details.'
+    }, 500
+
+def log_completion(start_time, label):
+    processing_time = (datetime.now() - start_time).total_seconds()
+    logger.info(f"{label} completed in {processing_time} seconds")
+
+def scrape_request_url(data):
+    """
+    Validate the JSON body of POST /api/scrape.
+
+    Returns:
+        tuple: (profile URL, None), or (None, (error body, HTTP status)).
+    """
+    log_payload(logger, "Request data", data)
+    if not data or 'url' not in data:
+        logger.warning("No URL provided in request")
+        return None, ({'error': 'No URL provided'}, 400)
+
+    url = data['url']
+    logger.info(f"Processing URL: {url}")
+    if not url.startswith(LINKEDIN_PROFILE_PREFIX):
+        logger.warning(f"Invalid LinkedIn URL: {url}")
+        return None, ({'error': 'Invalid LinkedIn profile URL'}, 400)
+
+    # Check if .env file exists with credentials
+    if not credentials_configured():
+        logger.warning(f".env file not found at {ENV_PATH}")
+        return None, ({'error': LINKEDIN_CREDENTIALS_ERROR}, 500)
+    return url, None
+
+def save_scraped_profile(profile_data, url):
+    """
+    Normalize a scraped profile and save it to the analysis store, replacing
+    any earlier scrape of the same profile.
+
+    Returns:
+        The Profile, or the scraper's error dict unchanged.
+    """
+    if 'error' in profile_data:
+        return profile_data
+    profile = Profile.from_dict(profile_data)
+    profile_id = get_analysis_store().save_profile(profile, url)
+    logger.info(f"Saved profile {profile_id} to the analysis store")
+    return profile
 
 @app.route('/api/scrape', methods=['POST'])
+@admission_controlled('scrape')
 def scrape_profile():
     """
     API endpoint to scrape a LinkedIn profile
@@ -74,60 +476,90 @@ def scrape_profile():
     logger.info(f"Received scrape request at {start_time}")
 
     try:
-        # Get the URL from the request
-        data = request.json
-        logger.info(f"Request data: {data}")
+        url, error = scrape_request_url(request.json)
+        if error:
+            return json_response(error)
 
-        if not data or 'url' not in data:
-            logger.warning("No URL provided in request")
-            return jsonify({'error': 'No URL provided'}), 400
-
-        url = data['url']
-        logger.info(f"Processing URL: {url}")
+        logger.info(f"Starting scrape for profile: {url}")
+        profile_data = save_scraped_profile(scrape_linkedin_profile(url), url)
 
-        # Validate the URL
-        if not url.startswith('https://www.linkedin.com/in/'):
-            logger.warning(f"Invalid LinkedIn URL: {url}")
-            return jsonify({'error': 'Invalid LinkedIn profile URL'}), 400
+        log_completion(start_time, "Request")
+        return jsonify(profile_data)
 
-        # Check if .env file exists with credentials
-        env_path = os.path.join(os.path.dirname(__file__), '.env')
-        if not os.path.exists(env_path):
-            logger.warning(f".env file not found at {env_path}")
-            return jsonify({'error': 'LinkedIn credentials not configured. Please create a .env file with EMAIL and PASSWORD.'}), 500
+    except Exception as e:
+        return json_response(server_error(e, "processing request", "scraping the profile"))
 
-        # Scrape the profile
-        logger.info(f"Starting scrape for profile: {url}")
-        profile_data = scrape_linkedin_profile(url)
-        logger.info(f"Scraping completed for {url}")
+COMPARE_FIELDS = (('user_url', 'User profile URL'), ('reference_url', 'Reference profile URL'),
+                  ('job_role', 'Job role'), ('target_company', 'Target company'))
 
-        # Create data directory if it doesn't exist
-        data_dir = os.path.join(os.path.dirname(__file__), 'data')
-        os.makedirs(data_dir, exist_ok=True)
+def compare_request_params(data):
+    """
+    Validate the JSON body of POST /api/compare.
 
-        # Save the profile data to a file
-        profile_id = url.split("/")[-1]
-        file_path = os.path.join(data_dir, f"{profile_id}.json")
-        with open(file_path, 'w') as f:
-            json.dump(profile_data, f, indent=4)
-        logger.info(f"Saved profile data to {file_path}")
+    Returns:
+        tuple: (dict of the COMPARE_FIELDS, None), or (None, (error body, HTTP status)).
+    """
+    log_payload(logger, "Request data", data)
+    if not data:
+        return None, ({'error': 'No data provided'}, 400)
+    for field, label in COMPARE_FIELDS:
+        if field not in data:
+            return None, ({'error': f'{label} not provided'}, 400)
+
+    params = {field: data[field] for field, _ in COMPARE_FIELDS}
+    if not (params['user_url'].startswith(LINKEDIN_PROFILE_PREFIX)
+            and params['reference_url'].startswith(LINKEDIN_PROFILE_PREFIX)):
+        return None, ({'error': 'Invalid LinkedIn profile URL(s)'}, 400)
+
+    if not credentials_configured():
+        return None, ({'error': LINKEDIN_CREDENTIALS_ERROR}, 500)
+    return params, None
+
+def scraped_profiles(user_profile, reference_profile):
+    """
+    Check the two scrapes of a comparison and normalize them.
 
-        # Calculate processing time
-        end_time = datetime.now()
-        processing_time = (end_time - start_time).total_seconds()
-        logger.info(f"Request completed in {processing_time} seconds")
+    Returns:
+        tuple: ((user Profile, reference Profile), None), or (None, (error body, HTTP status)).
+    """
+    if 'error' in user_profile:
+        return None, ({'error': f"Failed to scrape user profile: {user_profile['error']}"}, 500)
+    if 'error' in reference_profile:
+        return None, ({'error': f"Failed to scrape reference profile: {reference_profile['error']}"}, 500)
+    return (Profile.from_dict(user_profile), Profile.from_dict(reference_profile)), None
 
-        return jsonify(profile_data)
+def save_comparison(params, user_profile, reference_profile, analysis_result):
+    """
+    Save both profiles and the analysis to the analysis store.
 
-    except Exception as e:
-        logger.error(f"Error processing request: {str(e)}")
-        logger.error(traceback.format_exc())
-        return jsonify({
-            'error': str(e),
-            'message': 'An error occurred while scraping the profile. Please check the server logs for details.'
-        }), 500
+    Returns:
+        dict: The /api/compare response body, with the analysis result
+        along with profile summaries.
+    """
+    analysis_id = get_analysis_store().save_analysis(
+        user_profile, reference_profile, params['job_role'], params['target_company'], analysis_result,
+        user_url=params['user_url'], reference_url=params['reference_url'])
+    logger.info(f"Saved analysis {analysis_id}")
+    return {
+        'analysis_id': analysis_id,
+        'user_profile': {
+            'name': user_profile.name or 'Name not available',
+            'headline': user_profile.headline or 'Headline not available',
+            'url': params['user_url']
+        },
+        'reference_profile': {
+            'name': reference_profile.name or 'Name not available',
+            'headline': reference_profile.headline or 'Headline not available',
+            'url': params['reference_url']
+        },
+        'job_role': params['job_role'],
+        'target_company': params['target_company'],
+        'analysis': analysis_result
+    }
 
 @app.route('/api/compare', methods=['POST'])
+@idempotent
+@admission_controlled('compare')
 def compare_profiles():
     """
     API endpoint to compare two LinkedIn profiles for a specific job role
@@ -145,169 +577,207 @@ def compare_profiles():
     logger.info(f"Received profile comparison request at {start_time}")
 
     try:
-        # Get data from the request
-        data = request.json
-        logger.info(f"Request data: {data}")
-
-        # Validate request data
-        if not data:
-            return jsonify({'error': 'No data provided'}), 400
-
-        if 'user_url' not in data:
-            return jsonify({'error': 'User profile URL not provided'}), 400
+        params, error = compare_request_params(request.json)
+        if error:
+            return json_response(error)
 
-        if 'reference_url' not in data:
-            return jsonify({'error': 'Reference profile URL not provided'}), 400
+        # Scrape both profiles
+        logger.info(f"Scraping user profile: {params['user_url']}")
+        user_profile = scrape_linkedin_profile(params['user_url'])
 
-        if 'job_role' not in data:
-            return jsonify({'error': 'Job role not provided'}), 400
-        
-        if 'target_company' not in data:
-            return jsonify({'error': 'Target company not provided'}), 400
+        logger.info(f"Scraping reference profile: {params['reference_url']}")
+        reference_profile = scrape_linkedin_profile(params['reference_url'])
 
-        user_url = data['user_url']
-        reference_url = data['reference_url']
-        job_role = data['job_role']
-        target_company = data['target_company']
+        profiles, error = scraped_profiles(user_profile, reference_profile)
+        if error:
+            return json_response(error)
 
-        # Validate URLs
-        if not user_url.startswith('https://www.linkedin.com/in/') or not reference_url.startswith('https://www.linkedin.com/in/'):
-            return jsonify({'error': 'Invalid LinkedIn profile URL(s)'}), 400
+        # Analyze the profiles using Gemini
+        logger.info(f"Analyzing profiles for job role: {params['job_role']}")
+        analysis_result = analyze_profiles(*profiles, params['job_role'], params['target_company'])
 
-        # Check if .env file exists with credentials
-        env_path = os.path.join(os.path.dirname(__file__), '.env')
-        if not os.path.exists(env_path):
-            return jsonify({'error': 'LinkedIn credentials not configured. Please create a .env file with EMAIL and PASSWORD.'}), 500
+        body = save_comparison(params, *profiles, analysis_result)
+        log_completion(start_time, "Comparison")
+        return jsonify(body)
 
-        # Scrape both profiles
-        logger.info(f"Scraping user profile: {user_url}")
-        user_profile = scrape_linkedin_profile(user_url)
+    except Exception as e:
+        return json_response(server_error(e, "processing comparison request", "comparing profiles"))
 
-        logger.info(f"Scraping reference profile: {reference_url}")
-        reference_profile = scrape_linkedin_profile(reference_url)
+def process_cv_request_params(files, form):
+    """
+    Validate the form of POST /api/process-cv.
 
-        # Check if either profile scraping failed
-        if 'error' in user_profile:
-            return jsonify({'error': f"Failed to scrape user profile: {user_profile['error']}"}), 500
+    Returns:
+        tuple: ((uploaded file, mode, job description or None), None), or
+        (None, (error body, HTTP status)).
+    """
+    if 'cv_file' not in files:
+        logger.warning("No CV file provided in request")
+        return None, ({'error': 'No CV file provided'}, 400)
 
-        if 'error' in reference_profile:
-            return jsonify({'error': f"Failed to scrape reference profile: {reference_profile['error']}"}), 500
+    cv_file = files['cv_file']
+    logger.info(f"Processing CV file: {cv_file.filename}")
 
-        # Analyze the profiles using Gemini
-        logger.info(f"Analyzing profiles for job role: {job_role}")
-        analysis_result = analyze_profiles(user_profile, reference_profile, job_role, target_company)
-
-        # Create data directory if it doesn't exist
-        data_dir = os.path.join(os.path.dirname(__file__), 'data')
-        os.makedirs(data_dir, exist_ok=True)
-
-        # Save the analysis result to a file
-        analysis_file = os.path.join(data_dir, f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
-        with open(analysis_file, 'w') as f:
-            json.dump({
-                'user_profile': user_profile,
-                'reference_profile': reference_profile,
-                'job_role': job_role,
-                'target_company': target_company,
-                'analysis': analysis_result
-            }, f, indent=4)
-        logger.info(f"Saved analysis to {analysis_file}")
-
-        # Calculate processing time
-        end_time = datetime.now()
-        processing_time = (end_time - start_time).total_seconds()
-        logger.info(f"Comparison completed in {processing_time} seconds")
-
-        # Return the analysis result along with profile summaries
-        return jsonify({
-            'user_profile': {
-                'name': user_profile.get('name', 'Name not available'),
-                'headline': user_profile.get('headline', 'Headline not available'),
-                'url': user_url
-            },
-            'reference_profile': {
-                'name': reference_profile.get('name', 'Name not available'),
-                'headline': reference_profile.get('headline', 'Headline not available'),
-                'url': reference_url
-            },
-            'job_role': job_role,
-            'target_company': target_company,
-            'analysis': analysis_result
-        })
+    mode = form.get('mode', 'parse').strip().lower()
+    if mode not in PROCESS_CV_MODES:
+        return None, ({'error': f"Invalid mode: {mode}"}, 400)
+    job_description = form.get('job_description', '').strip() or None
+    return (cv_file, mode, job_description), None
 
-    except Exception as e:
-        logger.error(f"Error processing comparison request: {str(e)}")
-        logger.error(traceback.format_exc())
-        return jsonify({
-            'error': str(e),
-            'message': 'An error occurred while comparing profiles. Please check the server logs for details.'
-        }), 500
+def processed_cv_response(processed_data):
+    """
+    Returns:
+        tuple: (response body, HTTP status) for the result of process_cv.
+    """
+    if "error" in processed_data:
+        return {'error': processed_data["error"]}, 500
+    return processed_data, 200
 
 @app.route('/api/process-cv', methods=['POST'])
+@admission_controlled(lambda: admission.process_cv_endpoint(request.form.get('mode')))
 def process_cv_endpoint():
     """
     API endpoint to process a CV file.
 
-    Expects a file upload with the key 'cv_file'.
+    Expects a file upload with the key 'cv_file', and optionally in the form-data:
+    - 'mode': 'parse' (default) returns only the structured resume data without an
+      LLM call, 'analyze' returns only the analysis, 'both' returns both.
+    - 'job_description': the job description to analyze against.
 
     Returns:
-        JSON response with the processed CV data or an error message.
+        JSON response with the processed CV data or an error message. The response
+        includes a 'resume_hash' that /api/analyze-resume accepts in place of a file.
     """
     start_time = datetime.now()
     logger.info(f"Received CV processing request at {start_time}")
 
     try:
-        # Check if a file is provided in the request
-        if 'cv_file' not in request.files:
-            logger.warning("No CV file provided in request")
-            return jsonify({'error': 'No CV file provided'}), 400
+        params, error = process_cv_request_params(request.files, request.form)
+        if error:
+            return json_response(error)
 
-        # Get the uploaded file
-        cv_file = request.files['cv_file']
-        logger.info(f"Processing CV file: {cv_file.filename}")
+        cv_file, mode, job_description = params
+        body, status = processed_cv_response(
+            process_cv(cv_file.stream, cv_file.filename, mode=mode, job_description=job_description))
 
-        # Save the uploaded file temporarily
-        temp_dir = os.path.join(os.path.dirname(__file__), 'temp')
-        os.makedirs(temp_dir, exist_ok=True)
-        temp_file_path = os.path.join(temp_dir, cv_file.filename)
-        cv_file.save(temp_file_path)
-        logger.info(f"Saved CV file to {temp_file_path}")
+        if status == 200:
+            log_completion(start_time, "CV processing")
+        return jsonify(body), status
 
-        # Process the CV using the function from CV.py
-        from CV import process_cv  # Import the function
-        processed_data = process_cv(temp_file_path)
+    except Exception as e:
+        return json_response(server_error(e, "processing CV", "processing the CV"))
 
-        # Clean up the temporary file
-        os.remove(temp_file_path)
-        logger.info(f"Deleted temporary CV file: {temp_file_path}")
+ANALYSIS_MODES = ('full', 'hybrid')
+# Names of the records streamed by hybrid analysis, in order
+ANALYSIS_STAGES = ('local', 'complete')
 
-        # Check for errors in processing
-        if "error" in processed_data:
-            return jsonify({'error': processed_data["error"]}), 500
+def resume_request_params(files, form, analysis=True):
+    """
+    Validate the form of POST /api/analyze-resume and /api/ats-score: an
+    uploaded 'resume' file or the 'resume_hash' of an earlier upload, a
+    'job_description' and, when analysis is True, 'mode' and 'stream'.
+
+    Returns:
+        tuple: (dict of 'resume_file' (None when a hash is given),
+        'resume_hash', 'job_description', 'mode' and 'stream', None), or
+        (None, (error body, HTTP status)).
+    """
+    resume_file = files.get('resume')
+    resume_hash = form.get('resume_hash', '').strip()
+    if resume_file is None and not resume_hash:
+        logger.warning("No resume file provided in request")
+        return None, ({'error': 'No resume file provided'}, 400)
+    # The hash names a file of the resume cache's disk tier, so it is checked
+    # before any lookup
+    if resume_file is None and not is_resume_hash(resume_hash):
+        logger.warning("Invalid resume_hash in request")
+        return None, ({'error': 'Invalid resume_hash. It must be the 64-character hex resume_hash of an upload.'}, 400)
+
+    job_description = form.get('job_description', '').strip()
+    if not job_description:
+        logger.warning("No job description provided in request")
+        return None, ({'error': 'No job description provided'}, 400)
+
+    mode = form.get('mode', 'full').strip().lower() if analysis else None
+    if analysis and mode not in ANALYSIS_MODES:
+        return None, ({'error': f"Invalid analysis mode: {mode}"}, 400)
+
+    return {
+        'resume_file': resume_file,
+        'resume_hash': resume_hash,
+        'job_description': job_description,
+        'mode': mode,
+        'stream': form.get('stream', '').strip().lower() in ('1', 'true', 'yes')
+    }, None
+
+def load_requested_resume(params):
+    """
+    Extract the uploaded resume of resume_request_params, or look up the
+    cached one. This blocks on parsing or on the disk cache.
 
-        # Calculate processing time
-        end_time = datetime.now()
-        processing_time = (end_time - start_time).total_seconds()
-        logger.info(f"CV processing completed in {processing_time} seconds")
+    Returns:
+        tuple: (resume_hash, extracted_text, None), or (None, None, (error body, HTTP status)).
+    """
+    resume_file = params['resume_file']
+    if resume_file is not None:
+        logger.info(f"Processing resume file: {resume_file.filename}")
+        resume_hash, extracted_text, resume_data = load_resume(resume_file.stream, resume_file.filename)
+        if resume_data is None:
+            return None, None, ({'error': extracted_text}, 500)
+        return resume_hash, extracted_text, None
+
+    resume_hash = params['resume_hash']
+    logger.info(f"Processing cached resume: {resume_hash}")
+    cached = get_cached_resume(resume_hash)
+    if cached is None:
+        return None, None, ({'error': 'Unknown or expired resume_hash. Please upload the resume again.'}, 404)
+    return resume_hash, cached[0], None
+
+def analysis_stage_line(stage, result):
+    """Return one newline-delimited JSON record of a streamed hybrid analysis."""
+    return json.dumps({'stage': stage, 'analysis_result': result}) + '\n'
+
+def analysis_stream_error(e):
+    logger.error(f"Error in streamed resume analysis: {str(e)}")
+    return json.dumps({'stage': 'error', 'error': str(e)}) + '\n'
+
+def analysis_response(analysis_result):
+    """
+    Returns:
+        tuple: (response body, HTTP status) for the raw Gemini answer of
+        analyze_resume, which must be a JSON document.
+    """
+    # Log a sample of raw responses for debugging
+    log_payload(logger, "Raw analysis result", analysis_result)
 
-        return jsonify(processed_data)
+    # Check for errors in analysis
+    if isinstance(analysis_result, str) and analysis_result.startswith("Error"):
+        return {'error': analysis_result}, 500
 
-    except Exception as e:
-        logger.error(f"Error processing CV: {str(e)}")
-        logger.error(traceback.format_exc())
-        return jsonify({
-            'error': str(e),
-            'message': 'An error occurred while processing the CV. Please check the server logs for details.'
-        }), 500
+    try:
+        parsed_result = json.loads(analysis_result)
+    except json.JSONDecodeError:
+        logger.error("Invalid JSON returned from CV.py")
+        return {'error': 'Invalid JSON returned from analysis.'}, 500
+    return {'analysis_result': parsed_result}, 200
 
 @app.route('/api/analyze-resume', methods=['POST'])
+@idempotent
+@admission_controlled('analyze-resume')
 def analyze_resume_endpoint():
     """
     API endpoint to analyze a resume against a job description.
 
     Expects:
-    - A file upload with the key 'resume'.
+    - A file upload with the key 'resume', or the 'resume_hash' returned by an
+      earlier upload in the form-data.
     - A job description in the form-data with the key 'job_description'.
+    - Optionally 'mode' in the form-data: 'full' (default) asks Gemini for the whole
+      analysis, 'hybrid' computes the keyword and score sections locally and asks
+      Gemini only for the narrative sections.
+    - Optionally 'stream' in the form-data (hybrid mode only): when true, the response
+      is newline-delimited JSON, with the locally computed sections sent immediately
+      and the complete analysis sent once the narrative sections arrive.
 
     Returns:
         JSON response with the analysis result or an error message.
@@ -316,68 +786,254 @@ def analyze_resume_endpoint():
     logger.info(f"Received resume analysis request at {start_time}")
 
     try:
-        # Check if a file is provided in the request
-        if 'resume' not in request.files:
-            logger.warning("No resume file provided in request")
-            return jsonify({'error': 'No resume file provided'}), 400
-
-        # Check if job description is provided
-        job_description = request.form.get('job_description', '').strip()
-        if not job_description:
-            logger.warning("No job description provided in request")
-            return jsonify({'error': 'No job description provided'}), 400
-
-        # Get the uploaded file
-        resume_file = request.files['resume']
-        logger.info(f"Processing resume file: {resume_file.filename}")
+        params, error = resume_request_params(request.files, request.form)
+        if error:
+            return json_response(error)
+
+        _, extracted_text, error = load_requested_resume(params)
+        if error:
+            return json_response(error)
+
+        if params['mode'] == 'hybrid':
+            stages = analyze_resume_hybrid(extracted_text, params['job_description'])
+            if params['stream']:
+                def generate():
+                    try:
+                        for stage, result in zip(ANALYSIS_STAGES, stages):
+                            yield analysis_stage_line(stage, result)
+                    except Exception as e:
+                        yield analysis_stream_error(e)
+                    log_completion(start_time, "Resume analysis")
+
+                return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+            parsed_result = list(stages)[-1]
+            log_completion(start_time, "Resume analysis")
+            return jsonify({'analysis_result': parsed_result})
+
+        body, status = analysis_response(analyze_resume(extracted_text, params['job_description']))
+        if status == 200:
+            log_completion(start_time, "Resume analysis")
+        return jsonify(body), status
 
-        # Save the uploaded file temporarily
-        temp_dir = os.path.join(os.path.dirname(__file__), 'temp')
-        os.makedirs(temp_dir, exist_ok=True)
-        temp_file_path = os.path.join(temp_dir, resume_file.filename)
-        resume_file.save(temp_file_path)
-        logger.info(f"Saved resume file to {temp_file_path}")
+    except Exception as e:
+        return json_response(server_error(e, "analyzing resume", "analyzing the resume"))
 
-        # Process the resume using the function from CV.py
-        from CV import extract_text_from_resume, analyze_resume
-        extracted_text = extract_text_from_resume(temp_file_path)
-        if extracted_text.startswith("Error"):
-            return jsonify({'error': extracted_text}), 500
+def ats_score_response(resume_hash, result):
+    """
+    Returns:
+        tuple: (response body, HTTP status) for an ats_pool score: 504 when
+        it ran out of time, 503 when the worker pool is unavailable and 400
+        for other errors.
+    """
+    if "error" in result:
+        status = 504 if result.get("timeout") else 503 if result.get("unavailable") else 400
+        return {'error': result["error"]}, status
+    return {'resume_hash': resume_hash, **result}, 200
+
+@app.route('/api/ats-score', methods=['POST'])
+@admission_controlled('ats-score')
+def ats_score_endpoint():
+    """
+    API endpoint to compute the local keyword ATS score of a resume, without an LLM call.
 
-        analysis_result = analyze_resume(extracted_text, job_description)
+    Expects:
+    - A file upload with the key 'resume', or the 'resume_hash' returned by an
+      earlier upload in the form-data.
+    - A job description in the form-data with the key 'job_description'.
 
-        # Log the raw response for debugging
-        logger.info(f"Raw analysis result: {analysis_result}")
+    Returns:
+        JSON response with the ATS score, matched and missing keywords and
+        timings, or an error message.
+    """
+    start_time = datetime.now()
+    logger.info(f"Received ATS score request at {start_time}")
 
-        # Check for errors in analysis
-        if isinstance(analysis_result, str) and analysis_result.startswith("Error"):
-            return jsonify({'error': analysis_result}), 500
+    try:
+        params, error = resume_request_params(request.files, request.form, analysis=False)
+        if error:
+            return json_response(error)
 
-        # Parse the analysis result to ensure it is valid JSON
-        try:
-            parsed_result = json.loads(analysis_result)
-        except json.JSONDecodeError:
-            logger.error("Invalid JSON returned from CV.py")
-            return jsonify({'error': 'Invalid JSON returned from analysis.'}), 500
+        resume_hash, extracted_text, error = load_requested_resume(params)
+        if error:
+            return json_response(error)
+
+        body, status = ats_score_response(resume_hash, ats_pool.score(extracted_text, params['job_description']))
+        if status == 200:
+            log_completion(start_time, "ATS scoring")
+        return jsonify(body), status
+
+    except Exception as e:
+        return json_response(server_error(e, "computing ATS score", "computing the ATS score"))
+
+_resume_index = None
+_resume_index_mtime = None
+_resume_index_lock = threading.Lock()
+
+def get_resume_index():
+    """
+    Return the resume index built with python/resume_index.py, reloading it
+    when the file has changed since it was last read.
+    """
+    global _resume_index, _resume_index_mtime
+    try:
+        mtime = os.path.getmtime(RESUME_INDEX_PATH)
+    except OSError:
+        mtime = None
+    with _resume_index_lock:
+        if _resume_index is None or mtime != _resume_index_mtime:
+            _resume_index = ResumeIndex.load(RESUME_INDEX_PATH)
+            _resume_index_mtime = mtime
+            logger.info(f"Loaded resume index with {len(_resume_index)} resumes from {RESUME_INDEX_PATH}")
+        return _resume_index
+
+def search_request_params(data):
+    """
+    Validate the JSON or form body of POST /api/resumes/search.
 
-        # Clean up the temporary file
-        os.remove(temp_file_path)
-        logger.info(f"Deleted temporary resume file: {temp_file_path}")
+    Returns:
+        tuple: ((job description, top_k, method), None), or (None, (error body, HTTP status)).
+    """
+    job_description = str(data.get('job_description', '')).strip()
+    if not job_description:
+        return None, ({'error': 'No job description provided'}, 400)
+
+    method = str(data.get('method', 'bm25')).strip().lower()
+    if method not in SEARCH_METHODS:
+        return None, ({'error': f"Invalid search method: {method}"}, 400)
+    try:
+        top_k = min(max(int(data.get('top_k', 10)), 1), 100)
+    except (TypeError, ValueError):
+        return None, ({'error': 'top_k must be an integer'}, 400)
+    return (job_description, top_k, method), None
+
+def search_resume_index(job_description, top_k, method):
+    """
+    Rank the indexed resumes against a job description. This blocks on
+    loading the index and building the job profile.
+
+    Returns:
+        tuple: (response body, HTTP status).
+    """
+    index = get_resume_index()
+    if not len(index):
+        return {'error': 'The resume index is empty. Build it with python/resume_index.py add.'}, 404
+
+    from new import get_job_profile
+    try:
+        results = index.search(get_job_profile(job_description).keywords, top_k, method)
+    except ValueError as e:
+        return {'error': str(e)}, 400
+    return {'results': results, 'indexed_resumes': len(index), 'method': method}, 200
+
+@app.route('/api/resumes/search', methods=['POST'])
+@admission_controlled('resumes-search')
+def search_resumes():
+    """
+    API endpoint to find the indexed resumes that best match a job description.
+
+    Expects JSON (or form-data) with:
+    - 'job_description': the job description text.
+    - Optionally 'top_k' (default 10, at most 100) and 'method': 'bm25' (default)
+      or 'weighted' for the ATS score formula.
 
-        # Calculate processing time
-        end_time = datetime.now()
-        processing_time = (end_time - start_time).total_seconds()
-        logger.info(f"Resume analysis completed in {processing_time} seconds")
+    Returns:
+        JSON response with the ranked resumes or an error message.
+    """
+    start_time = datetime.now()
+    try:
+        params, error = search_request_params(request.get_json(silent=True) or request.form)
+        if error:
+            return json_response(error)
 
-        return jsonify({'analysis_result': parsed_result})
+        body, status = search_resume_index(*params)
+        if status == 200:
+            log_completion(start_time, f"Resume search over {body['indexed_resumes']} resumes")
+        return jsonify(body), status
 
     except Exception as e:
-        logger.error(f"Error analyzing resume: {str(e)}")
-        logger.error(traceback.format_exc())
-        return jsonify({
-            'error': str(e),
-            'message': 'An error occurred while analyzing the resume. Please check the server logs for details.'
-        }), 500
+        return json_response(server_error(e, "searching resumes", "searching resumes"))
+
+_analysis_store = None
+_analysis_store_lock = threading.Lock()
+
+def get_analysis_store():
+    """
+    Return the store of scraped profiles and comparisons, opening it on first use.
+    """
+    global _analysis_store
+    if _analysis_store is None:
+        with _analysis_store_lock:
+            if _analysis_store is None:
+                _analysis_store = AnalysisStore(ANALYSIS_DB_PATH)
+    return _analysis_store
+
+def list_analyses_from_args(args):
+    """
+    Run an analysis listing for the query string of GET /api/analyses.
+
+    Returns:
+        tuple: (response body, HTTP status).
+    """
+    filters = {key: args[key] for key in ('user', 'reference', 'role', 'company') if args.get(key)}
+    try:
+        limit = int(args.get('limit', 20))
+    except ValueError:
+        return {'error': 'limit must be an integer'}, 400
+    try:
+        return get_analysis_store().list_analyses(
+            filters, since=args.get('since'), until=args.get('until'), limit=limit, cursor=args.get('cursor')), 200
+    except ValueError as e:
+        return {'error': str(e)}, 400
+
+@app.route('/api/analyses', methods=['GET'])
+def list_analyses():
+    """
+    API endpoint to list stored profile comparisons, newest first.
+
+    Optional query parameters:
+    - 'user', 'reference': profile handle or LinkedIn URL.
+    - 'role', 'company': exact job role or target company (case-insensitive).
+    - 'since', 'until': ISO 8601 times bounding the creation time.
+    - 'limit': page size (default 20, at most 100).
+    - 'cursor': the 'next_cursor' of the previous page.
+
+    Returns:
+        JSON response with analysis summaries and 'next_cursor', or an error message.
+    """
+    body, status = list_analyses_from_args(request.args)
+    return jsonify(body), status
+
+def cacheable_json(payload):
+    """
+    Return a Response for a stored result that supports conditional GETs
+    (ETag / If-None-Match) and gzip or brotli compression.
+    """
+    status, headers, body = conditional_json_response(
+        payload, request.headers.get('If-None-Match'), request.headers.get('Accept-Encoding'))
+    return Response(body, status=status, headers=headers)
+
+@app.route('/api/analyses/<int:analysis_id>', methods=['GET'])
+def get_analysis(analysis_id):
+    """
+    API endpoint to fetch a stored comparison with both full profiles. Repeat
+    requests with If-None-Match get 304 Not Modified while it is unchanged.
+    """
+    analysis = get_analysis_store().get_analysis(analysis_id)
+    if analysis is None:
+        return jsonify({'error': f'Analysis {analysis_id} not found'}), 404
+    return cacheable_json(analysis)
+
+@app.route('/api/profiles/<profile_id>', methods=['GET'])
+def get_profile(profile_id):
+    """
+    API endpoint to fetch a stored profile by its LinkedIn handle, as last
+    scraped. Supports If-None-Match like /api/analyses/<id>.
+    """
+    profile = get_analysis_store().get_profile(profile_id)
+    if profile is None:
+        return jsonify({'error': f'Profile {profile_id} not found'}), 404
+    return cacheable_json(profile)
 
 if __name__ == '__main__':
     # Check if the .env file exists
@@ -389,5 +1045,12 @@ if __name__ == '__main__':
     if 'GEMINI_API_KEY' not in os.environ:
         logger.warning("GEMINI_API_KEY not found in environment variables. Profile comparison will not work.")
 
+    # Load the heavy dependencies in the background while the server starts
+    # accepting requests. The debug reloader runs this module in a watcher
+    # process and again in the serving child, which it marks with
+    # WERKZEUG_RUN_MAIN; only the child serves, so only the child warms up
+    if os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        start_warm_up()
+
     logger.info("Starting Flask server")
     app.run(debug=True, port=5000)
@@ -0,0 +1,418 @@
+"""
+ASGI entry point for the backend, for serving with an async server:
+
+    uvicorn asgi:app --workers 4        (or: python serve.py --mode asgi)
+
+Serves the same routes with the same request and response shapes as app.py,
+but each handler is a coroutine. Gemini calls are awaited, the blocking
+Selenium scraper runs on a bounded thread pool, file writes and resume
+parsing run on executors, and ATS scoring runs on the ats_pool worker
+processes. A request waiting on a browser or on the LLM therefore holds no
+thread, so one process can keep hundreds of requests in flight. The shared
+helpers (scraper loading, resume index, upload limits, warm-up) and the
+request validation and response building of every route come from app.py,
+so the handlers here only await what app.py's call directly.
+"""
+import os
+import asyncio
+import functools
+import contextvars
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+
+from quart import Quart, Response, g, request, jsonify, make_response
+from quart.wrappers.response import DataBody, ResponseBody
+from quart.json.provider import DefaultJSONProvider
+from quart_cors import cors
+from werkzeug.exceptions import RequestEntityTooLarge
+
+import app as wsgi_app
+from app import (logger, health_status, MAX_UPLOAD_BYTES, scrape_linkedin_profile, get_analysis_store,
+                 list_analyses_from_args, get_idempotency_store, idempotency_error, server_error,
+                 log_completion, scrape_request_url, save_scraped_profile, compare_request_params,
+                 scraped_profiles, save_comparison, process_cv_request_params, processed_cv_response,
+                 resume_request_params, load_requested_resume, ANALYSIS_STAGES, analysis_stage_line,
+                 analysis_stream_error, analysis_response, ats_score_response, search_request_params,
+                 search_resume_index)
+from CV import process_cv_async, analyze_resume_async, analyze_resume_hybrid_async
+from gemini_api import analyze_profiles_async
+import ats_pool
+from log_config import new_request_id
+from http_cache import conditional_json_response
+import metrics
+import idempotency
+from idempotency import request_fingerprint, resolve_key, client_identity
+import admission
+import models
+
+# Each scrape drives a whole browser, so only this many run at once per process
+SCRAPER_THREADS = int(os.environ.get('SCRAPER_THREADS', str(admission.MAX_BROWSERS)))
+# Threads for resume extraction and parsing, file writes and other blocking calls
+BLOCKING_THREADS = int(os.environ.get('BLOCKING_THREADS', str(min(32, (os.cpu_count() or 1) + 4))))
+
+scrape_executor = ThreadPoolExecutor(max_workers=SCRAPER_THREADS, thread_name_prefix="scrape")
+blocking_executor = ThreadPoolExecutor(max_workers=BLOCKING_THREADS, thread_name_prefix="blocking")
+
+class FastJSONProvider(DefaultJSONProvider):
+    """jsonify() through models.dumps. See app.FastJSONProvider."""
+
+    def dumps(self, obj, **kwargs):
+        return models.dumps(obj, indent=bool(kwargs.get('indent')), sort_keys=self.sort_keys,
+                            default=self.default).decode('utf-8')
+
+app = Quart(__name__)
+app.json = FastJSONProvider(app)
+app.config['MAX_CONTENT_LENGTH'] = MAX_UPLOAD_BYTES
+app = cors(app, allow_origin="*")
+app.asgi_app = metrics.AsgiMetricsMiddleware(app.asgi_app)
+
+def run_blocking(fn, *args, executor=blocking_executor):
+    # Run in the caller's context so log records keep the request's correlation ID
+    return asyncio.get_running_loop().run_in_executor(executor, contextvars.copy_context().run, fn, *args)
+
+def idempotent(view):
+    """
+    Run a POST endpoint at most once per idempotency key. See app.idempotent.
+    """
+    @functools.wraps(view)
+    async def wrapper(*args, **kwargs):
+        header = request.headers.get(idempotency.HEADER)
+        if header is None and not idempotency.IDEMPOTENCY_AUTO_KEYS:
+            return await view(*args, **kwargs)
+        json_body = await request.get_json(silent=True)
+        form = await request.form
+        files = await request.files
+        # Uploads are hashed off the event loop
+        fingerprint = await run_blocking(request_fingerprint, request.path, json_body,
+                                         list(form.items(multi=True)), list(files.items(multi=True)))
+        try:
+            key, ttl = resolve_key(request.path, header, fingerprint,
+                                   client_identity(request.access_route, request.headers.get('User-Agent')))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        store = get_idempotency_store()
+        state, stored = await store.acquire_async(key, fingerprint, executor=blocking_executor)
+        if state == idempotency.DONE:
+            logger.info(f"Replaying the stored response for a repeated {request.path} request")
+            idempotency.REPLAYS.labels(request.path).inc()
+            status, content_type, body = stored
+            return Response(body, status=status, content_type=content_type,
+                            headers={idempotency.REPLAYED_HEADER: 'true'})
+        if state != idempotency.NEW:
+            body, status, headers = idempotency_error(state)
+            return jsonify(body), status, headers
+
+        try:
+            response = await make_response(await view(*args, **kwargs))
+        except BaseException:
+            await run_blocking(store.abandon, key)
+            raise
+        if isinstance(response.response, DataBody):
+            await run_blocking(store.complete, key, response.status_code, response.content_type,
+                               await response.get_data(), ttl)
+        else:
+            await run_blocking(store.abandon, key)
+        return response
+    return wrapper
+
+class _ReleasingBody(ResponseBody):
+    """Streamed response body that frees an admission slot once it has been sent."""
+
+    def __init__(self, body, release):
+        self._body = body
+        self._release = release
+
+    async def __aenter__(self):
+        return await self._body.__aenter__()
+
+    async def __aexit__(self, exc_type, exc_value, tb):
+        try:
+            await self._body.__aexit__(exc_type, exc_value, tb)
+        finally:
+            self._release()
+
+def admission_controlled(endpoint):
+    """
+    Run an endpoint only when admission control gives it one of its slots,
+    waiting on the event loop. See app.admission_controlled; a function
+    choosing the endpoint is awaited.
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        async def wrapper(*args, **kwargs):
+            if not admission.ADMISSION_CONTROL:
+                return await view(*args, **kwargs)
+            name = await endpoint() if callable(endpoint) else endpoint
+            limiter = admission.get_controller().limiter(name)
+            try:
+                admitted = await limiter.acquire_async()
+            except admission.Rejected as e:
+                logger.warning(f"Rejected {name} request: {e.reason}, retry after {e.retry_after}s")
+                body, status, headers = admission.rejection_body(e)
+                return jsonify(body), status, headers
+
+            try:
+                response = await make_response(await view(*args, **kwargs))
+            except BaseException:
+                limiter.release(admitted)
+                raise
+            if isinstance(response.response, DataBody):
+                limiter.release(admitted)
+            else:
+                response.response = _ReleasingBody(response.response, lambda: limiter.release(admitted))
+            return response
+        return wrapper
+    return decorator
+
+@app.before_serving
+async def start_warm_up():
+    # Same background warm-up as the Flask server, started once per worker process
+    wsgi_app.start_warm_up()
+
+@app.before_request
+async def assign_request_id():
+    # The ID lives in a context variable, so it follows the request's task
+    # and the executor calls made from it
+    g.request_id = new_request_id(request.headers.get('X-Request-ID'))
+
+@app.after_request
+async def add_request_id_header(response):
+    response.headers['X-Request-ID'] = g.get('request_id', '')
+    return response
+
+@app.errorhandler(RequestEntityTooLarge)
+async def request_too_large(e):
+    logger.warning(f"Rejected request body larger than {MAX_UPLOAD_BYTES} bytes")
+    return jsonify({'error': f'Request body too large. The limit is {MAX_UPLOAD_BYTES} bytes.'}), 413
+
+@app.route('/api/health', methods=['GET'])
+async def health_check():
+    """Readiness check. See app.health_check."""
+    body, status = health_status()
+    return jsonify(body), status
+
+@app.route('/api/metrics', methods=['GET'])
+async def metrics_endpoint():
+    """Request, stage and cache metrics of this worker process in Prometheus text format"""
+    return Response(metrics.registry.render(), content_type=metrics.CONTENT_TYPE)
+
+def json_response(answer):
+    """Return the Quart response for a (response body, HTTP status) tuple."""
+    body, status = answer
+    return jsonify(body), status
+
+@app.route('/api/scrape', methods=['POST'])
+@admission_controlled('scrape')
+async def scrape_profile():
+    """
+    API endpoint to scrape a LinkedIn profile. See app.scrape_profile.
+    """
+    start_time = datetime.now()
+    logger.info(f"Received scrape request at {start_time}")
+
+    try:
+        url, error = scrape_request_url(await request.get_json(silent=True))
+        if error:
+            return json_response(error)
+
+        logger.info(f"Starting scrape for profile: {url}")
+        profile_data = await run_blocking(scrape_linkedin_profile, url, executor=scrape_executor)
+        profile_data = await run_blocking(save_scraped_profile, profile_data, url)
+
+        log_completion(start_time, "Request")
+        return jsonify(profile_data)
+
+    except Exception as e:
+        return json_response(server_error(e, "processing request", "scraping the profile"))
+
+@app.route('/api/compare', methods=['POST'])
+@idempotent
+@admission_controlled('compare')
+async def compare_profiles():
+    """
+    API endpoint to compare two LinkedIn profiles for a specific job role. See
+    app.compare_profiles. Both profiles are scraped concurrently.
+    """
+    start_time = datetime.now()
+    logger.info(f"Received profile comparison request at {start_time}")
+
+    try:
+        params, error = compare_request_params(await request.get_json(silent=True))
+        if error:
+            return json_response(error)
+
+        logger.info(f"Scraping user profile {params['user_url']} and reference profile {params['reference_url']}")
+        user_profile, reference_profile = await asyncio.gather(
+            run_blocking(scrape_linkedin_profile, params['user_url'], executor=scrape_executor),
+            run_blocking(scrape_linkedin_profile, params['reference_url'], executor=scrape_executor)
+        )
+
+        profiles, error = scraped_profiles(user_profile, reference_profile)
+        if error:
+            return json_response(error)
+
+        logger.info(f"Analyzing profiles for job role: {params['job_role']}")
+        analysis_result = await analyze_profiles_async(*profiles, params['job_role'], params['target_company'])
+
+        body = await run_blocking(save_comparison, params, *profiles, analysis_result)
+        log_completion(start_time, "Comparison")
+        return jsonify(body)
+
+    except Exception as e:
+        return json_response(server_error(e, "processing comparison request", "comparing profiles"))
+
+async def _process_cv_admission():
+    return admission.process_cv_endpoint((await request.form).get('mode'))
+
+@app.route('/api/process-cv', methods=['POST'])
+@admission_controlled(_process_cv_admission)
+async def process_cv_endpoint():
+    """
+    API endpoint to process a CV file. See app.process_cv_endpoint.
+    """
+    start_time = datetime.now()
+    logger.info(f"Received CV processing request at {start_time}")
+
+    try:
+        params, error = process_cv_request_params(await request.files, await request.form)
+        if error:
+            return json_response(error)
+
+        cv_file, mode, job_description = params
+        body, status = processed_cv_response(await process_cv_async(
+            cv_file.stream, cv_file.filename, mode=mode, job_description=job_description, executor=blocking_executor))
+
+        if status == 200:
+            log_completion(start_time, "CV processing")
+        return jsonify(body), status
+
+    except Exception as e:
+        return json_response(server_error(e, "processing CV", "processing the CV"))
+
+@app.route('/api/analyze-resume', methods=['POST'])
+@idempotent
+@admission_controlled('analyze-resume')
+async def analyze_resume_endpoint():
+    """
+    API endpoint to analyze a resume against a job description. See app.analyze_resume_endpoint.
+    """
+    start_time = datetime.now()
+    logger.info(f"Received resume analysis request at {start_time}")
+
+    try:
+        params, error = resume_request_params(await request.files, await request.form)
+        if error:
+            return json_response(error)
+
+        _, extracted_text, error = await run_blocking(load_requested_resume, params)
+        if error:
+            return json_response(error)
+
+        if params['mode'] == 'hybrid':
+            stages = analyze_resume_hybrid_async(extracted_text, params['job_description'], executor=blocking_executor)
+            if params['stream']:
+                async def generate():
+                    try:
+                        stage_names = iter(ANALYSIS_STAGES)
+                        async for result in stages:
+                            yield analysis_stage_line(next(stage_names), result)
+                    except Exception as e:
+                        yield analysis_stream_error(e)
+                    log_completion(start_time, "Resume analysis")
+
+                return Response(generate(), mimetype='application/x-ndjson')
+
+            parsed_result = [result async for result in stages][-1]
+            log_completion(start_time, "Resume analysis")
+            return jsonify({'analysis_result': parsed_result})
+
+        body, status = analysis_response(await analyze_resume_async(extracted_text, params['job_description']))
+        if status == 200:
+            log_completion(start_time, "Resume analysis")
+        return jsonify(body), status
+
+    except Exception as e:
+        return json_response(server_error(e, "analyzing resume", "analyzing the resume"))
+
+@app.route('/api/ats-score', methods=['POST'])
+@admission_controlled('ats-score')
+async def ats_score_endpoint():
+    """
+    API endpoint to compute the local keyword ATS score of a resume. See app.ats_score_endpoint.
+    """
+    start_time = datetime.now()
+    logger.info(f"Received ATS score request at {start_time}")
+
+    try:
+        params, error = resume_request_params(await request.files, await request.form, analysis=False)
+        if error:
+            return json_response(error)
+
+        resume_hash, extracted_text, error = await run_blocking(load_requested_resume, params)
+        if error:
+            return json_response(error)
+
+        result = await ats_pool.score_async(extracted_text, params['job_description'])
+        body, status = ats_score_response(resume_hash, result)
+        if status == 200:
+            log_completion(start_time, "ATS scoring")
+        return jsonify(body), status
+
+    except Exception as e:
+        return json_response(server_error(e, "computing ATS score", "computing the ATS score"))
+
+@app.route('/api/resumes/search', methods=['POST'])
+@admission_controlled('resumes-search')
+async def search_resumes():
+    """
+    API endpoint to find the indexed resumes that best match a job description. See app.search_resumes.
+    """
+    start_time = datetime.now()
+    try:
+        params, error = search_request_params(await request.get_json(silent=True) or await request.form)
+        if error:
+            return json_response(error)
+
+        body, status = await run_blocking(search_resume_index, *params)
+        if status == 200:
+            log_completion(start_time, f"Resume search over {body['indexed_resumes']} resumes")
+        return jsonify(body), status
+
+    except Exception as e:
+        return json_response(server_error(e, "searching resumes", "searching resumes"))
+
+@app.route('/api/analyses', methods=['GET'])
+async def list_analyses():
+    """
+    API endpoint to list stored profile comparisons, newest first. See app.list_analyses.
+    """
+    body, status = await run_blocking(list_analyses_from_args, request.args)
+    return jsonify(body), status
+
+async def cacheable_json(payload):
+    # Hashing and compressing a large analysis runs off the event loop
+    status, headers, body = await run_blocking(
+        conditional_json_response, payload, request.headers.get('If-None-Match'),
+        request.headers.get('Accept-Encoding'))
+    return Response(body, status=status, headers=headers)
+
+@app.route('/api/analyses/<int:analysis_id>', methods=['GET'])
+async def get_analysis(analysis_id):
+    """
+    API endpoint to fetch a stored comparison with both full profiles. See app.get_analysis.
+    """
+    analysis = await run_blocking(get_analysis_store().get_analysis, analysis_id)
+    if analysis is None:
+        return jsonify({'error': f'Analysis {analysis_id} not found'}), 404
+    return await cacheable_json(analysis)
+
+@app.route('/api/profiles/<profile_id>', methods=['GET'])
+async def get_profile(profile_id):
+    """
+    API endpoint to fetch a stored profile by its LinkedIn handle. See app.get_profile.
+    """
+    profile = await run_blocking(get_analysis_store().get_profile, profile_id)
+    if profile is None:
+        return jsonify({'error': f'Profile {profile_id} not found'}), 404
+    return await cacheable_json(profile)
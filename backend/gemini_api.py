@@ -1,8 +1,11 @@
 import os
 import json
 import logging
-import google.generativeai as genai
+import threading
 from dotenv import load_dotenv
+from log_config import log_payload
+from metrics import time_stage, timed_stage
+from models import Profile, dumps
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -10,41 +13,47 @@ logger = logging.getLogger(__name__)
 # Load environment variables
 load_dotenv()
 
-# Configure the Gemini API
-try:
-    GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
-    if not GEMINI_API_KEY:
-        logger.warning("GEMINI_API_KEY not found in environment variables")
-    else:
-        genai.configure(api_key=GEMINI_API_KEY)
-except Exception as e:
-    logger.error(f"Error configuring Gemini API: {e}")
+GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY")
+if not GEMINI_API_KEY:
+    logger.warning("GEMINI_API_KEY not found in environment variables")
 
-def analyze_profiles(user_profile, reference_profile, job_role, target_company):
-    """
-    Analyze and compare two LinkedIn profiles for a specific job role using Gemini API
+# The Gemini client is imported and configured on first use (or by warm_up())
+_model = None
+_model_lock = threading.Lock()
 
-    Args:
-        user_profile (dict): The user's LinkedIn profile data
-        reference_profile (dict): The reference LinkedIn profile data (someone in the target role)
-        job_role (str): The target job role
-        target_company (str): The target company
-
-    Returns:
-        dict: Analysis results including comparison, recommendations, and action items
+def get_model():
     """
-    try:
-        if not GEMINI_API_KEY:
-            return {
-                "error": "Gemini API key not configured. Please add GEMINI_API_KEY to your .env file."
-            }
-
-        # Format the profiles for better prompt structure
-        user_profile_str = json.dumps(user_profile, indent=2)
-        reference_profile_str = json.dumps(reference_profile, indent=2)
+    Return the Gemini model, configuring the Gemini API on first use.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                import google.generativeai as genai
+                genai.configure(api_key=GEMINI_API_KEY)
+                _model = genai.GenerativeModel('gemini-2.0-flash')  # Updated to use gemini-2.0-flash
+    return _model
+
+def warm_up():
+    """
+    Load and configure the Gemini client ahead of the first request.
 
-        # Create the prompt for Gemini
-        prompt = f"""
+    Raises:
+        ValueError: If GEMINI_API_KEY is not set, so comparisons cannot work.
+    """
+    if not GEMINI_API_KEY:
+        raise ValueError("GEMINI_API_KEY not found in environment variables")
+    get_model()
+
+@timed_stage("prompt_build")
+def _profiles_prompt(user_profile, reference_profile, job_role, target_company):
+    # Format the normalized profiles for better prompt structure; placeholders
+    # and doubled text are gone, so the prompt carries fewer tokens
+    user_profile_str = dumps(Profile.from_dict(user_profile), indent=True).decode('utf-8')
+    reference_profile_str = dumps(Profile.from_dict(reference_profile), indent=True).decode('utf-8')
+
+    # Create the prompt for Gemini
+    return f"""
         You are a professional career advisor specializing in helping people transition to new roles.
 
         I need you to compare two LinkedIn profiles and provide a detailed analysis for the job role: {job_role}
@@ -106,67 +115,114 @@ def analyze_profiles(user_profile, reference_profile, job_role, target_company):
         Ensure your analysis is specific to the {job_role} role, {target_company} comapny and provides practical, actionable advice. Remember to return ONLY valid JSON with no additional text or explanation.
         """
 
-        # Call Gemini API
-        model = genai.GenerativeModel('gemini-2.0-flash')  # Updated to use gemini-2.0-flash
-        response = model.generate_content(prompt)
+def _parse_profiles_response(response):
+    """
+    Turn the Gemini response into the analysis dict, or a dict with an 'error' entry.
+    """
+    # Parse the response
+    try:
+        # Extract JSON from the response
+        response_text = response.text
+        log_payload(logger, "Raw Gemini response", response_text)
+
+        # Find JSON content (in case there's additional text)
+        json_start = response_text.find('{')
+        if json_start == -1:
+            logger.error("No JSON object found in response")
+            return {
+                "error": "No JSON object found in response",
+                "raw_response": response_text
+            }
+
+        json_end = response_text.rfind('}') + 1
+        json_str = response_text[json_start:json_end]
 
-        # Parse the response
+        # Try to parse the JSON
         try:
-            # Extract JSON from the response
-            response_text = response.text
-            logger.info(f"Raw Gemini response: {response_text[:500]}...")  # Log first 500 chars of response
-
-            # Find JSON content (in case there's additional text)
-            json_start = response_text.find('{')
-            if json_start == -1:
-                logger.error("No JSON object found in response")
-                return {
-                    "error": "No JSON object found in response",
-                    "raw_response": response_text
-                }
-
-            json_end = response_text.rfind('}') + 1
-            json_str = response_text[json_start:json_end]
-
-            # Try to parse the JSON
-            try:
-                analysis_result = json.loads(json_str)
-                logger.info("Successfully parsed JSON response")
-                return analysis_result
-            except json.JSONDecodeError as e:
-                logger.error(f"Error parsing JSON: {e}")
-
-                # Try to create a structured response manually if JSON parsing fails
-                return {
-                    "skills_comparison": {
-                        "matching_skills": ["Could not parse skills"],
-                        "missing_skills": ["Please check raw response"],
-                        "skill_gap_percentage": 50
-                    },
-                    "experience_analysis": {
-                        "alignment": "Could not analyze experience alignment. Please check the raw response.",
-                        "gaps": ["Error parsing response"],
-                        "suggestions": ["Please try again later"]
-                    },
-                    "education_comparison": {
-                        "analysis": "Could not analyze education. Please check the raw response.",
-                        "recommendations": ["Error parsing response"]
-                    },
-                    "actionable_recommendations": {
-                        "steps": ["Could not generate recommendations"],
-                        "priority_skills": ["Error parsing response"],
-                        "recommended_projects": ["Please try again later"]
-                    },
-                    "strengths": ["Could not identify strengths"],
-                    "error": "Failed to parse analysis results",
-                    "raw_response_excerpt": response_text[:1000]  # Include first 1000 chars of response
-                }
-        except Exception as e:
-            logger.error(f"Unexpected error processing Gemini response: {e}")
+            analysis_result = json.loads(json_str)
+            logger.info("Successfully parsed JSON response")
+            return analysis_result
+        except json.JSONDecodeError as e:
+            logger.error(f"Error parsing JSON: {e}")
+
+            # Try to create a structured response manually if JSON parsing fails
             return {
-                "error": f"Failed to process analysis results: {str(e)}",
-                "raw_response_excerpt": response.text[:1000] if hasattr(response, 'text') else "No response text available"
+                "skills_comparison": {
+                    "matching_skills": ["Could not parse skills"],
+                    "missing_skills": ["Please check raw response"],
+                    "skill_gap_percentage": 50
+                },
+                "experience_analysis": {
+                    "alignment": "Could not analyze experience alignment. Please check the raw response.",
+                    "gaps": ["Error parsing response"],
+                    "suggestions": ["Please try again later"]
+                },
+                "education_comparison": {
+                    "analysis": "Could not analyze education. Please check the raw response.",
+                    "recommendations": ["Error parsing response"]
+                },
+                "actionable_recommendations": {
+                    "steps": ["Could not generate recommendations"],
+                    "priority_skills": ["Error parsing response"],
+                    "recommended_projects": ["Please try again later"]
+                },
+                "strengths": ["Could not identify strengths"],
+                "error": "Failed to parse analysis results",
+                "raw_response_excerpt": response_text[:1000]  # Include first 1000 chars of response
             }
+    except Exception as e:
+        logger.error(f"Unexpected error processing Gemini response: {e}")
+        return {
+            "error": f"Failed to process analysis results: {str(e)}",
+            "raw_response_excerpt": response.text[:1000] if hasattr(response, 'text') else "No response text available"
+        }
+
+def analyze_profiles(user_profile, reference_profile, job_role, target_company):
+    """
+    Analyze and compare two LinkedIn profiles for a specific job role using Gemini API
+
+    Args:
+        user_profile (Profile or dict): The user's LinkedIn profile data
+        reference_profile (Profile or dict): The reference LinkedIn profile data (someone in the target role)
+        job_role (str): The target job role
+        target_company (str): The target company
+
+    Returns:
+        dict: Analysis results including comparison, recommendations, and action items
+    """
+    try:
+        if not GEMINI_API_KEY:
+            return {
+                "error": "Gemini API key not configured. Please add GEMINI_API_KEY to your .env file."
+            }
+
+        # Call Gemini API
+        prompt = _profiles_prompt(user_profile, reference_profile, job_role, target_company)
+        with time_stage("llm_call"):
+            response = get_model().generate_content(prompt)
+        return _parse_profiles_response(response)
+
+    except Exception as e:
+        logger.error(f"Error in Gemini analysis: {e}")
+        return {
+            "error": f"Analysis failed: {str(e)}"
+        }
+
+async def analyze_profiles_async(user_profile, reference_profile, job_role, target_company):
+    """
+    Same as analyze_profiles(), but awaits the Gemini response instead of
+    blocking a thread on it. Used by the ASGI server.
+    """
+    try:
+        if not GEMINI_API_KEY:
+            return {
+                "error": "Gemini API key not configured. Please add GEMINI_API_KEY to your .env file."
+            }
+
+        prompt = _profiles_prompt(user_profile, reference_profile, job_role, target_company)
+        with time_stage("llm_call"):
+            response = await get_model().generate_content_async(prompt)
+        return _parse_profiles_response(response)
 
     except Exception as e:
         logger.error(f"Error in Gemini analysis: {e}")
@@ -0,0 +1,16 @@
+# Gunicorn settings for serving app.py (WSGI mode). serve.py passes the
+# command-line overrides; these are the defaults when gunicorn is run directly.
+import os
+
+bind = f"{os.environ.get('HOST', '0.0.0.0')}:{os.environ.get('PORT', '5000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', str(min(4, os.cpu_count() or 1))))
+# Each in-flight request holds a thread for its whole duration in WSGI mode
+threads = int(os.environ.get('WEB_THREADS', '8'))
+# Comparisons wait on two browser sessions and an LLM call
+timeout = int(os.environ.get('WEB_TIMEOUT', '180'))
+accesslog = '-'
+
+def post_worker_init(worker):
+    # Warm up in every worker, like `python app.py` does for the development server
+    import app
+    app.start_warm_up()
@@ -0,0 +1,108 @@
+import os
+import gzip
+import hashlib
+
+try:
+    import brotli
+except ImportError:
+    # Optional: without it responses are gzip-compressed only
+    brotli = None
+
+from models import dumps
+
+# Bodies smaller than this are sent uncompressed; the headers would eat the saving
+COMPRESS_MIN_BYTES = int(os.getenv("COMPRESS_MIN_BYTES", "1024"))
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "5"))
+
+# Browsers may keep the response but must revalidate it with If-None-Match before reuse
+CACHE_CONTROL = 'private, no-cache'
+
+def _accepted_encodings(accept_encoding):
+    """Return the content codings an Accept-Encoding header allows (q > 0)."""
+    accepted = set()
+    for item in (accept_encoding or '').split(','):
+        coding, _, params = item.strip().partition(';')
+        quality = 1.0
+        for param in params.split(';'):
+            name, _, value = param.strip().partition('=')
+            if name == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding and quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+def choose_encoding(accept_encoding):
+    """
+    Return 'br' or 'gzip' for the best coding the client accepts, or None.
+    """
+    accepted = _accepted_encodings(accept_encoding)
+    if brotli is not None and ('br' in accepted or '*' in accepted):
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+def _compress(body, encoding):
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+def etag_matches(if_none_match, base_tag):
+    """
+    Return True when an If-None-Match header names any representation of
+    the content with this base tag (identity, gzip or br).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == '*':
+        return True
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        tag = tag.strip('"')
+        for suffix in ('-gzip', '-br'):
+            if tag.endswith(suffix):
+                tag = tag[:-len(suffix)]
+        if tag == base_tag:
+            return True
+    return False
+
+def conditional_json_response(payload, if_none_match=None, accept_encoding=None):
+    """
+    Serialize a payload for a cacheable GET: tag it with a strong ETag,
+    answer a matching If-None-Match with 304 and no body, and compress
+    large bodies with the best coding the client accepts.
+
+    The ETag is a hash of the canonical JSON (sorted keys), so it only
+    changes when the data does. Each coding gets its own tag, as strong
+    ETags must differ between byte-different representations.
+
+    Args:
+        payload: JSON-serializable response data, or a model from models.py.
+        if_none_match (str): The request's If-None-Match header.
+        accept_encoding (str): The request's Accept-Encoding header.
+
+    Returns:
+        tuple: (status, headers dict, body bytes).
+    """
+    body = dumps(payload, sort_keys=True)
+    base_tag = hashlib.sha256(body).hexdigest()[:32]
+    encoding = choose_encoding(accept_encoding) if len(body) >= COMPRESS_MIN_BYTES else None
+    headers = {
+        'ETag': f'"{base_tag}-{encoding}"' if encoding else f'"{base_tag}"',
+        'Cache-Control': CACHE_CONTROL,
+        'Vary': 'Accept-Encoding'
+    }
+    if etag_matches(if_none_match, base_tag):
+        return 304, headers, b''
+
+    if encoding:
+        body = _compress(body, encoding)
+        headers['Content-Encoding'] = encoding
+    headers['Content-Type'] = 'application/json'
+    return 200, headers, body
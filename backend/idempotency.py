@@ -0,0 +1,254 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import sqlite3
+import logging
+import threading
+
+from resume_cache import hash_stream
+import metrics
+
+logger = logging.getLogger(__name__)
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+DEFAULT_DB_PATH = os.getenv("IDEMPOTENCY_DB_PATH", os.path.join(DATA_DIR, "idempotency.db"))
+# Seconds a completed response is replayed for a repeated Idempotency-Key
+IDEMPOTENCY_TTL = float(os.getenv("IDEMPOTENCY_TTL", str(24 * 60 * 60)))
+# Requests without the header get a key derived from their body and client
+# (address and User-Agent) when this is on, kept for a short window that
+# catches double-clicks and client retries
+IDEMPOTENCY_AUTO_KEYS = os.getenv("IDEMPOTENCY_AUTO_KEYS", "0").lower() in ("1", "true", "yes")
+IDEMPOTENCY_AUTO_TTL = float(os.getenv("IDEMPOTENCY_AUTO_TTL", "60"))
+# Seconds a duplicate waits for an original running in the same process
+# before getting 409 with Retry-After. It waits outside admission control,
+# holding its worker thread, so the cap is short; a duplicate of a request
+# running in another worker process gets 409 straight away.
+IDEMPOTENCY_WAIT = float(os.getenv("IDEMPOTENCY_WAIT", "30"))
+# Claims older than this are taken to belong to a crashed worker and re-run
+IDEMPOTENCY_IN_FLIGHT_TIMEOUT = float(os.getenv("IDEMPOTENCY_IN_FLIGHT_TIMEOUT", "300"))
+# 5xx and 429 responses are kept just long enough for the waiting duplicates
+# to pick them up; a retry after that runs again
+FAILED_TTL = 2.0
+MAX_KEY_LENGTH = 255
+PRUNE_INTERVAL = 60
+
+HEADER = 'Idempotency-Key'
+REPLAYED_HEADER = 'Idempotent-Replayed'
+
+# Outcomes of IdempotencyStore.begin
+NEW, DONE, IN_FLIGHT, MISMATCH = "new", "done", "in_flight", "mismatch"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS idempotency_keys (
+    key TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    status INTEGER,
+    content_type TEXT,
+    body BLOB,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS idempotency_keys_expires ON idempotency_keys (expires_at);
+"""
+
+REPLAYS = metrics.registry.counter(
+    "idempotent_replays_total", "Requests answered from an earlier execution with the same idempotency key.",
+    ("endpoint",))
+
+def request_fingerprint(path, json_body=None, form_items=(), file_items=()):
+    """
+    Return a SHA-256 over the parts of a request that determine its result:
+    the path, the JSON body, the form fields and the contents of uploaded
+    files. Multipart boundaries and field order do not affect it.
+
+    Args:
+        form_items: (name, value) pairs.
+        file_items: (name, FileStorage) pairs; their streams are left rewound.
+    """
+    files = sorted((name, storage.filename or '', hash_stream(storage.stream)) for name, storage in file_items)
+    canonical = json.dumps([path, json_body, sorted(form_items), files], sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def client_identity(access_route, user_agent):
+    """
+    Return a short hash identifying the client of a request, from its
+    originating address and User-Agent, to scope derived keys.
+    """
+    address = access_route[0] if access_route else ''
+    return hashlib.sha256(f"{address}|{user_agent or ''}".encode('utf-8')).hexdigest()[:16]
+
+def resolve_key(path, header_value, fingerprint, client=''):
+    """
+    Return (scoped key, retention seconds) for a request, or (None, None)
+    when it has no Idempotency-Key and keys are not derived. Derived keys
+    include the client, so identical requests from different users never
+    share a response.
+
+    Raises:
+        ValueError: If the Idempotency-Key header is empty or too long.
+    """
+    if header_value is not None:
+        header_value = header_value.strip()
+        if not header_value or len(header_value) > MAX_KEY_LENGTH:
+            raise ValueError(f"{HEADER} must be 1 to {MAX_KEY_LENGTH} characters")
+        return f"{path}:key:{header_value}", IDEMPOTENCY_TTL
+    if IDEMPOTENCY_AUTO_KEYS:
+        return f"{path}:body:{client}:{fingerprint}", IDEMPOTENCY_AUTO_TTL
+    return None, None
+
+def _resolve(future):
+    if not future.done():
+        future.set_result(None)
+
+class IdempotencyStore:
+    """
+    SQLite table of idempotency keys shared by all worker processes.
+
+    The first request with a key claims it, runs, and stores its response.
+    A duplicate that arrives while the original is in flight in the same
+    process waits for that response (on an in-process event, not by polling
+    the database), and one that arrives later gets the stored copy until
+    the retention window ends. A 5xx or 429 response is handed to the duplicates that
+    were waiting for it, but later retries run again, as do retries of a
+    request that was streamed or raised.
+    """
+
+    def __init__(self, path=DEFAULT_DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._last_prune = 0.0
+        # key -> (threading.Event, [(loop, future)]) for the keys this process is running
+        self._running = {}
+        self._running_lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connection().executescript(SCHEMA)
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            self._local.connection = connection
+        return connection
+
+    def begin(self, key, fingerprint):
+        """
+        Claim a key, or report what holds it.
+
+        Returns:
+            tuple: (NEW, None) when this request now owns the key and must run,
+            (DONE, (status, content_type, body)) to replay a stored response,
+            (IN_FLIGHT, None) while another request runs it, or
+            (MISMATCH, None) when the key was used for a different request.
+        """
+        now = time.time()
+        connection = self._connection()
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            row = connection.execute(
+                "SELECT fingerprint, status, content_type, body, expires_at FROM idempotency_keys WHERE key = ?",
+                (key,)).fetchone()
+            if row is not None and row[4] < now:
+                connection.execute("DELETE FROM idempotency_keys WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                connection.execute(
+                    "INSERT INTO idempotency_keys (key, fingerprint, created_at, expires_at) VALUES (?, ?, ?, ?)",
+                    (key, fingerprint, now, now + IDEMPOTENCY_IN_FLIGHT_TIMEOUT))
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        if row is None:
+            with self._running_lock:
+                self._running[key] = (threading.Event(), [])
+            self._prune(now)
+            return NEW, None
+        if row[0] != fingerprint:
+            return MISMATCH, None
+        if row[1] is None:
+            return IN_FLIGHT, None
+        return DONE, (row[1], row[2], row[3])
+
+    def complete(self, key, status, content_type, body, ttl):
+        """
+        Store the response of a claimed key for ttl seconds (FAILED_TTL for a
+        5xx or a 429 from admission control).
+        """
+        if status >= 500 or status == 429:
+            ttl = min(ttl, FAILED_TTL)
+        self._connection().execute(
+            "UPDATE idempotency_keys SET status = ?, content_type = ?, body = ?, expires_at = ? WHERE key = ?",
+            (status, content_type, body, time.time() + ttl, key))
+        self._finished(key)
+
+    def abandon(self, key):
+        """
+        Release a claimed key without a stored response, so the next request with it runs again.
+        """
+        self._connection().execute("DELETE FROM idempotency_keys WHERE key = ? AND status IS NULL", (key,))
+        self._finished(key)
+
+    def _finished(self, key):
+        # Wake the duplicates waiting in this process
+        with self._running_lock:
+            entry = self._running.pop(key, None)
+        if entry is None:
+            return
+        event, futures = entry
+        event.set()
+        for loop, future in futures:
+            loop.call_soon_threadsafe(_resolve, future)
+
+    def acquire(self, key, fingerprint, wait=IDEMPOTENCY_WAIT):
+        """
+        begin() a key, waiting up to wait seconds while it is in flight in
+        this process.
+
+        Returns:
+            tuple: As begin(); (IN_FLIGHT, None) when the wait ran out or the
+            key is in flight in another process.
+        """
+        state, stored = self.begin(key, fingerprint)
+        if state != IN_FLIGHT:
+            return state, stored
+        with self._running_lock:
+            entry = self._running.get(key)
+        if entry is not None:
+            entry[0].wait(wait)
+        # Also catches an original that finished between begin() and the lookup
+        return self.begin(key, fingerprint)
+
+    async def acquire_async(self, key, fingerprint, executor=None, wait=IDEMPOTENCY_WAIT):
+        """
+        Same as acquire(), waiting on the event loop.
+        """
+        loop = asyncio.get_running_loop()
+        state, stored = await loop.run_in_executor(executor, self.begin, key, fingerprint)
+        if state != IN_FLIGHT:
+            return state, stored
+        with self._running_lock:
+            entry = self._running.get(key)
+            future = None
+            if entry is not None:
+                future = loop.create_future()
+                entry[1].append((loop, future))
+        if future is not None:
+            try:
+                await asyncio.wait_for(future, wait)
+            except asyncio.TimeoutError:
+                pass
+        return await loop.run_in_executor(executor, self.begin, key, fingerprint)
+
+    def _prune(self, now):
+        if now - self._last_prune < PRUNE_INTERVAL:
+            return
+        self._last_prune = now
+        deleted = self._connection().execute("DELETE FROM idempotency_keys WHERE expires_at < ?", (now,)).rowcount
+        if deleted:
+            logger.debug(f"Pruned {deleted} expired idempotency keys")
@@ -0,0 +1,237 @@
+"""
+Typed model of scraped LinkedIn profiles and the comparisons run between
+them, with the one normalization step every profile goes through and the
+JSON serializer used for storage, caching and responses.
+
+Profile.from_dict() turns the scraper's ad-hoc dict into the canonical
+form: whitespace collapsed, the about section's heading removed, the
+scraper's placeholder strings ('Name not found', ...) replaced by None,
+empty entries dropped and skills deduplicated. Every key is always
+present in the JSON form, with null for what is missing.
+
+dumps() and loads() use orjson when it is installed and the json module
+otherwise; both produce the same compact JSON.
+"""
+import re
+import json
+from dataclasses import dataclass, field
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:
+    # Optional: without it the json module is used, several times slower
+    orjson = None
+
+# Values the scraper writes when it cannot find a field
+PLACEHOLDERS = frozenset({
+    'Name not found', 'Headline not found', 'About section not found', 'Company name not found',
+    'Duration not found', 'Skill name not found', 'Name not available', 'Headline not available'
+})
+
+# The about section's own title, when the scraper picked it up with the
+# text: repeated ("AboutAbout", the visible and screen-reader copies) or on
+# a line of its own. An about text that merely starts with the word is kept.
+ABOUT_HEADING = re.compile(r'^\s*About(?:\s*About\b|[ \t]*\n)\s*')
+
+def clean_text(value):
+    """
+    Return the canonical form of a scraped string, or None when it is
+    empty or a placeholder. Runs of whitespace become one space.
+    """
+    if value is None:
+        return None
+    text = " ".join(str(value).split())
+    if not text or text in PLACEHOLDERS:
+        return None
+    return text
+
+def _clean_about(value):
+    if value is None:
+        return None
+    return clean_text(ABOUT_HEADING.sub('', str(value), count=1))
+
+@dataclass(slots=True)
+class Designation:
+    designation: Optional[str] = None
+    duration: Optional[str] = None
+    location: Optional[str] = None
+    projects: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(clean_text(data.get('designation')), clean_text(data.get('duration')),
+                   clean_text(data.get('location')), clean_text(data.get('projects')))
+
+    def to_dict(self):
+        return {'designation': self.designation, 'duration': self.duration, 'location': self.location,
+                'projects': self.projects}
+
+@dataclass(slots=True)
+class Experience:
+    company_name: Optional[str] = None
+    duration: Optional[str] = None
+    designations: list = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data):
+        designations = [Designation.from_dict(item) for item in data.get('designations') or ()]
+        return cls(clean_text(data.get('company_name')), clean_text(data.get('duration')),
+                   [item for item in designations if any((item.designation, item.duration, item.location,
+                                                          item.projects))])
+
+    def to_dict(self):
+        return {'company_name': self.company_name, 'duration': self.duration,
+                'designations': [item.to_dict() for item in self.designations]}
+
+@dataclass(slots=True)
+class Education:
+    college: Optional[str] = None
+    degree: Optional[str] = None
+    duration: Optional[str] = None
+    grade: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(clean_text(data.get('college')), clean_text(data.get('degree')),
+                   clean_text(data.get('duration')), clean_text(data.get('grade')))
+
+    def to_dict(self):
+        return {'college': self.college, 'degree': self.degree, 'duration': self.duration, 'grade': self.grade}
+
+@dataclass(slots=True)
+class Skill:
+    skill_name: str
+
+    def to_dict(self):
+        return {'skill_name': self.skill_name}
+
+@dataclass(slots=True)
+class Profile:
+    """
+    A scraped LinkedIn profile. Build it with from_dict(), which normalizes
+    the scraper's output; the JSON form has the scraper's keys.
+    """
+    url: Optional[str] = None
+    name: Optional[str] = None
+    headline: Optional[str] = None
+    about: Optional[str] = None
+    experience: list = field(default_factory=list)
+    education: list = field(default_factory=list)
+    skills: list = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Return the normalized Profile of a scraped or stored profile dict
+        (a Profile is returned as it is).
+        """
+        if isinstance(data, cls):
+            return data
+        experience = [Experience.from_dict(item) for item in data.get('experience') or ()]
+        education = [Education.from_dict(item) for item in data.get('education') or ()]
+        skills = []
+        seen = set()
+        for item in data.get('skills') or ():
+            name = clean_text(item.get('skill_name') if isinstance(item, dict) else item)
+            if name is not None and name.lower() not in seen:
+                seen.add(name.lower())
+                skills.append(Skill(name))
+        return cls(
+            url=(data.get('url') or '').strip() or None,
+            name=clean_text(data.get('name')),
+            headline=clean_text(data.get('headline')),
+            about=_clean_about(data.get('about')),
+            experience=[item for item in experience if item.company_name or item.duration or item.designations],
+            education=[item for item in education if any((item.college, item.degree, item.duration, item.grade))],
+            skills=skills
+        )
+
+    def to_dict(self):
+        """Return the JSON form as plain dicts and lists."""
+        return {
+            'url': self.url,
+            'name': self.name,
+            'headline': self.headline,
+            'about': self.about,
+            'experience': [item.to_dict() for item in self.experience],
+            'education': [item.to_dict() for item in self.education],
+            'skills': [item.to_dict() for item in self.skills]
+        }
+
+@dataclass(slots=True)
+class Analysis:
+    """
+    A stored comparison of two profiles. 'analysis' is the model's answer
+    as returned, since its sections are defined by the prompt.
+    """
+    user_profile: Profile
+    reference_profile: Profile
+    job_role: Optional[str]
+    target_company: Optional[str]
+    analysis: dict
+    id: Optional[int] = None
+    created_at: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(Profile.from_dict(data.get('user_profile') or {}),
+                   Profile.from_dict(data.get('reference_profile') or {}),
+                   data.get('job_role'), data.get('target_company'), data.get('analysis') or {},
+                   data.get('id'), data.get('created_at'))
+
+    def to_dict(self):
+        return {
+            'user_profile': self.user_profile.to_dict(),
+            'reference_profile': self.reference_profile.to_dict(),
+            'job_role': self.job_role,
+            'target_company': self.target_company,
+            'analysis': self.analysis,
+            'id': self.id,
+            'created_at': self.created_at
+        }
+
+def _jsonable(default):
+    def convert(obj):
+        if hasattr(obj, 'to_dict'):
+            return obj.to_dict()
+        if default is not None:
+            return default(obj)
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+    return convert
+
+def dumps(obj, indent=False, sort_keys=False, default=None):
+    """
+    Serialize models, dicts and lists to compact UTF-8 JSON.
+
+    Args:
+        indent (bool): Indent by two spaces, e.g. for prompts.
+        sort_keys (bool): Sort dict keys, for output that hashes the same
+            whatever the insertion order.
+        default: Called for objects neither serializer handles, like the
+            json module's default.
+
+    Returns:
+        bytes: The JSON document.
+    """
+    if hasattr(obj, 'to_dict'):
+        obj = obj.to_dict()
+    if orjson is not None:
+        # orjson's own dataclass encoder is slower than the models' to_dict()
+        option = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATACLASS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=_jsonable(default), option=option)
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None,
+                      separators=(',', ': ') if indent else (',', ':'), sort_keys=sort_keys,
+                      default=_jsonable(default)).encode('utf-8')
+
+def loads(data):
+    """
+    Parse a JSON document from bytes or str.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
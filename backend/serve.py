@@ -0,0 +1,52 @@
+import os
+import sys
+import argparse
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def build_command(args):
+    """
+    Return the server command line for the chosen mode.
+    """
+    if args.mode == 'asgi':
+        # Handlers await the scraper, Gemini and file I/O, so a few worker
+        # processes can keep hundreds of requests in flight
+        return [
+            sys.executable, '-m', 'uvicorn', 'asgi:app',
+            '--app-dir', BACKEND_DIR,
+            '--host', args.host,
+            '--port', str(args.port),
+            '--workers', str(args.workers),
+            '--timeout-graceful-shutdown', str(args.timeout)
+        ]
+    return [
+        sys.executable, '-m', 'gunicorn', 'app:app',
+        '--chdir', BACKEND_DIR,
+        '--config', os.path.join(BACKEND_DIR, 'gunicorn.conf.py'),
+        '--bind', f"{args.host}:{args.port}",
+        '--workers', str(args.workers),
+        '--threads', str(args.threads),
+        '--timeout', str(args.timeout)
+    ]
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the backend with a production server")
+    parser.add_argument('--mode', choices=('asgi', 'wsgi'), default=os.environ.get('SERVER_MODE', 'asgi'),
+                        help="asgi: async handlers on uvicorn (default); wsgi: app.py on gunicorn threads")
+    parser.add_argument('--host', default=os.environ.get('HOST', '0.0.0.0'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PORT', '5000')))
+    parser.add_argument('--workers', type=int, default=int(os.environ.get('WEB_CONCURRENCY', str(min(4, os.cpu_count() or 1)))),
+                        help="Worker processes (default: WEB_CONCURRENCY or min(4, CPU count))")
+    parser.add_argument('--threads', type=int, default=int(os.environ.get('WEB_THREADS', '8')),
+                        help="Threads per worker in wsgi mode (default: WEB_THREADS or 8)")
+    parser.add_argument('--timeout', type=int, default=int(os.environ.get('WEB_TIMEOUT', '180')),
+                        help="Seconds a wsgi request may run, or the asgi graceful shutdown window")
+    args = parser.parse_args()
+
+    command = build_command(args)
+    print(f"Starting {args.mode} server: {' '.join(command)}")
+    os.chdir(BACKEND_DIR)
+    os.execv(command[0], command)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Throughput benchmark for batch_score.KeywordMatrix.
+
+Builds synthetic keyword Counters shaped like extract_keywords output (a
+Zipf-like vocabulary, a few hundred keywords per resume) and scores one job
+description against all of them, both with the per-resume new.score_keywords
+loop and with the sparse-matrix scorer. Reports resumes/sec for each and checks
+that both produce the same scores.
+
+Usage:
+    python benchmarks/batch_score_bench.py [--resumes 50000] [--top 10] [--seed 0]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+from collections import Counter
+
+python_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'python'))
+sys.path.append(python_path)
+
+from new import score_keywords
+from batch_score import KeywordMatrix
+
+VOCABULARY_SIZE = 30000
+
+def synthetic_keywords(rng, vocabulary, size):
+    """One Counter of keyword weights, in the 1 / 0.5 steps extract_keywords produces."""
+    terms = rng.choices(vocabulary, weights=[1 / (rank + 1) for rank in range(len(vocabulary))], k=size)
+    keywords = Counter()
+    for term in terms:
+        keywords[term] += rng.choice([1, 0.5])
+    return keywords
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark vectorized one-JD-vs-many ATS scoring")
+    parser.add_argument('--resumes', type=int, default=50000, help="Number of synthetic resumes")
+    parser.add_argument('--top', type=int, default=10, help="K for the top-K query")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    vocabulary = [f"term{i}" for i in range(VOCABULARY_SIZE)]
+    job_keywords = synthetic_keywords(rng, vocabulary, 400)
+    resumes = [synthetic_keywords(rng, vocabulary, rng.randint(150, 600)) for _ in range(args.resumes)]
+    print(f"Corpus: {len(resumes)} resumes, {len(job_keywords)} job keywords")
+
+    start = time.perf_counter()
+    matrix = KeywordMatrix.from_keywords(range(len(resumes)), resumes)
+    build = time.perf_counter() - start
+    print(f"  matrix build:           {build:8.2f}s ({matrix.matrix.nnz:,} non-zeros, {len(matrix.vocabulary):,} terms)")
+
+    start = time.perf_counter()
+    loop_scores = [score_keywords(resume, job_keywords)[0] for resume in resumes]
+    loop = len(resumes) / (time.perf_counter() - start)
+    print(f"  score_keywords loop:    {loop:12,.0f} resumes/sec")
+
+    start = time.perf_counter()
+    scores, _, _ = matrix.score(job_keywords)
+    vectorized = len(resumes) / (time.perf_counter() - start)
+    print(f"  sparse matrix score:    {vectorized:12,.0f} resumes/sec ({vectorized / loop:.1f}x)")
+
+    start = time.perf_counter()
+    top = matrix.top_k(job_keywords, args.top)
+    top_k = len(resumes) / (time.perf_counter() - start)
+    print(f"  sparse matrix top-{args.top}:   {top_k:12,.0f} resumes/sec")
+
+    worst = max(abs(a - b) for a, b in zip(scores, loop_scores))
+    print(f"  max score difference vs loop: {worst:.2e}")
+    print(f"  best match: resume {top[0]['id']} at {top[0]['score']:.2f}%")
+
+if __name__ == "__main__":
+    main()
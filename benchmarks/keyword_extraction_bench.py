@@ -0,0 +1,104 @@
+"""
+Throughput benchmark for new.extract_keywords.
+
+Runs the per-token implementation that extract_keywords replaced (one
+pos_tag call and one synsets walk per token) and the current batched,
+memoized one over the sample resumes and a job description. Reports
+tokens/sec for both, with the current one measured cold (empty lemma/synonym
+cache) and warm.
+
+Usage:
+    python benchmarks/keyword_extraction_bench.py [--repeat 3]
+"""
+import os
+import sys
+import time
+import argparse
+from collections import Counter
+
+python_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'python'))
+sys.path.append(python_path)
+
+import nltk
+from nltk.corpus import wordnet
+from nltk.tokenize import word_tokenize
+from nltk.stem import WordNetLemmatizer
+
+from CV import extract_text_from_resume
+from new import extract_keywords, expand_keyword, get_wordnet_pos, get_synonym_index
+
+SAMPLE_FILES = ['Resume1.pdf', 'JP_Om_Thanage_Resume.pdf']
+
+JOB_DESCRIPTION = """
+Software Engineer, Full Stack. We are looking for an engineer to design, build and
+maintain web applications used by millions of customers. You will work with React,
+TypeScript and Node.js on the frontend and Python, Java and Go services on the backend,
+deployed on AWS with Docker and Kubernetes. Responsibilities include writing clean,
+tested code, reviewing pull requests, improving performance and reliability, and
+collaborating with product managers and designers in an agile team. Requirements:
+a bachelor's degree in computer science or equivalent experience, strong knowledge of
+data structures and algorithms, experience with relational databases such as PostgreSQL,
+REST APIs, CI/CD pipelines and cloud infrastructure. Experience with machine learning,
+distributed systems or mobile development is a plus.
+"""
+
+def legacy_extract_keywords(text):
+    """The per-token implementation, kept as the baseline."""
+    lemmatizer = WordNetLemmatizer()
+    words = word_tokenize(text.lower())
+    words = [word for word in words if word.isalnum()]
+    processed_keywords = Counter()
+    for word in words:
+        lemma = lemmatizer.lemmatize(word, get_wordnet_pos(word))
+        processed_keywords[lemma] += 1
+        for syn in wordnet.synsets(word):
+            for lemma in syn.lemmas():
+                processed_keywords[lemma.name().lower()] += 0.5
+    return processed_keywords
+
+def count_tokens(text):
+    return sum(1 for word in word_tokenize(text.lower()) if word.isalnum())
+
+def measure(fn, texts, repeat):
+    tokens = sum(count_tokens(text) for text in texts) * repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            fn(text)
+    return tokens / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark extract_keywords tokens/sec")
+    parser.add_argument('--repeat', type=int, default=3, help="Passes over the corpus")
+    args = parser.parse_args()
+
+    texts = [JOB_DESCRIPTION]
+    for name in SAMPLE_FILES:
+        text = extract_text_from_resume(os.path.join(python_path, name))
+        if not text.startswith("Error"):
+            texts.append(text)
+    print(f"Corpus: {len(texts)} documents, {sum(count_tokens(t) for t in texts)} tokens")
+
+    # Load the corpora and tagger once so neither side pays for it
+    wordnet.ensure_loaded()
+    nltk.pos_tag(["warm"])
+
+    legacy = measure(legacy_extract_keywords, texts, args.repeat)
+    print(f"  per-token (before):     {legacy:10,.0f} tokens/sec")
+
+    index = get_synonym_index()
+    print(f"  expansions served by: {index.path if index else 'live WordNet (no synonym index built)'}")
+    expand_keyword.cache_clear()
+    cold = measure(extract_keywords, texts, 1)
+    print(f"  batched, cold cache:    {cold:10,.0f} tokens/sec ({cold / legacy:.1f}x)")
+
+    warm = measure(extract_keywords, texts, args.repeat)
+    print(f"  batched, warm cache:    {warm:10,.0f} tokens/sec ({warm / legacy:.1f}x)")
+    print(f"  cache: {expand_keyword.cache_info()}")
+
+    before = set(legacy_extract_keywords(JOB_DESCRIPTION))
+    after = set(extract_keywords(JOB_DESCRIPTION))
+    print(f"  keyword overlap on the job description: {len(before & after) / len(before | after):.1%}")
+
+if __name__ == "__main__":
+    main()
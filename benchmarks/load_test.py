@@ -0,0 +1,393 @@
+"""
+End-to-end load test for the Flask backend.
+
+Starts backend/app.py on a local threaded server with the browser and the
+LLM replaced by the stand-ins in stand_ins.py (saved LinkedIn HTML served by
+a fake WebDriver, canned Gemini answers after a tunable delay), then drives
+each endpoint in turn with a fixed number of concurrent clients over HTTP.
+The sample PDFs in python/ are used for uploads.
+
+Every endpoint reports throughput, p50/p95/p99/max latency, error count and
+the peak RSS of the server process (and of its worker processes) once it has
+run. The report is JSON, so a saved run can be passed as --baseline to a
+later one to print the differences.
+
+Databases, the resume index and logs go to a temporary directory; nothing in
+the repository is modified.
+
+Usage:
+    python benchmarks/load_test.py [--concurrency 8] [--requests 40] [--llm-latency 0.5]
+        [--page-latency 0.2] [--endpoints scrape,compare,...] [--output run.json] [--baseline old.json]
+"""
+import os
+import sys
+import glob
+import json
+import math
+import time
+import uuid
+import random
+import logging
+import argparse
+import platform
+import resource
+import tempfile
+import threading
+import subprocess
+import http.client
+from concurrent.futures import ThreadPoolExecutor
+
+benchmarks_path = os.path.dirname(os.path.abspath(__file__))
+repo_path = os.path.dirname(benchmarks_path)
+python_path = os.path.join(repo_path, 'python')
+backend_path = os.path.join(repo_path, 'backend')
+sys.path.append(python_path)
+sys.path.append(backend_path)
+
+import stand_ins
+
+SAMPLE_FILES = [os.path.join(python_path, name) for name in ('Resume1.pdf', 'JP_Om_Thanage_Resume.pdf')]
+
+JOB_DESCRIPTION = """
+Software Engineer, Full Stack. We are looking for an engineer with strong Python
+and JavaScript skills, experience building REST APIs with Flask or Node.js and
+front ends with React. Familiarity with SQL and NoSQL databases, Docker,
+Kubernetes, AWS, CI/CD pipelines and unit testing is expected. Experience with
+machine learning, data structures and algorithms and competitive programming is
+a plus. Strong communication and problem solving skills.
+"""
+
+def encode_multipart(fields, files):
+    """
+    Return (body, content type) for a multipart/form-data request.
+
+    Args:
+        fields (dict): Form field values.
+        files (dict): Field name -> (filename, bytes).
+    """
+    boundary = uuid.uuid4().hex
+    parts = []
+    for name, value in fields.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, (filename, data) in files.items():
+        parts.append(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                     f'Content-Type: application/octet-stream\r\n\r\n'.encode() + data + b'\r\n')
+    parts.append(f'--{boundary}--\r\n'.encode())
+    return b''.join(parts), f'multipart/form-data; boundary={boundary}'
+
+class Scenarios:
+    """
+    The requests each endpoint is driven with. Every builder returns
+    (method, path, body, headers) for the i-th request.
+    """
+
+    def __init__(self, handles, uploads):
+        self.handles = handles
+        self.uploads = uploads
+        self.analysis_id = None
+        self.resume_hash = None
+
+    def _profile_url(self, i):
+        return f"https://www.linkedin.com/in/{self.handles[i % len(self.handles)]}"
+
+    def _upload(self, i, field, fields):
+        filename, data = self.uploads[i % len(self.uploads)]
+        body, content_type = encode_multipart(fields, {field: (filename, data)})
+        return body, {'Content-Type': content_type}
+
+    @staticmethod
+    def _json(payload):
+        return json.dumps(payload).encode(), {'Content-Type': 'application/json'}
+
+    def build(self, name, i):
+        if name == 'health':
+            return 'GET', '/api/health', None, {}
+        if name == 'metrics':
+            return 'GET', '/api/metrics', None, {}
+        if name == 'scrape':
+            return ('POST', '/api/scrape') + self._json({'url': self._profile_url(i)})
+        if name == 'compare':
+            return ('POST', '/api/compare') + self._json({
+                'user_url': self._profile_url(i), 'reference_url': self._profile_url(i + 1),
+                'job_role': 'Software Engineer', 'target_company': 'Google'})
+        if name == 'process-cv':
+            return ('POST', '/api/process-cv') + self._upload(i, 'cv_file', {'mode': 'parse'})
+        if name == 'process-cv-analyze':
+            return ('POST', '/api/process-cv') + self._upload(
+                i, 'cv_file', {'mode': 'analyze', 'job_description': JOB_DESCRIPTION})
+        if name == 'analyze-resume':
+            return ('POST', '/api/analyze-resume') + self._upload(
+                i, 'resume', {'job_description': JOB_DESCRIPTION})
+        if name == 'analyze-resume-hybrid':
+            return ('POST', '/api/analyze-resume') + self._upload(
+                i, 'resume', {'job_description': JOB_DESCRIPTION, 'mode': 'hybrid'})
+        if name == 'ats-score':
+            return ('POST', '/api/ats-score') + self._upload(i, 'resume', {'job_description': JOB_DESCRIPTION})
+        if name == 'resumes-search':
+            return ('POST', '/api/resumes/search') + self._json({'job_description': JOB_DESCRIPTION, 'top_k': 5})
+        if name == 'analyses':
+            return 'GET', '/api/analyses?limit=20', None, {}
+        if name == 'analysis':
+            return 'GET', f'/api/analyses/{self.analysis_id}', None, {'Accept-Encoding': 'gzip'}
+        if name == 'profile':
+            return 'GET', f'/api/profiles/{self.handles[i % len(self.handles)]}', None, {'Accept-Encoding': 'gzip'}
+        raise ValueError(f"Unknown endpoint '{name}'")
+
+ENDPOINTS = ('health', 'metrics', 'scrape', 'compare', 'process-cv', 'process-cv-analyze', 'analyze-resume',
+             'analyze-resume-hybrid', 'ats-score', 'resumes-search', 'analyses', 'analysis', 'profile')
+
+def send(port, method, path, body, headers, timeout):
+    """Send one request. Returns (status, response bytes)."""
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=timeout)
+    try:
+        connection.request(method, path, body=body, headers=headers)
+        response = connection.getresponse()
+        return response.status, response.read()
+    finally:
+        connection.close()
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return None
+    return sorted_values[max(0, min(len(sorted_values) - 1, math.ceil(fraction * len(sorted_values)) - 1))]
+
+def peak_rss_mb():
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def children_peak_rss_mb():
+    """
+    Sum of the peak RSS of the live child processes (ATS and PDF workers),
+    read from /proc. None where /proc is not available.
+    """
+    pids = set()
+    for children in glob.glob(f'/proc/{os.getpid()}/task/*/children'):
+        try:
+            with open(children) as f:
+                pids.update(f.read().split())
+        except OSError:
+            continue
+    if not os.path.isdir('/proc'):
+        return None
+    total_kib = 0
+    for pid in pids:
+        try:
+            with open(f'/proc/{pid}/status') as f:
+                for line in f:
+                    if line.startswith('VmHWM:'):
+                        total_kib += int(line.split()[1])
+        except OSError:
+            continue
+    return round(total_kib / 1024, 1)
+
+def run_endpoint(port, scenarios, name, requests, concurrency, warmup, timeout):
+    """
+    Drive one endpoint with concurrency clients until requests have been sent.
+
+    Returns:
+        dict: Throughput, latency percentiles in milliseconds, status counts and peak RSS.
+    """
+    for i in range(warmup):
+        send(port, *scenarios.build(name, i), timeout)
+
+    latencies = []
+    statuses = {}
+    errors = []
+    lock = threading.Lock()
+    counter = iter(range(requests))
+
+    def client():
+        while True:
+            with lock:
+                i = next(counter, None)
+            if i is None:
+                return
+            request = scenarios.build(name, i)
+            start = time.perf_counter()
+            try:
+                status, _ = send(port, *request, timeout)
+            except Exception as e:
+                status = type(e).__name__
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                statuses[str(status)] = statuses.get(str(status), 0) + 1
+                if not isinstance(status, int) or status >= 400:
+                    errors.append(status)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(client)
+    wall = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "statuses": statuses,
+        "seconds": round(wall, 3),
+        "throughput_rps": round(len(latencies) / wall, 2) if wall else None,
+        "latency_ms": {
+            "mean": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else None,
+            "p50": round(percentile(latencies, 0.50) * 1000, 2) if latencies else None,
+            "p95": round(percentile(latencies, 0.95) * 1000, 2) if latencies else None,
+            "p99": round(percentile(latencies, 0.99) * 1000, 2) if latencies else None,
+            "max": round(latencies[-1] * 1000, 2) if latencies else None
+        },
+        "peak_rss_mb": peak_rss_mb(),
+        "children_peak_rss_mb": children_peak_rss_mb()
+    }
+
+def git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=repo_path, capture_output=True,
+                              text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def start_server(args, work_dir):
+    """
+    Import the backend with its stores in work_dir, install the stand-ins,
+    build the resume index and serve the app on a free port.
+
+    Returns:
+        tuple: (server, port, profile handles).
+    """
+    os.environ.update({
+        'ANALYSIS_DB_PATH': os.path.join(work_dir, 'analyses.db'),
+        'IDEMPOTENCY_DB_PATH': os.path.join(work_dir, 'idempotency.db'),
+        'RESUME_INDEX_PATH': os.path.join(work_dir, 'resume_index.json'),
+        'ADMISSION_LIMITS_PATH': os.path.join(work_dir, 'admission_limits.json'),
+        # Every request is meant to run; identical load requests must not be deduplicated
+        'IDEMPOTENCY_AUTO_KEYS': '0',
+        'LOG_LEVEL': args.log_level,
+        'LOG_PAYLOAD_SAMPLE_RATE': '0'
+    })
+    if args.cold_cache:
+        os.environ['RESUME_CACHE_MAX_BYTES'] = '0'
+    if args.no_admission_control:
+        os.environ['ADMISSION_CONTROL'] = '0'
+    # app.py writes scraper.log to the working directory
+    os.chdir(work_dir)
+
+    import app
+    import CV
+    import gemini_api
+    from werkzeug.serving import make_server
+    from resume_index import ResumeIndex, index_resume_files
+
+    pages = stand_ins.load_profile_pages(args.html_dir)
+    stand_ins.install_fake_driver(app.load_scrapper(), pages, args.page_latency)
+    model = stand_ins.FakeModel(args.llm_latency, args.llm_jitter, args.seed)
+    stand_ins.install_fake_model(model, CV, gemini_api)
+    app.credentials_configured = lambda: True
+    # One access log line per request would dominate the output and the timings
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+
+    index = ResumeIndex()
+    index_resume_files(index, SAMPLE_FILES)
+    index.save(os.environ['RESUME_INDEX_PATH'])
+
+    # Load NLTK, the ATS workers and the scraper before measuring
+    app.warm_up_dependencies()
+
+    server = make_server('127.0.0.1', 0, app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, name="load-test-server", daemon=True).start()
+    return server, server.server_port, sorted(pages)
+
+def print_report(report, baseline=None):
+    """Print a table of the results, with the change from a baseline run if given."""
+    header = f"{'endpoint':<22} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'errors':>7} {'rss MB':>7}"
+    if baseline:
+        header += f" {'Δ req/s':>9} {'Δ p95':>8}"
+    print(header, file=sys.stderr)
+    for name, result in report["endpoints"].items():
+        latency = result["latency_ms"]
+        line = (f"{name:<22} {result['throughput_rps']:>8} {latency['p50']:>9} {latency['p95']:>9} "
+                f"{latency['p99']:>9} {result['errors']:>7} {result['peak_rss_mb']:>7}")
+        previous = (baseline or {}).get("endpoints", {}).get(name)
+        if previous:
+            rps = (result['throughput_rps'] / previous['throughput_rps'] - 1) * 100 if previous['throughput_rps'] else 0
+            p95 = (latency['p95'] / previous['latency_ms']['p95'] - 1) * 100 if previous['latency_ms']['p95'] else 0
+            line += f" {rps:>+8.1f}% {p95:>+7.1f}%"
+        print(line, file=sys.stderr)
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the backend with local browser and LLM stand-ins")
+    parser.add_argument('--endpoints', default=",".join(ENDPOINTS),
+                        help="Comma-separated scenarios to run (default: all): %(default)s")
+    parser.add_argument('--concurrency', type=int, default=8, help="Concurrent clients per endpoint")
+    parser.add_argument('--requests', type=int, default=40, help="Measured requests per endpoint")
+    parser.add_argument('--warmup', type=int, default=2, help="Unmeasured requests per endpoint before measuring")
+    parser.add_argument('--llm-latency', type=float, default=0.5, help="Seconds the fake LLM takes per call")
+    parser.add_argument('--llm-jitter', type=float, default=0.2, help="LLM latency jitter as a fraction of it")
+    parser.add_argument('--page-latency', type=float, default=0.2, help="Seconds the fake browser takes per page load")
+    parser.add_argument('--html-dir', help="Saved LinkedIn pages (<handle>.html); default: render backend/data profiles")
+    parser.add_argument('--cold-cache', action='store_true', help="Disable the resume cache so every upload is extracted")
+    parser.add_argument('--no-admission-control', action='store_true',
+                        help="Run every request instead of answering 429 above the per-endpoint limits")
+    parser.add_argument('--timeout', type=float, default=120, help="Per-request timeout in seconds")
+    parser.add_argument('--log-level', default='WARNING', help="Backend log level during the run")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help="Write the JSON report here instead of stdout")
+    parser.add_argument('--baseline', help="Earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    endpoints = [name.strip() for name in args.endpoints.split(",") if name.strip()]
+    unknown = set(endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"Unknown endpoints: {', '.join(sorted(unknown))}")
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    output = os.path.abspath(args.output) if args.output else None
+
+    random.seed(args.seed)
+    work_dir = tempfile.mkdtemp(prefix="load-test-")
+    server, port, handles = start_server(args, work_dir)
+    uploads = []
+    for path in SAMPLE_FILES:
+        with open(path, 'rb') as f:
+            uploads.append((os.path.basename(path), f.read()))
+    scenarios = Scenarios(handles, uploads)
+
+    # Seed the stored comparison and profiles that the read endpoints serve
+    status, body = send(port, *scenarios.build('compare', 0), args.timeout)
+    if status != 200:
+        sys.exit(f"Seeding a comparison failed with {status}: {body[:200]!r}")
+    scenarios.analysis_id = json.loads(body)['analysis_id']
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "started_at": time.strftime('%Y-%m-%dT%H:%M:%S%z')
+        },
+        "config": {key: value for key, value in vars(args).items() if key not in ('output', 'baseline')},
+        "endpoints": {}
+    }
+    for name in endpoints:
+        print(f"Running {name}...", file=sys.stderr)
+        report["endpoints"][name] = run_endpoint(port, scenarios, name, args.requests, args.concurrency,
+                                                 args.warmup, args.timeout)
+    report["peak_rss_mb"] = peak_rss_mb()
+    report["children_peak_rss_mb"] = children_peak_rss_mb()
+    server.shutdown()
+
+    print_report(report, baseline)
+    text = json.dumps(report, indent=2)
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            f.write(text + "\n")
+        print(f"\nReport written to {output}", file=sys.stderr)
+    else:
+        print(text)
+
+if __name__ == "__main__":
+    main()
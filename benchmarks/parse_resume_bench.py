@@ -0,0 +1,173 @@
+"""
+Throughput and coverage benchmark for CV.parse_resume_text.
+
+Parses a corpus of synthetic resumes (varied heading synonyms and layouts)
+plus the sample PDFs in python/, and reports lines/sec and, for every
+section, the share of resumes where the section came back non-empty.
+The pre-rewrite parser is included as a baseline.
+
+Usage:
+    python benchmarks/parse_resume_bench.py [--synthetic 500] [--repeat 5] [--seed 0]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+
+python_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'python'))
+sys.path.append(python_path)
+
+from CV import SECTION_HEADINGS, extract_text_from_resume, parse_resume_text
+
+SAMPLE_FILES = ['Resume1.pdf', 'JP_Om_Thanage_Resume.pdf']
+SECTIONS = ["summary", "education", "experience", "projects", "skills", "certifications", "achievements"]
+
+def legacy_parse_resume_text(text):
+    """The original four-heading parser, kept as the baseline."""
+    lines = text.split('\n')
+    resume_data = {"personal_info": {}, "education": [], "experience": [], "projects": [], "skills": {}}
+    current_section = None
+    current_item = {}
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line.lower() == "education":
+            current_section = "education"
+            continue
+        elif line.lower() == "experience":
+            current_section = "experience"
+            continue
+        elif line.lower() == "projects":
+            current_section = "projects"
+            continue
+        elif line.lower() == "technical skills":
+            current_section = "skills"
+            continue
+        if current_section is None:
+            if "|" in line:
+                parts = line.split("|")
+                resume_data["personal_info"]["name"] = parts[0].strip()
+            continue
+        if current_section == "education":
+            if "Bachelor" in line or "Master" in line:
+                if current_item:
+                    resume_data["education"].append(current_item)
+                current_item = {"degree": line}
+            elif "–" in line and current_item:
+                current_item["duration"] = line
+            elif current_item and "degree" in current_item and "duration" not in current_item:
+                current_item["institution"] = line
+        elif current_section == "experience":
+            if "•" not in line and "–" in line:
+                if current_item:
+                    resume_data["experience"].append(current_item)
+                parts = line.split("–")
+                current_item = {"title": parts[0].strip(), "duration": parts[1].strip() if len(parts) > 1 else ""}
+            elif "•" in line and current_item:
+                current_item.setdefault("description", []).append(line.replace("•", "").strip())
+        elif current_section == "projects":
+            if "|" in line and "•" not in line:
+                if current_item:
+                    resume_data["projects"].append(current_item)
+                parts = line.split("|")
+                current_item = {"name": parts[0].strip(), "technologies": [t.strip() for t in parts[1:-1]]}
+            elif "•" in line and current_item:
+                current_item.setdefault("description", []).append(line.replace("•", "").strip())
+        elif current_section == "skills":
+            if ":" in line:
+                category, skills = line.split(":", 1)
+                resume_data["skills"][category.strip()] = [s.strip() for s in skills.split(",")]
+    if current_section == "education" and current_item:
+        resume_data["education"].append(current_item)
+    elif current_section == "experience" and current_item:
+        resume_data["experience"].append(current_item)
+    elif current_section == "projects" and current_item:
+        resume_data["projects"].append(current_item)
+    return resume_data
+
+def _heading(rng, section):
+    heading = rng.choice(SECTION_HEADINGS[section])
+    return rng.choice([heading.title(), heading.upper(), heading.title() + ":"])
+
+def synthetic_resume(rng):
+    """Build one synthetic resume and return (text, sections it contains)."""
+    bullet = rng.choice(["•", "-", "●"])
+    dash = rng.choice(["–", "-"])
+    lines = [f"Candidate {rng.randint(1, 9999)}", f"cand@example.com | +1 555 {rng.randint(100, 999)} 0100"]
+    sections = rng.sample(SECTIONS, rng.randint(3, len(SECTIONS)))
+    for section in sections:
+        lines.append(_heading(rng, section))
+        if section == "summary":
+            lines.append("Engineer with experience building distributed systems and data pipelines.")
+        elif section == "education":
+            lines.append("State University, Springfield")
+            lines.append(f"Bachelor of Science in Computer Science Aug 2016 {dash} May 2020")
+        elif section == "experience":
+            for i in range(rng.randint(1, 4)):
+                lines.append(f"Software Engineer {i} Jan 20{10 + i} {dash} Dec 20{11 + i}")
+                lines.append("Example Corp, Remote")
+                lines.extend(f"{bullet} Shipped feature {j} in Python and Go" for j in range(rng.randint(1, 4)))
+        elif section == "projects":
+            for i in range(rng.randint(1, 3)):
+                lines.append(f"Project {i} | Python, Flask, React | GitHub")
+                lines.append(f"{bullet} Built and deployed project {i}")
+        elif section == "skills":
+            lines.append("Languages: Python, Go, JavaScript")
+            lines.append("Tools: Docker, Kubernetes, Git")
+        elif section in ("certifications", "achievements"):
+            lines.extend(f"{bullet} Item {j} 2021" for j in range(rng.randint(1, 3)))
+    return "\n".join(lines) + "\n", set(sections)
+
+def load_samples():
+    samples = []
+    for name in SAMPLE_FILES:
+        text = extract_text_from_resume(os.path.join(python_path, name))
+        if not text.startswith("Error"):
+            samples.append((name, text))
+    return samples
+
+def run(parser, corpus, repeat):
+    lines = sum(text.count("\n") + 1 for text in corpus) * repeat
+    start = time.perf_counter()
+    for _ in range(repeat):
+        results = [parser(text) for text in corpus]
+    elapsed = time.perf_counter() - start
+    return results, lines / elapsed
+
+def coverage(results, expected=None):
+    report = {}
+    for section in SECTIONS:
+        relevant = [i for i in range(len(results)) if expected is None or section in expected[i]]
+        if not relevant:
+            continue
+        found = sum(1 for i in relevant if results[i].get(section))
+        report[section] = found / len(relevant)
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parse_resume_text throughput and section coverage")
+    parser.add_argument('--synthetic', type=int, default=500, help="Number of synthetic resumes")
+    parser.add_argument('--repeat', type=int, default=5, help="Passes over the corpus")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    synthetic = [synthetic_resume(rng) for _ in range(args.synthetic)]
+    texts = [text for text, _ in synthetic]
+    expected = [sections for _, sections in synthetic]
+    samples = load_samples()
+
+    for label, fn in (("legacy", legacy_parse_resume_text), ("current", parse_resume_text)):
+        results, lines_per_sec = run(fn, texts, args.repeat)
+        print(f"\n[{label}] synthetic corpus: {lines_per_sec:,.0f} lines/sec")
+        for section, share in coverage(results, expected).items():
+            print(f"  {section:<15} {share:6.1%}")
+        for name, text in samples:
+            (result,), lines_per_sec = run(fn, [text], args.repeat)
+            found = [section for section in SECTIONS if result.get(section)]
+            print(f"  {name}: {lines_per_sec:,.0f} lines/sec, sections found: {', '.join(found) or 'none'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""
+Memory and serialization benchmark for the profile model in backend/models.py.
+
+Builds a corpus from the profiles saved in backend/data (on their own and
+inside the saved comparisons), copied up to --profiles entries with varied
+URLs and names, and compares the scraper's plain dicts with the slotted
+Profile objects on:
+
+- retained memory per profile (tracemalloc) once decoded from storage
+- encode speed and size: json.dump(indent=4) as the old files were
+  written, json.dumps as the store wrote rows, json.dumps(indent=2) as
+  prompts were built, and models.dumps with orjson and with the json
+  fallback
+- decode speed: json.loads to dicts against models.loads, with and without
+  normalizing into Profile objects as the store reads its rows
+
+Usage:
+    python benchmarks/profile_model_bench.py [--profiles 2000] [--repeat 5]
+"""
+import os
+import sys
+import copy
+import glob
+import json
+import time
+import argparse
+import tracemalloc
+
+backend_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend'))
+sys.path.append(backend_path)
+
+import models
+from models import Profile
+
+DATA_DIR = os.path.join(backend_path, 'data')
+
+def load_corpus(count):
+    """Return count scraped profile dicts built from the saved ones."""
+    saved = []
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, '*.json'))):
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if 'user_profile' in data:
+            saved.extend([data['user_profile'], data['reference_profile']])
+        elif data.get('url'):
+            saved.append(data)
+    if not saved:
+        sys.exit(f"No saved profiles found in {DATA_DIR}")
+    corpus = []
+    for i in range(count):
+        profile = copy.deepcopy(saved[i % len(saved)])
+        profile['url'] = f"{profile.get('url', 'https://www.linkedin.com/in/profile')}-{i}"
+        profile['name'] = f"{profile.get('name', '')} {i}"
+        corpus.append(profile)
+    return corpus
+
+def best_seconds(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def retained_bytes(build):
+    """Bytes still allocated after build() returns, while its result is kept alive."""
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    result = build()
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    del result
+    return size
+
+def with_json_fallback(fn):
+    # Run models.dumps/loads as they behave without orjson installed
+    def run():
+        saved, models.orjson = models.orjson, None
+        try:
+            return fn()
+        finally:
+            models.orjson = saved
+    return run
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the profile model against plain profile dicts")
+    parser.add_argument('--profiles', type=int, default=2000, help="Profiles in the corpus")
+    parser.add_argument('--repeat', type=int, default=5, help="Runs per measurement; the best is reported")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.profiles)
+    profiles = [Profile.from_dict(profile) for profile in corpus]
+    stored_json = [json.dumps(profile, ensure_ascii=False) for profile in corpus]
+    stored_model = [models.dumps(profile) for profile in profiles]
+    count = len(corpus)
+    print(f"Corpus: {count} profiles, orjson {'installed' if models.orjson else 'not installed'}")
+
+    dict_memory = retained_bytes(lambda: [json.loads(text) for text in stored_json])
+    model_memory = retained_bytes(lambda: [Profile.from_dict(models.loads(data)) for data in stored_model])
+    print(f"\nRetained memory per decoded profile")
+    print(f"  {'dicts (json.loads)':<40} {dict_memory / count:>10,.0f} bytes")
+    print(f"  {'Profile objects':<40} {model_memory / count:>10,.0f} bytes "
+          f"({(1 - model_memory / dict_memory) * 100:.0f}% less)")
+
+    encoders = [
+        ("json.dumps(indent=4)  [old data files]", lambda: [json.dumps(p, indent=4) for p in corpus], corpus),
+        ("json.dumps            [old store rows]", lambda: [json.dumps(p, ensure_ascii=False) for p in corpus], corpus),
+        ("json.dumps(indent=2)  [old prompts]", lambda: [json.dumps(p, indent=2) for p in corpus], corpus),
+        ("models.dumps(Profile)", lambda: [models.dumps(p) for p in profiles], profiles),
+        ("models.dumps(Profile, indent=True)", lambda: [models.dumps(p, indent=True) for p in profiles], profiles),
+        ("models.dumps(Profile)  [json fallback]", with_json_fallback(lambda: [models.dumps(p) for p in profiles]),
+         profiles),
+    ]
+    print(f"\nEncode {'':<36} {'profiles/s':>12} {'µs/profile':>11} {'bytes/profile':>14}")
+    for label, fn, _ in encoders:
+        seconds = best_seconds(fn, args.repeat)
+        output = fn()
+        size = sum(len(item.encode('utf-8') if isinstance(item, str) else item) for item in output) / count
+        print(f"  {label:<40} {count / seconds:>12,.0f} {seconds / count * 1e6:>11.1f} {size:>14,.0f}")
+
+    decoders = [
+        ("json.loads -> dict", lambda: [json.loads(text) for text in stored_json]),
+        ("models.loads -> dict", lambda: [models.loads(data) for data in stored_model]),
+        ("models.loads -> Profile", lambda: [Profile.from_dict(models.loads(data)) for data in stored_model]),
+        ("models.loads -> Profile  [json fallback]",
+         with_json_fallback(lambda: [Profile.from_dict(models.loads(data)) for data in stored_model])),
+        ("Profile.from_dict (normalize only)", lambda: [Profile.from_dict(p) for p in corpus]),
+    ]
+    print(f"\nDecode {'':<36} {'profiles/s':>12} {'µs/profile':>11}")
+    for label, fn in decoders:
+        seconds = best_seconds(fn, args.repeat)
+        print(f"  {label:<40} {count / seconds:>12,.0f} {seconds / count * 1e6:>11.1f}")
+
+if __name__ == "__main__":
+    main()
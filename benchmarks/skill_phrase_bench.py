@@ -0,0 +1,86 @@
+"""
+Scan throughput benchmark for skill_phrases.PhraseAutomaton.
+
+Compiles dictionaries of increasing size (the built-in skill phrases plus
+synthetic multi-word phrases) and scans the sample resumes with each, reporting
+build time and characters/sec. A per-phrase regex scan is included as the
+baseline for the smaller dictionaries; its cost grows with the dictionary
+while the automaton's stays flat.
+
+Usage:
+    python benchmarks/skill_phrase_bench.py [--sizes 100,1000,10000,50000] [--repeat 5]
+"""
+import os
+import re
+import sys
+import time
+import random
+import argparse
+
+python_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'python'))
+sys.path.append(python_path)
+
+from CV import extract_text_from_resume
+from skill_phrases import PhraseAutomaton, load_skill_phrases, normalize_text
+
+SAMPLE_FILES = ['Resume1.pdf', 'JP_Om_Thanage_Resume.pdf']
+# Above this size the regex baseline takes too long to be worth running
+REGEX_MAX_SIZE = 1000
+
+def build_dictionary(size, rng):
+    """The built-in phrases topped up with synthetic two- and three-word phrases."""
+    phrases = load_skill_phrases()
+    words = ["data", "cloud", "web", "system", "platform", "service", "network", "model",
+             "stream", "graph", "query", "mobile", "secure", "test", "build", "deploy"]
+    while len(phrases) < size:
+        phrase = " ".join(rng.choice(words) + str(rng.randint(0, 999)) for _ in range(rng.randint(2, 3)))
+        phrases[phrase] = phrase
+    return dict(list(phrases.items())[:size])
+
+def regex_scan(patterns, text):
+    matches = {}
+    for phrase, pattern in patterns:
+        count = len(pattern.findall(text))
+        if count:
+            matches[phrase] = count
+    return matches
+
+def measure(fn, text, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(text)
+    return len(text) * repeat / (time.perf_counter() - start), result
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark skill phrase scan throughput against dictionary size")
+    parser.add_argument('--sizes', default="100,1000,10000,50000", help="Comma-separated dictionary sizes")
+    parser.add_argument('--repeat', type=int, default=5, help="Scans of the corpus per measurement")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    texts = []
+    for name in SAMPLE_FILES:
+        text = extract_text_from_resume(os.path.join(python_path, name))
+        if not text.startswith("Error"):
+            texts.append(text)
+    text = normalize_text("\n".join(texts))
+    print(f"Corpus: {len(text):,} characters")
+
+    rng = random.Random(args.seed)
+    for size in (int(size) for size in args.sizes.split(",")):
+        phrases = build_dictionary(size, rng)
+        start = time.perf_counter()
+        automaton = PhraseAutomaton(phrases)
+        build = time.perf_counter() - start
+        rate, matches = measure(automaton.scan, text, args.repeat)
+        line = (f"  {len(phrases):>6} phrases: build {build:6.2f}s, "
+                f"automaton {rate:12,.0f} chars/sec ({sum(matches.values())} matches)")
+        if size <= REGEX_MAX_SIZE:
+            patterns = [(phrase, re.compile(r"(?<![a-z0-9])" + re.escape(phrase) + r"(?![a-z0-9])"))
+                        for phrase in phrases]
+            regex_rate, _ = measure(lambda t: regex_scan(patterns, t), text, args.repeat)
+            line += f", per-phrase regex {regex_rate:12,.0f} chars/sec"
+        print(line)
+
+if __name__ == "__main__":
+    main()
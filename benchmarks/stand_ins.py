@@ -0,0 +1,249 @@
+"""
+Local stand-ins for the browser and the LLM, used by load_test.py to run the
+backend without LinkedIn, Selenium or Gemini.
+
+FakeDriver replaces the Selenium WebDriver in Scrapper/scrapper.py and serves
+saved LinkedIn HTML, so the real parsing code runs against realistic markup.
+Pages are read from an HTML directory (<handle>.html and optionally
+<handle>-skills.html) or rendered from the profile JSON files the backend
+saved in backend/data. FakeModel replaces the Gemini model with canned JSON
+answers after a tunable delay.
+"""
+import os
+import json
+import time
+import glob
+import random
+import asyncio
+from html import escape
+from types import SimpleNamespace
+
+BACKEND_DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend', 'data'))
+
+# Class names the scraper looks for in LinkedIn's markup
+LIST_ITEM_CLASS = ("SAkrVBDOIoCCpFSAphUCaGSghqKHILGbog EGpbfwOeMHDFbYayVbnwKsTymikUDs "
+                   "xqdSBdUtBiEYznzTgSfUuCzMYgMdRJzBnbjfjgM")
+DESIGNATION_CLASS = "gFJNglFOnyZmIAbxVkrWpQCmMhGSasZRfRtGlFg"
+CARD_CLASS = "artdeco-card pv-profile-card break-words mt2"
+
+def _hidden(text):
+    return f'<span class="visually-hidden">{escape(str(text))}</span>'
+
+def render_profile_html(profile):
+    """
+    Return (profile page, skills page) HTML for a saved profile dict, laid
+    out the way scrape_linkedin_profile expects LinkedIn's pages.
+    """
+    experience = "".join(
+        f'<div class="{LIST_ITEM_CLASS}">'
+        f'<div class="display-flex flex-wrap align-items-center full-height">{_hidden(item.get("company_name", ""))}</div>'
+        f'<span class="t-14 t-normal">{_hidden(item.get("duration", ""))}</span>'
+        + "".join(f'<div class="{DESIGNATION_CLASS}">' + "".join(_hidden(value) for value in designation.values()) + '</div>'
+                  for designation in item.get("designations", []))
+        + '</div>'
+        for item in profile.get("experience", [])
+    )
+    education = "".join(
+        f'<div class="{LIST_ITEM_CLASS}">' + "".join(_hidden(value) for value in item.values()) + '</div>'
+        for item in profile.get("education", [])
+    )
+    skills = profile.get("skills", [])
+    page = f"""<html><head><title>{escape(profile.get('name', ''))} | LinkedIn</title></head><body><main>
+<section><h1 class="text-heading-xlarge inline t-24 v-align-middle break-words">{escape(profile.get('name', ''))}</h1>
+<div class="text-body-medium break-words">{escape(profile.get('headline', ''))}</div></section>
+<section class="artdeco-card"><h2>About</h2><div class="inline-show-more-text">{escape(profile.get('about', ''))}</div></section>
+<section class="{CARD_CLASS}"><div id="experience"></div>{experience}</section>
+<section class="{CARD_CLASS}"><div id="education"></div>{education}</section>
+<section class="{CARD_CLASS}"><div id="skills"></div>
+<span class="pvs-navigation__text">Show all {len(skills)} skills</span></section>
+</main></body></html>"""
+    skills_page = (f'<html><body><main><section class="artdeco-card pb3">'
+                   + "".join(f'<div class="{LIST_ITEM_CLASS}">{_hidden(skill.get("skill_name", ""))}</div>' for skill in skills)
+                   + '</section></main></body></html>')
+    return page, skills_page
+
+def load_profile_pages(html_dir=None, data_dir=BACKEND_DATA_DIR):
+    """
+    Return {handle: (profile page, skills page)} from saved HTML in html_dir,
+    or rendered from the saved profile JSON files in data_dir.
+    """
+    pages = {}
+    if html_dir:
+        for path in sorted(glob.glob(os.path.join(html_dir, '*.html'))):
+            handle = os.path.basename(path)[:-len('.html')]
+            if handle.endswith('-skills'):
+                continue
+            with open(path, 'r', encoding='utf-8') as f:
+                page = f.read()
+            skills_path = os.path.join(html_dir, f"{handle}-skills.html")
+            skills_page = page
+            if os.path.exists(skills_path):
+                with open(skills_path, 'r', encoding='utf-8') as f:
+                    skills_page = f.read()
+            pages[handle.lower()] = (page, skills_page)
+    else:
+        for path in sorted(glob.glob(os.path.join(data_dir, '*.json'))):
+            with open(path, 'r', encoding='utf-8') as f:
+                profile = json.load(f)
+            if isinstance(profile, dict) and profile.get('url') and 'user_profile' not in profile:
+                pages[os.path.basename(path)[:-len('.json')].lower()] = render_profile_html(profile)
+    if not pages:
+        raise ValueError(f"No saved profile pages found in {html_dir or data_dir}")
+    return pages
+
+class FakeElement:
+    def __init__(self, driver, element_id):
+        self._driver = driver
+        self._id = element_id
+
+    def click(self):
+        if self._id.startswith('navigation-index-Show-all-'):
+            self._driver._show_skills()
+
+    def is_displayed(self):
+        return False
+
+class FakeDriver:
+    """
+    Stand-in for a Selenium WebDriver that is already logged in to LinkedIn
+    and serves saved profile pages, sleeping page_latency per navigation.
+    Unknown profile handles are served one of the saved profiles.
+    """
+
+    def __init__(self, pages, page_latency=0.0):
+        self._pages = pages
+        self._handles = sorted(pages)
+        self._page_latency = page_latency
+        self._handle = None
+        self._skills = False
+        self.title = ""
+
+    def _wait(self):
+        if self._page_latency:
+            time.sleep(self._page_latency)
+
+    def get(self, url):
+        self._wait()
+        if '/login' in url:
+            self.title = "Feed | LinkedIn"
+            return
+        handle = url.rstrip('/').split('/')[-1].lower()
+        if handle not in self._pages:
+            handle = self._handles[hash(handle) % len(self._handles)]
+        self._handle = handle
+        self._skills = False
+        self.title = "LinkedIn"
+
+    def _show_skills(self):
+        self._wait()
+        self._skills = True
+
+    @property
+    def page_source(self):
+        if self._handle is None:
+            return "<html></html>"
+        page, skills_page = self._pages[self._handle]
+        return skills_page if self._skills else page
+
+    def find_element(self, by, value):
+        return FakeElement(self, value)
+
+    def find_elements(self, by, value):
+        return []
+
+    def execute_script(self, script, *args):
+        return None
+
+    def save_screenshot(self, path):
+        return True
+
+    def quit(self):
+        pass
+
+def install_fake_driver(scrapper, pages, page_latency=0.0):
+    """
+    Make scrapper.scrape_linkedin_profile use FakeDriver instead of a real browser.
+    """
+    scrapper.webdriver = SimpleNamespace(
+        Chrome=lambda options=None: FakeDriver(pages, page_latency),
+        Edge=lambda options=None: FakeDriver(pages, page_latency),
+        Firefox=lambda options=None: FakeDriver(pages, page_latency)
+    )
+    # The scraper sleeps for page loads and the login; FakeDriver models those delays
+    scrapper.sleep = lambda seconds: None
+    os.environ.setdefault('EMAIL', 'load-test@example.com')
+    os.environ.setdefault('PASSWORD', 'load-test')
+
+RESUME_ANALYSIS = {
+    "resume_analysis": {
+        "quick_overview": {"job_title_match": "Strong", "industry_fit": "Good", "experience_level_match": "Entry level"},
+        "score_breakdown": {"overall_ATS_score": "72", "skills_match": "75", "experience_match": "60",
+                            "education_match": "90"},
+        "critical_gaps": {
+            f"gap_{i}": {"description": "Missing cloud deployment experience",
+                         "suggestions": "Add a project deployed on AWS with CI/CD"}
+            for i in range(1, 4)
+        },
+        "keyword_analysis": {"present_keywords": ["python", "react", "sql"],
+                             "missing_keywords": ["kubernetes", "aws"],
+                             "suggested_keywords": ["docker", "ci/cd", "microservices"]},
+        "improvement_plan": {"immediate_changes": ["Quantify project impact"],
+                             "short_term_improvements": ["Earn a cloud certification"],
+                             "long_term_development": ["Lead a production service"]},
+        "success_metrics": {"current_application_success_rate": "20%",
+                            "expected_success_after_improvements": "45%",
+                            "time_to_implement_all_changes": "3 months"},
+        "customized_suggestions": ["Lead with the hackathon results", "Move skills above education"]
+    }
+}
+
+def _profiles_analysis(data_dir=BACKEND_DATA_DIR):
+    # A real comparison the backend saved, so response sizes are realistic
+    for path in sorted(glob.glob(os.path.join(data_dir, 'analysis_*.json')), reverse=True):
+        with open(path, 'r', encoding='utf-8') as f:
+            analysis = json.load(f).get('analysis', {})
+        if 'error' not in analysis:
+            return analysis
+    return {"skills_comparison": {"matching_skills": [], "missing_skills": [], "skill_gap_percentage": 50}}
+
+class FakeModel:
+    """
+    Stand-in for the Gemini GenerativeModel that answers after latency
+    seconds (plus or minus jitter, as a fraction of it) with canned JSON: a
+    profile comparison for comparison prompts and a resume analysis (which
+    also carries the narrative-only sections) for everything else.
+    """
+
+    def __init__(self, latency=1.0, jitter=0.2, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self._rng = random.Random(seed)
+        narrative = dict(RESUME_ANALYSIS["resume_analysis"])
+        self._resume_text = json.dumps(dict(RESUME_ANALYSIS, **narrative))
+        self._profiles_text = json.dumps(_profiles_analysis())
+        self.calls = 0
+
+    def _delay(self):
+        return max(0.0, self.latency * (1 + self._rng.uniform(-self.jitter, self.jitter)))
+
+    def _response(self, prompt):
+        self.calls += 1
+        text = self._profiles_text if "LinkedIn profiles" in prompt else self._resume_text
+        return SimpleNamespace(text=text)
+
+    def generate_content(self, prompt):
+        time.sleep(self._delay())
+        return self._response(prompt)
+
+    async def generate_content_async(self, prompt):
+        await asyncio.sleep(self._delay())
+        return self._response(prompt)
+
+def install_fake_model(model, *modules):
+    """
+    Make CV and gemini_api (and any other module with get_model()) use model.
+    """
+    for module in modules:
+        module.get_model = lambda: model
+        if hasattr(module, 'GEMINI_API_KEY'):
+            module.GEMINI_API_KEY = module.GEMINI_API_KEY or 'load-test'
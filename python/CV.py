@@ -1,169 +1,678 @@
+import io
+import asyncio
+import contextvars
 import os
+import re
 import json
-import PyPDF2 as pdf
+import time
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
 from dotenv import load_dotenv
-import google.generativeai as genai
-from docx import Document
+from resume_cache import ResumeCache, hash_bytes, hash_file, hash_stream
+from log_config import log_payload
+from metrics import time_stage, timed_stage
+
+logger = logging.getLogger(__name__)
 
 # Load the environment variables
 load_dotenv()
 
-# Configure Google API
-try:
-    api_key = os.getenv("GOOGLE_API_KEY")
-    if not api_key:
-        raise ValueError("GOOGLE_API_KEY not found in environment variables")
-    genai.configure(api_key=api_key)
-    model = genai.GenerativeModel('gemini-2.0-flash')
-except Exception as e:
-    print(f"Error configuring Google API: {str(e)}")
-    print("Please make sure you have set up your GOOGLE_API_KEY in the .env file")
-    exit(1)
-
-def extract_text_from_pdf(pdf_path):
+# The PDF/DOCX libraries and the Gemini client are loaded on first use (or by
+# warm_up()), so importing this module is cheap and a missing API key only
+# affects the features that need it
+_model = None
+_model_lock = threading.Lock()
+
+def get_model():
+    """
+    Return the Gemini model, configuring the Google API on first use.
+
+    Raises:
+        ValueError: If GOOGLE_API_KEY is not set.
+    """
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                api_key = os.getenv("GOOGLE_API_KEY")
+                if not api_key:
+                    raise ValueError("GOOGLE_API_KEY not found in environment variables. Please set it in the .env file")
+                import google.generativeai as genai
+                genai.configure(api_key=api_key)
+                _model = genai.GenerativeModel('gemini-2.0-flash')
+    return _model
+
+def _pdf_reader(source):
+    import PyPDF2 as pdf
+    return pdf.PdfReader(_as_stream(source))
+
+def warm_up():
+    """
+    Load the document libraries and the Gemini client ahead of the first request.
+
+    Returns:
+        dict: Seconds spent on each step, or the error message for steps that failed.
+    """
+    timings = {}
+    steps = (
+        ("PyPDF2", lambda: __import__("PyPDF2")),
+        ("docx", lambda: __import__("docx")),
+        ("gemini", get_model)
+    )
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            step()
+            timings[name] = round(time.perf_counter() - start, 4)
+        except Exception as e:
+            logger.warning(f"Warm-up of {name} failed: {e}")
+            timings[name] = f"error: {e}"
+    return timings
+
+# Limits that keep a single PDF upload from tying up a worker
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "50"))
+PDF_MAX_BYTES = int(os.getenv("PDF_MAX_BYTES", str(10 * 1024 * 1024)))
+PDF_TIME_BUDGET = float(os.getenv("PDF_TIME_BUDGET", "20"))
+# Documents with at least this many pages are extracted in parallel
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "16"))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+_pdf_pool = None
+_pdf_pool_lock = threading.Lock()
+
+# Bump when parse_resume_text output changes so cached resume_data is refreshed
+PARSER_VERSION = 2
+
+resume_cache = ResumeCache(
+    max_bytes=int(os.getenv("RESUME_CACHE_MAX_BYTES", str(64 * 1024 * 1024))),
+    disk_dir=os.getenv("RESUME_CACHE_DIR") or None,
+    max_disk_bytes=int(os.getenv("RESUME_CACHE_MAX_DISK_BYTES", str(512 * 1024 * 1024))),
+    version=PARSER_VERSION
+)
+
+class ExtractionLimitError(ValueError):
+    """Raised when a document exceeds the configured size, page or time limits."""
+
+def _get_pdf_pool():
+    global _pdf_pool
+    if _pdf_pool is None:
+        with _pdf_pool_lock:
+            if _pdf_pool is None:
+                _pdf_pool = ProcessPoolExecutor(max_workers=PDF_WORKERS)
+    return _pdf_pool
+
+def _discard_pdf_pool(pool):
+    """
+    Kill the worker processes of a pool and let the next caller start a new
+    one. cancel() cannot stop a page range that is already being parsed, so
+    this is the only way to stop the work on a document past its budget.
+    """
+    global _pdf_pool
+    with _pdf_pool_lock:
+        if _pdf_pool is pool:
+            _pdf_pool = None
+    terminate_workers = getattr(pool, 'terminate_workers', None)
+    if terminate_workers is not None:
+        # Python 3.14+
+        terminate_workers()
+        return
+    for process in list((pool._processes or {}).values()):
+        process.terminate()
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def _source_size(source):
+    """
+    Return the size in bytes of a path, bytes object or seekable file-like object.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return len(source)
+    if isinstance(source, (str, os.PathLike)):
+        return os.path.getsize(source)
+    position = source.tell()
+    source.seek(0, os.SEEK_END)
+    size = source.tell()
+    source.seek(position)
+    return size
+
+def _as_stream(source):
+    """
+    Wrap bytes in a stream; paths and file-like objects are returned unchanged.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        return io.BytesIO(source)
+    if not isinstance(source, (str, os.PathLike)):
+        source.seek(0)
+    return source
+
+def _extract_pdf_page_range(source, start, stop):
+    """
+    Extract the text of pages [start, stop) of a PDF given as a path or bytes.
+    Runs in a worker process.
+    """
+    reader = _pdf_reader(source)
+    return [(reader.pages[i].extract_text() or "") for i in range(start, stop)]
+
+def _iter_pdf_pages(reader, source, page_count, deadline, time_budget, workers):
+    if workers > 1 and page_count >= PDF_PARALLEL_MIN_PAGES:
+        # Worker processes need something picklable: a path or the raw bytes
+        if not isinstance(source, (str, os.PathLike, bytes)):
+            source.seek(0)
+            source = source.read()
+        # One contiguous range per worker, as each one parses the whole document before extracting
+        per_worker = -(-page_count // workers)
+        pending = [(start, min(start + per_worker, page_count)) for start in range(0, page_count, per_worker)]
+        retried = False
+        while pending:
+            pool = _get_pdf_pool()
+            try:
+                futures = [pool.submit(_extract_pdf_page_range, source, start, stop) for start, stop in pending]
+            except (BrokenProcessPool, RuntimeError):
+                # The pool broke, or was shut down by another document's timeout, before this one started
+                if retried:
+                    raise
+                retried = True
+                _discard_pdf_pool(pool)
+                continue
+            try:
+                for i, future in enumerate(futures):
+                    try:
+                        pages = future.result(timeout=max(0, deadline - time.monotonic()))
+                    except FuturesTimeout:
+                        _discard_pdf_pool(pool)
+                        raise ExtractionLimitError(f"PDF extraction exceeded the {time_budget:g}s time budget")
+                    except BrokenProcessPool:
+                        # Another document's timeout (or a crash) killed the workers:
+                        # run the remaining ranges once more on a new pool
+                        if retried:
+                            raise
+                        retried = True
+                        _discard_pdf_pool(pool)
+                        pending = pending[i:]
+                        break
+                    yield from pages
+                else:
+                    pending = []
+            finally:
+                for future in futures:
+                    future.cancel()
+        return
+
+    for i in range(page_count):
+        if time.monotonic() > deadline:
+            raise ExtractionLimitError(f"PDF extraction exceeded the {time_budget:g}s time budget")
+        yield reader.pages[i].extract_text() or ""
+
+def iter_pdf_pages(source, max_pages=None, time_budget=None, workers=None):
+    """
+    Yield the text of each page of a PDF, in order.
+
+    Args:
+        source (str | bytes | file-like): Path to the PDF file, its contents,
+            or a seekable binary stream.
+        max_pages (int): Stop after this many pages. Defaults to PDF_MAX_PAGES.
+        time_budget (float): Wall-clock budget in seconds. Defaults to PDF_TIME_BUDGET.
+        workers (int): Worker processes for large documents. Defaults to PDF_WORKERS;
+            1 disables parallel extraction.
+
+    Raises:
+        ExtractionLimitError: If the time budget runs out.
+    """
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    time_budget = PDF_TIME_BUDGET if time_budget is None else time_budget
+    workers = PDF_WORKERS if workers is None else workers
+
+    reader = _pdf_reader(source)
+    page_count = min(len(reader.pages), max_pages)
+    deadline = time.monotonic() + time_budget
+    yield from _iter_pdf_pages(reader, source, page_count, deadline, time_budget, workers)
+
+def extract_pdf_text_with_stats(source, max_pages=None, max_bytes=None, time_budget=None, workers=None):
+    """
+    Extract the text of a PDF within the configured limits.
+
+    Args:
+        source (str | bytes | file-like): Path to the PDF file, its contents,
+            or a seekable binary stream.
+
+    Returns:
+        tuple: (text, stats) where stats holds pages, bytes, seconds,
+        pages_per_sec, bytes_per_sec and whether the page limit truncated the text.
+
+    Raises:
+        ExtractionLimitError: If the file is too large or the time budget runs out.
+    """
+    max_pages = PDF_MAX_PAGES if max_pages is None else max_pages
+    max_bytes = PDF_MAX_BYTES if max_bytes is None else max_bytes
+    time_budget = PDF_TIME_BUDGET if time_budget is None else time_budget
+    workers = PDF_WORKERS if workers is None else workers
+
+    size = _source_size(source)
+    if size > max_bytes:
+        raise ExtractionLimitError(f"PDF is {size} bytes, the limit is {max_bytes} bytes")
+
+    start_time = time.monotonic()
+    reader = _pdf_reader(source)
+    total_pages = len(reader.pages)
+    page_count = min(total_pages, max_pages)
+    pages = list(_iter_pdf_pages(reader, source, page_count, start_time + time_budget, time_budget, workers))
+    text = "\n".join(pages) + "\n" if pages else ""
+    elapsed = time.monotonic() - start_time
+
+    stats = {
+        "pages": len(pages),
+        "bytes": size,
+        "seconds": elapsed,
+        "pages_per_sec": len(pages) / elapsed if elapsed > 0 else 0.0,
+        "bytes_per_sec": size / elapsed if elapsed > 0 else 0.0,
+        "truncated": total_pages > max_pages
+    }
+    return text, stats
+
+def extract_text_from_pdf(source):
     try:
-        reader = pdf.PdfReader(pdf_path)
-        text = ""
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
+        text, stats = extract_pdf_text_with_stats(source)
+        logger.info(
+            f"Extracted {stats['pages']} PDF pages in {stats['seconds']:.3f}s "
+            f"({stats['pages_per_sec']:.1f} pages/s, {stats['bytes_per_sec'] / 1024:.1f} KiB/s)"
+            + (" - truncated at page limit" if stats["truncated"] else "")
+        )
         return text
     except Exception as e:
         return f"Error extracting text from PDF: {str(e)}"
 
-def extract_text_from_docx(docx_path):
+def extract_text_from_docx(source):
     try:
-        doc = Document(docx_path)
-        text = ""
-        for paragraph in doc.paragraphs:
-            text += paragraph.text + "\n"
-        return text
+        from docx import Document
+        doc = Document(_as_stream(source))
+        return "".join(paragraph.text + "\n" for paragraph in doc.paragraphs)
     except Exception as e:
         return f"Error extracting text from Word document: {str(e)}"
 
-def extract_text_from_resume(file_path):
-    file_extension = os.path.splitext(file_path)[1].lower()
+def extract_text_from_txt(source):
+    try:
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, 'rb') as f:
+                data = f.read()
+        elif isinstance(source, (bytes, bytearray)):
+            data = source
+        else:
+            data = _as_stream(source).read()
+        return data.decode('utf-8', errors='replace')
+    except Exception as e:
+        return f"Error extracting text from text file: {str(e)}"
+
+def extract_text_from_resume(source, filename=None):
+    """
+    Extract the text of a PDF, DOCX or plain text resume.
+
+    Args:
+        source (str | bytes | file-like): Path to the resume file, its contents,
+            or a seekable binary stream.
+        filename (str): Name used to pick the format. Defaults to the path
+            itself; required when source is not a path.
+    """
+    file_extension = os.path.splitext(filename or source)[1].lower()
     
     if file_extension == '.pdf':
-        return extract_text_from_pdf(file_path)
+        return extract_text_from_pdf(source)
     elif file_extension == '.docx':
-        return extract_text_from_docx(file_path)
+        return extract_text_from_docx(source)
+    elif file_extension == '.txt':
+        return extract_text_from_txt(source)
     else:
         return f"Unsupported file format: {file_extension}"
 
-def parse_resume_text(text):
-    lines = text.split('\n')
-    resume_data = {
-        "personal_info": {},
-        "education": [],
-        "experience": [],
-        "projects": [],
-        "skills": {}
-    }
-    
-    current_section = None
-    current_item = {}
-    
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-            
-        if line.lower() == "education":
-            current_section = "education"
-            continue
-        elif line.lower() == "experience":
-            current_section = "experience"
-            continue
-        elif line.lower() == "projects":
-            current_section = "projects"
-            continue
-        elif line.lower() == "technical skills":
-            current_section = "skills"
-            continue
-            
-        if current_section is None:
-            if "|" in line:
-                parts = line.split("|")
-                resume_data["personal_info"]["name"] = parts[0].strip()
-                contact_info = parts[1:]
-                for info in contact_info:
-                    info = info.strip()
-                    if "@" in info:
-                        resume_data["personal_info"]["email"] = info
-                    elif "linkedin.com" in info:
-                        resume_data["personal_info"]["linkedin"] = info
-                    elif "github.com" in info:
-                        resume_data["personal_info"]["github"] = info
-                    elif "+" in info:
-                        resume_data["personal_info"]["phone"] = info
+def load_resume(source, filename=None):
+    """
+    Extract and parse a resume, reusing earlier results for identical files.
+
+    Args:
+        source (str | bytes | file-like): Path to the resume file, its contents,
+            or a seekable binary stream such as an upload.
+        filename (str): Name used to pick the format when source is not a path.
+
+    Returns:
+        tuple: (resume_hash, extracted_text, resume_data). extracted_text is an
+        error message and resume_data is None when extraction fails.
+    """
+    if isinstance(source, (bytes, bytearray)):
+        resume_hash = hash_bytes(source)
+    elif isinstance(source, (str, os.PathLike)):
+        resume_hash = hash_file(source)
+    else:
+        resume_hash = hash_stream(source)
+    cached = resume_cache.get(resume_hash)
+    if cached is not None:
+        return resume_hash, cached["text"], cached["resume_data"]
+
+    with time_stage("text_extraction"):
+        extracted_text = extract_text_from_resume(source, filename)
+    if extracted_text.startswith("Error") or extracted_text.startswith("Unsupported"):
+        return resume_hash, extracted_text, None
+
+    resume_data = parse_resume_text(extracted_text)
+    resume_cache.put(resume_hash, {"text": extracted_text, "resume_data": resume_data})
+    return resume_hash, extracted_text, resume_data
+
+# Heading synonyms for each resume section. A line that consists of exactly one of
+# these (in any case, optionally followed by a colon) starts that section.
+SECTION_HEADINGS = {
+    "summary": [
+        "summary", "professional summary", "career summary", "objective", "career objective",
+        "professional objective", "profile", "professional profile", "about me", "about"
+    ],
+    "education": [
+        "education", "educational background", "education and training", "academic background",
+        "academics", "academic qualifications", "educational qualifications", "qualifications"
+    ],
+    "experience": [
+        "experience", "work experience", "professional experience", "relevant experience",
+        "employment", "employment history", "work history", "career history", "internships",
+        "internship", "internship experience", "positions of responsibility", "leadership",
+        "leadership experience", "volunteer experience", "extracurricular activities",
+        "extra-curricular activities"
+    ],
+    "projects": [
+        "projects", "personal projects", "academic projects", "key projects", "selected projects",
+        "technical projects", "project experience", "project work"
+    ],
+    "skills": [
+        "technical skills", "skills", "key skills", "core skills", "core competencies",
+        "competencies", "skills and interests", "skills & interests", "technologies", "tech stack",
+        "technical proficiencies", "tools and technologies", "tools & technologies", "skill set",
+        "skillset"
+    ],
+    "certifications": [
+        "certifications", "certificates", "licenses and certifications", "licenses & certifications",
+        "courses", "coursework", "relevant coursework", "training", "trainings"
+    ],
+    "achievements": [
+        "achievements", "accomplishments", "awards", "honors", "honours", "awards and honors",
+        "awards & honors", "honors and awards", "honors & awards", "awards and achievements",
+        "awards & achievements"
+    ],
+    "other": [
+        "interests", "hobbies", "languages", "publications", "references", "volunteering",
+        "activities", "additional information"
+    ]
+}
+
+def _heading_alternation(synonyms):
+    escaped = (re.escape(s).replace(r"\ ", r"\s+") for s in sorted(synonyms, key=len, reverse=True))
+    return "|".join(escaped)
+
+_HEADING_RE = re.compile(
+    r"^[^\w]*(?:"
+    + "|".join(f"(?P<{section}>{_heading_alternation(synonyms)})" for section, synonyms in SECTION_HEADINGS.items())
+    + r")[\s:]*$",
+    re.IGNORECASE
+)
+# No line longer than the longest synonym plus some decoration can be a heading
+_HEADING_MAX_LEN = max(len(s) for synonyms in SECTION_HEADINGS.values() for s in synonyms) + 8
+
+_MONTH = r"(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s*)?(?:19|20)\d{{2}}"
+_DATE_RE = re.compile(
+    rf"\s*(?P<date>{_DATE}\s*(?:[–—-]|to)\s*(?:{_DATE}|present|current|now|ongoing)|{_MONTH}\s*(?:19|20)\d{{2}})\s*$",
+    re.IGNORECASE
+)
+_DATE_MAX_LEN = 48
+_OPEN_ENDED_SUFFIXES = frozenset(("ent", "now", "ing"))
+_DEGREE_RE = re.compile(
+    r"\b(?:bachelor|master|doctor|b\.\s?tech|btech|m\.\s?tech|mtech|b\.e\.?|m\.e\.?|b\.s\.?|m\.s\.?|"
+    r"b\.?sc|m\.?sc|b\.a\.|m\.a\.|mba|ph\.?\s?d|diploma|associate|high school|hsc|ssc|1[0-2]th|a-levels)(?![a-z])",
+    re.IGNORECASE
+)
+_INSTITUTION_RE = re.compile(r"\b(?:university|college|institute|school|academy|iit|nit|iiit)\b", re.IGNORECASE)
+_GRADE_RE = re.compile(r"\b(?:cgpa|gpa|grade|percentage|score)\b", re.IGNORECASE)
+_PHONE_RE = re.compile(r"\+?\d[\d\s\-()]{7,}\d")
+_TOP_BULLETS = "•●▪■"
+_NESTED_BULLETS = "◦○▫*–-"
+_BULLETS = _TOP_BULLETS + _NESTED_BULLETS + " "
+
+def _split_bullet(line):
+    """
+    Return (level, text): level 0 for plain lines, 1 for top-level bullets and
+    2 for nested bullets.
+    """
+    if line[0] in _TOP_BULLETS:
+        return 1, line[1:].strip()
+    if line[0] in _NESTED_BULLETS and (len(line) == 1 or not line[1].isdigit()):
+        return 2, line[1:].strip()
+    return 0, line
+
+def _split_date(text):
+    """
+    Split a trailing date or date range off a line. Returns (text, date or None).
+    """
+    if not text:
+        return text, None
+    # Dates end in a year or an open-ended word, and a range is never longer than
+    # _DATE_MAX_LEN characters, so most lines are ruled out without the regex
+    if not (text[-1].isdigit() or text[-3:].lower() in _OPEN_ENDED_SUFFIXES):
+        return text, None
+    match = _DATE_RE.search(text, max(0, len(text) - _DATE_MAX_LEN))
+    if not match:
+        return text, None
+    return text[:match.start()].strip(), match.group("date").strip()
+
+def _split_list(text):
+    return [item.strip() for item in text.split(",") if item.strip()]
+
+class _ParseState:
+    def __init__(self):
+        self.resume_data = {
+            "personal_info": {},
+            "summary": "",
+            "education": [],
+            "experience": [],
+            "projects": [],
+            "skills": {},
+            "certifications": [],
+            "achievements": [],
+            "other": {}
+        }
+        self.section = None
+        self.heading = None
+        self.item = None
+        self.bullet_headers = False
+        self.summary_lines = []
+
+    def start_section(self, section, heading):
+        self.flush()
+        self.section = section
+        self.heading = heading
+        self.bullet_headers = False
+        if section == "other":
+            self.resume_data["other"].setdefault(heading, [])
+
+    def start_item(self, item):
+        self.flush()
+        self.item = item
+
+    def flush(self):
+        if self.item:
+            self.resume_data[self.section].append(self.item)
+        self.item = None
+
+    def add_description(self, text):
+        self.item.setdefault("description", []).append(text)
+
+    def continue_description(self, text):
+        if self.item.get("description"):
+            self.item["description"][-1] += " " + text
+        else:
+            self.add_description(text)
+
+def _parse_personal_info_line(state, line):
+    info = state.resume_data["personal_info"]
+    for part in line.split("|"):
+        part = part.strip()
+        lowered = part.lower()
+        if not part:
             continue
-            
-        if current_section == "education":
-            if "Bachelor" in line or "Master" in line:
-                if current_item:
-                    resume_data["education"].append(current_item)
-                current_item = {"degree": line}
-            elif "–" in line and current_item:
-                current_item["duration"] = line
-            elif current_item and "degree" in current_item and "duration" not in current_item:
-                current_item["institution"] = line
-                
-        elif current_section == "experience":
-            if "•" not in line and "–" in line:
-                if current_item:
-                    resume_data["experience"].append(current_item)
-                parts = line.split("–")
-                current_item = {
-                    "title": parts[0].strip(),
-                    "duration": parts[1].strip() if len(parts) > 1 else ""
-                }
-            elif "•" in line and current_item:
-                if "description" not in current_item:
-                    current_item["description"] = []
-                current_item["description"].append(line.replace("•", "").strip())
-                
-        elif current_section == "projects":
-            if "|" in line and "•" not in line:
-                if current_item:
-                    resume_data["projects"].append(current_item)
-                parts = line.split("|")
-                current_item = {
-                    "name": parts[0].strip(),
-                    "technologies": [tech.strip() for tech in parts[1:-1]],
-                    "link": parts[-1].strip() if parts[-1].strip() else None
-                }
-            elif "•" in line and current_item:
-                if "description" not in current_item:
-                    current_item["description"] = []
-                current_item["description"].append(line.replace("•", "").strip())
-                
-        elif current_section == "skills":
-            if ":" in line:
-                category, skills = line.split(":", 1)
-                resume_data["skills"][category.strip()] = [skill.strip() for skill in skills.split(",")]
-    
-    if current_section == "education" and current_item:
-        resume_data["education"].append(current_item)
-    elif current_section == "experience" and current_item:
-        resume_data["experience"].append(current_item)
-    elif current_section == "projects" and current_item:
-        resume_data["projects"].append(current_item)
-        
-    return resume_data
+        if "@" in part:
+            info.setdefault("email", part)
+        elif "linkedin" in lowered:
+            info.setdefault("linkedin", part)
+        elif "github" in lowered:
+            info.setdefault("github", part)
+        elif _PHONE_RE.fullmatch(part):
+            info.setdefault("phone", part)
+        elif "name" not in info:
+            info["name"] = part
+        else:
+            info.setdefault("location", part)
 
-def analyze_resume(resume_text, job_description):
+def _parse_summary_line(state, line):
+    state.summary_lines.append(_split_bullet(line)[1])
+
+def _parse_education_line(state, line):
+    level, text = _split_bullet(line)
+    text, duration = _split_date(text)
+    item = state.item
+    if not text:
+        # A line holding only the dates of the current entry
+        if item is not None:
+            item.setdefault("duration", duration)
+        return
+    if _DEGREE_RE.search(text):
+        if item is None or "degree" in item:
+            state.start_item({})
+        state.item["degree"] = text
+    elif _GRADE_RE.search(text) and item is not None:
+        item["grade"] = text
+    elif _INSTITUTION_RE.search(text) or level == 1 or item is None:
+        if item is None or "institution" in item:
+            state.start_item({})
+        state.item["institution"] = text
+    elif "institution" not in item:
+        item["institution"] = text
+    if duration:
+        state.item.setdefault("duration", duration)
+
+def _parse_experience_line(state, line):
+    level, text = _split_bullet(line)
+    header_text, duration = _split_date(text)
+    if duration is None and level == 0 and "–" in text:
+        # A "title – dates" line whose dates are not in a recognised format
+        header_text, _, duration = (part.strip() for part in text.partition("–"))
+    is_header = duration is not None and (
+        level == 0 or (level == 1 and (state.bullet_headers or state.item is None))
+    )
+    if is_header and not header_text and state.item is not None:
+        # A line holding only the dates of the current entry
+        state.item.setdefault("duration", duration)
+    elif is_header:
+        state.bullet_headers = state.bullet_headers or level == 1
+        state.start_item({"title": header_text, "duration": duration})
+    elif state.item is None:
+        # An entry whose dates, if any, come on a later line
+        state.start_item({"title": text})
+    elif level > 0:
+        state.add_description(text)
+    elif "organization" not in state.item and "description" not in state.item:
+        state.item["organization"] = text
+    else:
+        state.continue_description(text)
+
+def _parse_projects_line(state, line):
+    level, text = _split_bullet(line)
+    if "|" in text and level == 0:
+        parts = text.split("|")
+        link = parts[-1].strip() if len(parts) > 1 else ""
+        technologies = [tech for part in parts[1:-1] for tech in _split_list(part)]
+        state.start_item({"name": parts[0].strip(), "technologies": technologies, "link": link or None})
+    elif (level == 1 and (state.bullet_headers or state.item is None)) or (level == 0 and state.item is None):
+        state.bullet_headers = state.bullet_headers or level == 1
+        name, _, link = text.partition(":-")
+        state.start_item({"name": name.strip(), "technologies": [], "link": link.strip() or None})
+    elif state.item is None:
+        return
+    elif level > 0:
+        state.add_description(text)
+    elif not state.item["technologies"] and "description" not in state.item:
+        state.item["technologies"] = _split_list(text)
+    else:
+        state.continue_description(text)
+
+def _parse_skills_line(state, line):
+    text = _split_bullet(line)[1]
+    if ":" in text:
+        category, skills = text.split(":", 1)
+        state.resume_data["skills"][category.strip()] = _split_list(skills)
+    else:
+        state.resume_data["skills"].setdefault("Other", []).extend(_split_list(text))
+
+def _parse_list_line(state, line):
+    if state.section == "other":
+        entries = state.resume_data["other"][state.heading]
+    else:
+        entries = state.resume_data[state.section]
+    level, text = _split_bullet(line)
+    if level == 1:
+        state.bullet_headers = True
+        entries.append(text)
+    elif entries and (level == 2 or state.bullet_headers):
+        entries[-1] += ", " + text
+    else:
+        entries.append(text)
+
+_SECTION_HANDLERS = {
+    None: _parse_personal_info_line,
+    "summary": _parse_summary_line,
+    "education": _parse_education_line,
+    "experience": _parse_experience_line,
+    "projects": _parse_projects_line,
+    "skills": _parse_skills_line,
+    "certifications": _parse_list_line,
+    "achievements": _parse_list_line,
+    "other": _parse_list_line
+}
+
+def parse_resume_text(text):
     """
-    Analyze the resume text against the job description using the generative AI model.
+    Parse extracted resume text into structured data in a single pass.
+
+    Section headings are recognised with one precompiled pattern covering the
+    synonyms in SECTION_HEADINGS; every other line is dispatched to the handler
+    of the section it appears in.
 
     Args:
-        resume_text (str): The extracted text from the resume.
-        job_description (str): The job description to analyze against.
+        text (str): The extracted text from the resume.
 
     Returns:
-        str: JSON string containing the analysis result.
+        dict: personal_info, summary, education, experience, projects, skills,
+        certifications, achievements and other (lines under recognised headings
+        that map to no structured section).
     """
-    try:
-        input_prompt = f"""
+    state = _ParseState()
+    match_heading = _HEADING_RE.match
+    handler = _SECTION_HANDLERS[None]
+
+    for line in text.split('\n'):
+        line = line.strip()
+        # PDF extraction leaves bullets on lines of their own; they carry no text
+        if not line.strip(_BULLETS):
+            continue
+
+        heading = match_heading(line) if len(line) <= _HEADING_MAX_LEN else None
+        if heading:
+            state.start_section(heading.lastgroup, line.strip(" :").title())
+            handler = _SECTION_HANDLERS[heading.lastgroup]
+            continue
+
+        handler(state, line)
+
+    state.flush()
+    state.resume_data["summary"] = " ".join(state.summary_lines)
+    return state.resume_data
+
+@timed_stage("prompt_build")
+def _resume_analysis_prompt(resume_text, job_description):
+    return f"""
         You are an expert resume analyzer and career advisor. Your task is to analyze resumes against job descriptions and provide specific, actionable feedback in a consistent JSON format.
 
         Instructions:
@@ -225,52 +734,333 @@ def analyze_resume(resume_text, job_description):
 
         Analyze the above resume against the job description and return a JSON object following the schema exactly.
         """
-        response = model.generate_content(input_prompt)
 
-        # Log the raw response for debugging
-        print(f"Raw AI Response: {response.text}")
+def analyze_resume(resume_text, job_description):
+    """
+    Analyze the resume text against the job description using the generative AI model.
+
+    Args:
+        resume_text (str): The extracted text from the resume.
+        job_description (str): The job description to analyze against.
+
+    Returns:
+        str: JSON string containing the analysis result.
+    """
+    try:
+        input_prompt = _resume_analysis_prompt(resume_text, job_description)
+        with time_stage("llm_call"):
+            response = get_model().generate_content(input_prompt)
+
+        # Log a sample of raw responses for debugging
+        log_payload(logger, "Raw AI response", response.text)
 
         # Validate the response to ensure it is valid JSON
-        try:
-            parsed_response = json.loads(response.text)
-            return json.dumps(parsed_response)  # Return as a JSON string
-        except json.JSONDecodeError:
-            # Attempt to extract JSON from the response using regex
-            import re
-            json_match = re.search(r'\{.*\}', response.text, re.DOTALL)
-            if json_match:
-                extracted_json = json_match.group(0)
-                try:
-                    parsed_response = json.loads(extracted_json)
-                    return json.dumps(parsed_response)  # Return as a JSON string
-                except json.JSONDecodeError:
-                    raise ValueError("Failed to extract valid JSON from the AI response.")
-            raise ValueError("Invalid JSON response from the generative AI model.")
+        return json.dumps(parse_model_json(response.text))  # Return as a JSON string
 
     except Exception as e:
         return f"Error analyzing resume: {str(e)}"
 
-def process_cv(file_path):
+async def analyze_resume_async(resume_text, job_description):
     """
-    Process a CV file and return structured data and analysis.
+    Same as analyze_resume(), but awaits the model response instead of
+    blocking a thread on it. Used by the ASGI server.
     """
     try:
-        # Extract text from the resume
-        extracted_text = extract_text_from_resume(file_path)
-        if extracted_text.startswith("Error"):
-            return {"error": extracted_text}
+        input_prompt = _resume_analysis_prompt(resume_text, job_description)
+        with time_stage("llm_call"):
+            response = await get_model().generate_content_async(input_prompt)
+        log_payload(logger, "Raw AI response", response.text)
+        return json.dumps(parse_model_json(response.text))
+    except Exception as e:
+        return f"Error analyzing resume: {str(e)}"
+
+def parse_model_json(response_text):
+    """
+    Parse the JSON object out of a generative AI response.
+
+    Args:
+        response_text (str): The raw text returned by the model.
+
+    Returns:
+        dict: The parsed JSON object.
+    """
+    try:
+        return json.loads(response_text)
+    except json.JSONDecodeError:
+        # Attempt to extract JSON from the response using regex
+        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+        if json_match:
+            try:
+                return json.loads(json_match.group(0))
+            except json.JSONDecodeError:
+                raise ValueError("Failed to extract valid JSON from the AI response.")
+        raise ValueError("Invalid JSON response from the generative AI model.")
+
+def _section_text(resume_data, section):
+    """
+    Flatten one parsed resume section back into plain text for keyword scoring.
+    """
+    if section == "skills":
+        return "\n".join(
+            f"{category}: {', '.join(skills)}" for category, skills in resume_data["skills"].items()
+        )
+    parts = []
+    for item in resume_data[section]:
+        for value in item.values():
+            if isinstance(value, list):
+                parts.extend(value)
+            elif value:
+                parts.append(value)
+    return "\n".join(parts)
+
+def compute_local_analysis(resume_text, job_description):
+    """
+    Compute the keyword and score sections of the resume analysis locally,
+    using the keyword engine from new.py instead of the generative AI model.
+
+    Args:
+        resume_text (str): The extracted text from the resume.
+        job_description (str): The job description to analyze against.
 
-        # Parse the resume text into structured data
-        resume_data = parse_resume_text(extracted_text)
+    Returns:
+        dict: The "score_breakdown" and "keyword_analysis" sections.
+    """
+    from new import extract_keywords, get_job_profile, score_keywords, keyword_gap
+
+    job_keywords = get_job_profile(job_description).keywords
+    resume_keywords = extract_keywords(resume_text)
+    overall_score, _ = score_keywords(resume_keywords, job_keywords)
+
+    resume_data = parse_resume_text(resume_text)
+    section_scores = {}
+    for section in ("skills", "experience", "education"):
+        section_text = _section_text(resume_data, section)
+        if section_text:
+            score, _ = score_keywords(extract_keywords(section_text), job_keywords)
+            section_scores[section] = f"{score:.0f}%"
+        else:
+            section_scores[section] = "N/A (section not detected)"
 
-        # Analyze the resume against a placeholder job description
-        job_description = "Placeholder job description for analysis."
-        analysis_result = analyze_resume(extracted_text, job_description)
+    present_keywords, missing_keywords = keyword_gap(resume_keywords, job_keywords)
 
-        # Return the structured data and analysis
-        return {
-            "resume_data": resume_data,
-            "analysis_result": analysis_result
+    return {
+        "score_breakdown": {
+            "overall_ATS_score": f"{overall_score:.0f}%",
+            "skills_match": section_scores["skills"],
+            "experience_match": section_scores["experience"],
+            "education_match": section_scores["education"]
+        },
+        "keyword_analysis": {
+            "present_keywords": present_keywords,
+            "missing_keywords": missing_keywords
         }
+    }
+
+@timed_stage("prompt_build")
+def _narrative_prompt(resume_text, job_description, present_keywords, missing_keywords):
+    return f"""
+    You are an expert resume analyzer and career advisor. Analyze the resume against the job description.
+    Keyword matching has already been done: do not repeat it, use it as context.
+
+    Keywords present in the resume: {", ".join(present_keywords) or "none"}
+    Keywords missing from the resume: {", ".join(missing_keywords) or "none"}
+
+    Return ONLY a valid JSON object with this schema and no additional text:
+    {{
+      "quick_overview": {{
+        "job_title_match": "string",
+        "industry_fit": "string",
+        "experience_level_match": "string"
+      }},
+      "critical_gaps": {{
+        "gap_1": {{"description": "string", "suggestions": "string"}},
+        "gap_2": {{"description": "string", "suggestions": "string"}},
+        "gap_3": {{"description": "string", "suggestions": "string"}}
+      }},
+      "suggested_keywords": ["string"],
+      "improvement_plan": {{
+        "immediate_changes": ["string"],
+        "short_term_improvements": ["string"],
+        "long_term_development": ["string"]
+      }},
+      "success_metrics": {{
+        "current_application_success_rate": "string",
+        "expected_success_after_improvements": "string",
+        "time_to_implement_all_changes": "string"
+      }},
+      "customized_suggestions": ["string"]
+    }}
+
+    Resume: {resume_text}
+    Job Description: {job_description}
+    """
+
+def analyze_resume_narrative(resume_text, job_description, present_keywords, missing_keywords):
+    """
+    Ask the generative AI model only for the narrative sections of the analysis.
+    The keyword and score sections are computed locally and passed in as context.
+
+    Returns:
+        dict: The narrative sections of the analysis.
+    """
+    input_prompt = _narrative_prompt(resume_text, job_description, present_keywords, missing_keywords)
+    with time_stage("llm_call"):
+        response = get_model().generate_content(input_prompt)
+    return parse_model_json(response.text)
+
+async def analyze_resume_narrative_async(resume_text, job_description, present_keywords, missing_keywords):
+    """
+    Same as analyze_resume_narrative(), awaiting the model response.
+    """
+    input_prompt = _narrative_prompt(resume_text, job_description, present_keywords, missing_keywords)
+    with time_stage("llm_call"):
+        response = await get_model().generate_content_async(input_prompt)
+    return parse_model_json(response.text)
+
+def _local_resume_analysis(local):
+    return {
+        "score_breakdown": local["score_breakdown"],
+        "keyword_analysis": dict(local["keyword_analysis"], suggested_keywords=[])
+    }
+
+def _merge_narrative(resume_analysis, narrative):
+    """
+    Return the locally computed analysis completed with the model's narrative sections.
+    """
+    resume_analysis = dict(resume_analysis)
+    resume_analysis["keyword_analysis"] = dict(
+        resume_analysis["keyword_analysis"],
+        suggested_keywords=narrative.pop("suggested_keywords", [])
+    )
+    for key in ("quick_overview", "critical_gaps", "improvement_plan", "success_metrics"):
+        resume_analysis[key] = narrative.get(key, {})
+    resume_analysis["customized_suggestions"] = narrative.get("customized_suggestions", [])
+    return resume_analysis
+
+def analyze_resume_hybrid(resume_text, job_description):
+    """
+    Analyze the resume in hybrid mode: keyword and score sections are computed
+    locally, only the narrative sections come from the generative AI model.
+
+    This is a generator. It first yields the locally computed analysis, then
+    the complete analysis once the narrative sections have arrived. Both are
+    dicts following the "resume_analysis" schema of analyze_resume().
+
+    Raises:
+        ValueError: If the job description has no usable keywords or the
+            model response cannot be parsed.
+    """
+    local = compute_local_analysis(resume_text, job_description)
+    resume_analysis = _local_resume_analysis(local)
+    yield {"resume_analysis": resume_analysis}
+
+    narrative = analyze_resume_narrative(
+        resume_text,
+        job_description,
+        local["keyword_analysis"]["present_keywords"],
+        local["keyword_analysis"]["missing_keywords"]
+    )
+    yield {"resume_analysis": _merge_narrative(resume_analysis, narrative)}
+
+async def analyze_resume_hybrid_async(resume_text, job_description, executor=None):
+    """
+    Async generator version of analyze_resume_hybrid(). The local keyword
+    scoring runs on an executor and the model response is awaited, so neither
+    blocks the event loop.
+    """
+    loop = asyncio.get_running_loop()
+    local = await loop.run_in_executor(executor, contextvars.copy_context().run,
+                                       compute_local_analysis, resume_text, job_description)
+    resume_analysis = _local_resume_analysis(local)
+    yield {"resume_analysis": resume_analysis}
+
+    narrative = await analyze_resume_narrative_async(
+        resume_text,
+        job_description,
+        local["keyword_analysis"]["present_keywords"],
+        local["keyword_analysis"]["missing_keywords"]
+    )
+    yield {"resume_analysis": _merge_narrative(resume_analysis, narrative)}
+
+PROCESS_CV_MODES = ("parse", "analyze", "both")
+
+def get_cached_resume(resume_hash):
+    """
+    Look up a previously processed resume by its hash.
+
+    Returns:
+        tuple: (extracted_text, resume_data), or None if the resume is not cached.
+    """
+    cached = resume_cache.get(resume_hash)
+    if cached is None:
+        return None
+    return cached["text"], cached["resume_data"]
+
+def process_cv(source, filename=None, mode="parse", job_description=None):
+    """
+    Process a CV file and return structured data and/or analysis.
+
+    Args:
+        source (str | bytes | file-like): Path to the CV file, its contents,
+            or a seekable binary stream such as an upload.
+        filename (str): Name used to pick the format when source is not a path.
+        mode (str): "parse" (default) returns only the structured resume_data
+            without calling the generative AI model; "analyze" returns only
+            the analysis; "both" returns both.
+        job_description (str): Job description to analyze against. Defaults
+            to a placeholder when analysis is requested without one.
+
+    Returns:
+        dict: resume_hash plus resume_data and/or analysis_result. The hash can
+        be passed to /api/analyze-resume later instead of re-uploading the file.
+    """
+    if mode not in PROCESS_CV_MODES:
+        return {"error": f"Invalid mode: {mode}. Expected one of {', '.join(PROCESS_CV_MODES)}"}
+
+    try:
+        # Extract text from the resume and parse it into structured data
+        resume_hash, extracted_text, resume_data = load_resume(source, filename)
+        if resume_data is None:
+            return {"error": extracted_text}
+
+        result = {"resume_hash": resume_hash}
+        if mode in ("parse", "both"):
+            result["resume_data"] = resume_data
+
+        if mode in ("analyze", "both"):
+            # Analyze the resume against a placeholder job description unless one is given
+            job_description = job_description or "Placeholder job description for analysis."
+            result["analysis_result"] = analyze_resume(extracted_text, job_description)
+
+        return result
+    except Exception as e:
+        return {"error": f"An error occurred while processing the CV: {str(e)}"}
+
+async def process_cv_async(source, filename=None, mode="parse", job_description=None, executor=None):
+    """
+    Async version of process_cv() for the ASGI server. Extraction and parsing
+    run on an executor and the model response is awaited. Same arguments
+    (plus the executor) and return value as process_cv().
+    """
+    if mode not in PROCESS_CV_MODES:
+        return {"error": f"Invalid mode: {mode}. Expected one of {', '.join(PROCESS_CV_MODES)}"}
+
+    try:
+        loop = asyncio.get_running_loop()
+        resume_hash, extracted_text, resume_data = await loop.run_in_executor(
+            executor, contextvars.copy_context().run, load_resume, source, filename
+        )
+        if resume_data is None:
+            return {"error": extracted_text}
+
+        result = {"resume_hash": resume_hash}
+        if mode in ("parse", "both"):
+            result["resume_data"] = resume_data
+
+        if mode in ("analyze", "both"):
+            job_description = job_description or "Placeholder job description for analysis."
+            result["analysis_result"] = await analyze_resume_async(extracted_text, job_description)
+
+        return result
     except Exception as e:
         return {"error": f"An error occurred while processing the CV: {str(e)}"}
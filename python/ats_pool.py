@@ -0,0 +1,166 @@
+import os
+import time
+import asyncio
+import logging
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FuturesTimeout
+from concurrent.futures.process import BrokenProcessPool
+
+logger = logging.getLogger(__name__)
+
+# Worker processes that keep NLTK loaded for local ATS scoring
+ATS_WORKERS = int(os.getenv("ATS_WORKERS", str(min(2, os.cpu_count() or 1))))
+# Seconds a request waits for a score before giving up
+ATS_TIMEOUT = float(os.getenv("ATS_TIMEOUT", "10"))
+# Seconds warm_up() waits for every worker process to start
+ATS_WARM_UP_TIMEOUT = float(os.getenv("ATS_WARM_UP_TIMEOUT", "120"))
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def _init_worker():
+    # Import new.py (and its NLTK download checks) and load the tokenizer,
+    # tagger and synonym data once per worker rather than once per request
+    import new
+    new.warm_up()
+
+def _worker_pid(hold):
+    # Holding the worker for a moment makes the pool hand the next task to another one
+    time.sleep(hold)
+    return os.getpid()
+
+def score_resume_text(resume_text, job_description):
+    """
+    Compute the keyword ATS score of a resume against a job description. Runs in a worker process.
+
+    Returns:
+        dict: The ATS score, matched keywords, the job's top keywords missing
+        from the resume and the time spent, or an 'error' entry.
+    """
+    from new import extract_keywords, get_job_profile, score_keywords, keyword_gap
+
+    start = time.perf_counter()
+    resume_keywords = extract_keywords(resume_text)
+    # Cached per worker, so a posting scored against many resumes is extracted once per worker
+    job_keywords = get_job_profile(job_description).keywords
+    extracted = time.perf_counter()
+    try:
+        score, matched_keywords = score_keywords(resume_keywords, job_keywords)
+    except ValueError as e:
+        return {"error": str(e)}
+    _, missing_keywords = keyword_gap(resume_keywords, job_keywords)
+    end = time.perf_counter()
+    return {
+        "ats_score": round(score, 2),
+        "matched_keywords": sorted(matched_keywords),
+        "missing_keywords": missing_keywords,
+        "timing": {
+            "extract_keywords_ms": round((extracted - start) * 1000, 2),
+            "score_ms": round((end - extracted) * 1000, 2)
+        }
+    }
+
+def get_pool():
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ProcessPoolExecutor(max_workers=ATS_WORKERS, initializer=_init_worker)
+    return _pool
+
+def _discard_pool(pool):
+    """
+    Drop a pool whose worker died (it raises BrokenProcessPool from then on),
+    so the next get_pool() starts a new one.
+    """
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+            logger.warning("ATS worker pool broke; starting a new one")
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def warm_up():
+    """
+    Start every worker process and wait until each has loaded NLTK.
+
+    Returns:
+        dict: The number of workers started and the seconds it took.
+
+    Raises:
+        TimeoutError: If not every worker started within ATS_WARM_UP_TIMEOUT.
+    """
+    start = time.perf_counter()
+    deadline = time.monotonic() + ATS_WARM_UP_TIMEOUT
+    pids = set()
+    # A worker answers once its initializer has loaded NLTK. Workers may
+    # start on demand, so keep one task per worker in flight until every
+    # worker has answered
+    while len(pids) < ATS_WORKERS:
+        pool = get_pool()
+        try:
+            futures = [pool.submit(_worker_pid, 0.05) for _ in range(ATS_WORKERS)]
+            pids.update(future.result(timeout=max(0, deadline - time.monotonic())) for future in futures)
+        except BrokenProcessPool:
+            _discard_pool(pool)
+            raise
+        except FuturesTimeout:
+            raise TimeoutError(f"Only {len(pids)} of {ATS_WORKERS} ATS workers started "
+                               f"within {ATS_WARM_UP_TIMEOUT:g}s")
+    return {"workers": len(pids), "seconds": round(time.perf_counter() - start, 4)}
+
+def _unavailable():
+    return {"error": "ATS scoring is temporarily unavailable. Please try again.", "unavailable": True}
+
+def score(resume_text, job_description, timeout=ATS_TIMEOUT):
+    """
+    Score a resume on the worker pool. A pool broken by a crashed worker is
+    replaced and the resume scored once more on the new one.
+
+    Returns:
+        dict: The result of score_resume_text with the total time including
+        queueing added to 'timing', or an 'error' entry ('timeout' is set
+        when no worker finished in time, 'unavailable' when the pool broke
+        twice).
+    """
+    start = time.perf_counter()
+    deadline = time.monotonic() + timeout
+    for _ in range(2):
+        pool = get_pool()
+        try:
+            future = pool.submit(score_resume_text, resume_text, job_description)
+            result = future.result(timeout=max(0, deadline - time.monotonic()))
+            break
+        except FuturesTimeout:
+            future.cancel()
+            return {"error": f"ATS scoring exceeded the {timeout:g}s time budget", "timeout": True}
+        except BrokenProcessPool:
+            _discard_pool(pool)
+    else:
+        return _unavailable()
+    if "timing" in result:
+        result["timing"]["total_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
+
+async def score_async(resume_text, job_description, timeout=ATS_TIMEOUT):
+    """
+    Same as score(), awaiting the worker instead of blocking a thread on it.
+    """
+    start = time.perf_counter()
+    deadline = time.monotonic() + timeout
+    for _ in range(2):
+        pool = get_pool()
+        try:
+            future = pool.submit(score_resume_text, resume_text, job_description)
+            result = await asyncio.wait_for(asyncio.wrap_future(future), max(0, deadline - time.monotonic()))
+            break
+        except asyncio.TimeoutError:
+            future.cancel()
+            return {"error": f"ATS scoring exceeded the {timeout:g}s time budget", "timeout": True}
+        except BrokenProcessPool:
+            _discard_pool(pool)
+    else:
+        return _unavailable()
+    if "timing" in result:
+        result["timing"]["total_ms"] = round((time.perf_counter() - start) * 1000, 2)
+    return result
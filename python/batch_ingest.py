@@ -0,0 +1,128 @@
+import os
+import sys
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import CV
+from CV import extract_text_from_resume, parse_resume_text
+from resume_cache import hash_file
+
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.txt')
+
+def find_resumes(directory):
+    """
+    Walk a directory and return the paths of all supported resume files, sorted.
+    """
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if os.path.splitext(name)[1].lower() in SUPPORTED_EXTENSIONS:
+                paths.append(os.path.join(root, name))
+    return sorted(paths)
+
+def load_checkpoint(output_path, retry_failed=False):
+    """
+    Read the paths already recorded in an earlier run's JSONL output.
+    A line cut short by an interrupt is ignored, so that file is processed again.
+    """
+    done = set()
+    if not os.path.exists(output_path):
+        return done
+    with open(output_path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if retry_failed and record.get("status") != "ok":
+                continue
+            done.add(record["path"])
+    return done
+
+def _init_worker():
+    # Files are already spread across processes, so each PDF is extracted serially
+    CV.PDF_WORKERS = 1
+
+def ingest_file(path, include_text=False):
+    """
+    Extract and parse one resume. Runs in a worker process.
+
+    Returns:
+        dict: A JSONL record with the path, status and parsed data or error.
+    """
+    start = time.perf_counter()
+    record = {"path": path}
+    try:
+        record["resume_hash"] = hash_file(path)
+        text = extract_text_from_resume(path)
+        if text.startswith("Error") or text.startswith("Unsupported"):
+            record.update(status="error", error=text)
+        else:
+            record.update(status="ok", text_chars=len(text), resume_data=parse_resume_text(text))
+            if include_text:
+                record["text"] = text
+    except Exception as e:
+        record.update(status="error", error=str(e))
+    record["seconds"] = round(time.perf_counter() - start, 4)
+    return record
+
+def _ingest_file_with_text(path):
+    return ingest_file(path, include_text=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-extract and parse a directory of resumes into JSONL")
+    parser.add_argument('directory', help="Directory to scan for .pdf, .docx and .txt resumes")
+    parser.add_argument('--output', required=True, help="JSONL file to write one record per resume to")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Worker processes (default: CPU count)")
+    parser.add_argument('--chunksize', type=int, default=8, help="Files handed to a worker at a time")
+    parser.add_argument('--resume', action='store_true', help="Skip files already recorded in the output file")
+    parser.add_argument('--retry-failed', action='store_true', help="With --resume, process failed files again")
+    parser.add_argument('--include-text', action='store_true', help="Include the extracted text in each record")
+    args = parser.parse_args()
+
+    paths = find_resumes(args.directory)
+    if args.resume:
+        done = load_checkpoint(args.output, args.retry_failed)
+        paths = [path for path in paths if path not in done]
+        print(f"Resuming: {len(done)} files already recorded")
+    print(f"Processing {len(paths)} files with {args.workers} workers")
+
+    if args.resume and os.path.exists(args.output) and os.path.getsize(args.output) > 0:
+        with open(args.output, 'rb') as f:
+            f.seek(-1, os.SEEK_END)
+            ends_with_newline = f.read(1) == b"\n"
+        if not ends_with_newline:
+            # Terminate a record cut short by an interrupt so new records start on their own line
+            with open(args.output, 'a', encoding='utf-8') as f:
+                f.write("\n")
+
+    worker = _ingest_file_with_text if args.include_text else ingest_file
+    counts = {"ok": 0, "error": 0}
+    start = time.perf_counter()
+
+    with open(args.output, 'a' if args.resume else 'w', encoding='utf-8') as out, \
+            ProcessPoolExecutor(max_workers=args.workers, initializer=_init_worker) as executor:
+        try:
+            for i, record in enumerate(executor.map(worker, paths, chunksize=args.chunksize), 1):
+                # One flushed line per file keeps the output usable as a checkpoint
+                out.write(json.dumps(record, ensure_ascii=False) + "\n")
+                out.flush()
+                counts[record["status"]] += 1
+                if i % 100 == 0:
+                    elapsed = time.perf_counter() - start
+                    print(f"  {i}/{len(paths)} files ({i / elapsed:.1f} files/sec)")
+        except KeyboardInterrupt:
+            print("\nInterrupted. Re-run with --resume to continue where this run stopped.")
+            executor.shutdown(wait=False, cancel_futures=True)
+            sys.exit(130)
+
+    elapsed = time.perf_counter() - start
+    total = counts["ok"] + counts["error"]
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"\n✅ Processed {total} files in {elapsed:.2f}s ({rate:.1f} files/sec): "
+          f"{counts['ok']} ok, {counts['error']} failed")
+
+if __name__ == "__main__":
+    main()
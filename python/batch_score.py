@@ -0,0 +1,179 @@
+import os
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from scipy import sparse
+
+from new import extract_keywords, get_job_profile
+
+class KeywordMatrix:
+    """
+    Keyword counts of many resumes as rows of a sparse CSR matrix over a
+    shared vocabulary, so one job description can be scored against all of
+    them with a few array operations instead of one Python loop per resume.
+    """
+
+    def __init__(self, ids, vocabulary, matrix):
+        self.ids = list(ids)
+        self.vocabulary = vocabulary
+        self.terms = np.empty(len(vocabulary), dtype=object)
+        for term, column in vocabulary.items():
+            self.terms[column] = term
+        self.matrix = matrix
+
+    @classmethod
+    def from_keywords(cls, ids, keyword_counters):
+        """
+        Build the matrix from resume ids and the Counters extract_keywords returned for them.
+        """
+        vocabulary = {}
+        indices = []
+        data = []
+        indptr = [0]
+        for keywords in keyword_counters:
+            for term, count in keywords.items():
+                indices.append(vocabulary.setdefault(term, len(vocabulary)))
+                data.append(count)
+            indptr.append(len(indices))
+        matrix = sparse.csr_matrix(
+            (np.asarray(data, dtype=np.float64), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(len(indptr) - 1, len(vocabulary))
+        )
+        return cls(ids, vocabulary, matrix)
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    def _job_columns(self, job_keywords):
+        columns = []
+        weights = []
+        for keyword, weight in job_keywords.items():
+            column = self.vocabulary.get(keyword)
+            if column is not None:
+                columns.append(column)
+                weights.append(weight)
+        return np.asarray(columns, dtype=np.int64), np.asarray(weights, dtype=np.float64)
+
+    def score(self, job_keywords):
+        """
+        Score every resume against already-extracted job keywords.
+
+        Computes the same sum of min(resume count, weight) * weight over the
+        job keywords as new.score_keywords, as a percentage of the total job weight.
+
+        Returns:
+            tuple: (scores array with one percentage per row, job-keyword submatrix
+            used to report matched keywords, vocabulary columns of that submatrix)
+        """
+        if not job_keywords:
+            raise ValueError("Job description has no valid keywords.")
+        total_possible_score = sum(job_keywords.values())
+
+        columns, weights = self._job_columns(job_keywords)
+        # Only the job keywords contribute, so drop every other column first
+        matched = self.matrix[:, columns].tocsr()
+        column_weights = weights[matched.indices]
+        contributions = np.minimum(matched.data, column_weights) * column_weights
+        rows = np.repeat(np.arange(len(self)), np.diff(matched.indptr))
+        row_scores = np.bincount(rows, weights=contributions, minlength=len(self))
+
+        scores = row_scores / total_possible_score * 100 if total_possible_score > 0 else np.zeros(len(self))
+        return scores, matched, columns
+
+    def top_k(self, job_keywords, k=10):
+        """
+        Return the k best-scoring resumes for already-extracted job keywords.
+
+        Returns:
+            list: Dicts with the resume id, ATS score and sorted matched keywords, best first.
+        """
+        scores, matched, columns = self.score(job_keywords)
+        k = min(k, len(scores))
+        if k <= 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.lexsort((best, -scores[best]))]
+
+        results = []
+        for row in best:
+            start, end = matched.indptr[row], matched.indptr[row + 1]
+            keywords = self.terms[columns[matched.indices[start:end]]]
+            results.append({
+                "id": self.ids[row],
+                "score": float(scores[row]),
+                "matched_keywords": sorted(keywords)
+            })
+        return results
+
+def load_resume_texts(path):
+    """
+    Load (id, text) pairs from a directory of resumes or from a batch_ingest.py
+    JSONL file written with --include-text.
+    """
+    if os.path.isdir(path):
+        from batch_ingest import find_resumes
+        from CV import extract_text_from_resume
+        pairs = []
+        for resume_path in find_resumes(path):
+            text = extract_text_from_resume(resume_path)
+            if not (text.startswith("Error") or text.startswith("Unsupported")):
+                pairs.append((resume_path, text))
+        return pairs
+
+    pairs = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get("status") == "ok" and record.get("text"):
+                pairs.append((record["path"], record["text"]))
+    return pairs
+
+def main():
+    parser = argparse.ArgumentParser(description="Score one job description against many resumes and print the top matches")
+    parser.add_argument('resumes', help="Directory of resumes, or a batch_ingest.py JSONL file written with --include-text")
+    parser.add_argument('--jd', required=True, help="Path to a text file with the job description")
+    parser.add_argument('--top', type=int, default=10, help="Number of best matches to report")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Processes used for keyword extraction")
+    parser.add_argument('--json', action='store_true', help="Print the results as JSON")
+    args = parser.parse_args()
+
+    with open(args.jd, 'r', encoding='utf-8') as f:
+        job_keywords = get_job_profile(f.read()).keywords
+
+    pairs = load_resume_texts(args.resumes)
+    if not pairs:
+        print("\n❌ No resumes with extractable text found.")
+        return
+    ids = [resume_id for resume_id, _ in pairs]
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        keyword_counters = list(executor.map(extract_keywords, [text for _, text in pairs], chunksize=16))
+    extract_seconds = time.perf_counter() - start
+
+    matrix = KeywordMatrix.from_keywords(ids, keyword_counters)
+    start = time.perf_counter()
+    try:
+        results = matrix.top_k(job_keywords, args.top)
+    except ValueError as e:
+        print(f"\n❌ Error computing ATS scores: {e}")
+        return
+    score_seconds = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps(results, indent=2, ensure_ascii=False))
+        return
+    print(f"\n✅ Scored {len(matrix)} resumes in {score_seconds * 1000:.1f} ms "
+          f"(keyword extraction took {extract_seconds:.2f}s)")
+    for rank, result in enumerate(results, 1):
+        print(f"\n{rank}. {result['id']}: {result['score']:.2f}%")
+        print(f"   Matched: {', '.join(result['matched_keywords'][:15])}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+import os
+import sys
+import json
+import uuid
+import queue
+import atexit
+import random
+import logging
+import contextvars
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+# "json" for one JSON object per line, "text" for the classic format
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json")
+LOG_MAX_BYTES = int(os.getenv("LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+LOG_BACKUP_COUNT = int(os.getenv("LOG_BACKUP_COUNT", "5"))
+# Request bodies and model responses are logged for this share of calls,
+# cut to LOG_PAYLOAD_CHARS characters
+LOG_PAYLOAD_SAMPLE_RATE = float(os.getenv("LOG_PAYLOAD_SAMPLE_RATE", "0.01"))
+LOG_PAYLOAD_CHARS = int(os.getenv("LOG_PAYLOAD_CHARS", "500"))
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s'
+
+# The correlation ID of the request being handled by the current thread or task
+request_id_var = contextvars.ContextVar("request_id", default="-")
+
+# LogRecord attributes that are not worth repeating in every JSON line
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime"}
+
+_listener = None
+
+class RequestIdFilter(logging.Filter):
+    """Stamp each record with the correlation ID of the current request."""
+
+    def filter(self, record):
+        record.request_id = request_id_var.get()
+        return True
+
+class JsonFormatter(logging.Formatter):
+    """Format records as single-line JSON objects, including any `extra` fields."""
+
+    def format(self, record):
+        entry = {
+            "ts": round(record.created, 3),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+def configure_logging(log_file=None):
+    """
+    Route all logging through a queue to a background thread that writes to
+    stdout and, if given, a size-rotated log file, so a log call only costs
+    the caller a queue put.
+
+    Safe to call more than once; only the first call configures logging.
+
+    Args:
+        log_file (str): Path of the rotating log file, or None for stdout only.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    formatter = JsonFormatter() if LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT)
+    handlers = [logging.StreamHandler(sys.stdout)]
+    if log_file:
+        handlers.append(RotatingFileHandler(log_file, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT,
+                                            encoding='utf-8'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = QueueHandler(log_queue)
+    # The filter runs on the caller's thread, where the request's ID is set
+    queue_handler.addFilter(RequestIdFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(LOG_LEVEL)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+def new_request_id(incoming=None):
+    """
+    Set and return the correlation ID for the current request: the client's
+    X-Request-ID when it looks sane, otherwise a new random one.
+    """
+    if incoming and len(incoming) <= 64 and incoming.isascii() and incoming.replace("-", "").replace("_", "").isalnum():
+        request_id = incoming
+    else:
+        request_id = uuid.uuid4().hex
+    request_id_var.set(request_id)
+    return request_id
+
+def truncate(value, limit=LOG_PAYLOAD_CHARS):
+    """
+    Return value as text cut to limit characters, noting how much was dropped.
+    """
+    text = value if isinstance(value, str) else json.dumps(value, ensure_ascii=False, default=str)
+    if len(text) <= limit:
+        return text
+    return f"{text[:limit]}... ({len(text) - limit} more chars)"
+
+def log_payload(logger, label, payload, sample_rate=None):
+    """
+    Log a request body or model response for a sample of calls, truncated, so
+    the cost per call stays constant whatever the payload size.
+    """
+    rate = LOG_PAYLOAD_SAMPLE_RATE if sample_rate is None else sample_rate
+    if rate <= 0 or (rate < 1 and random.random() >= rate) or not logger.isEnabledFor(logging.INFO):
+        return
+    text = truncate(payload)
+    logger.info(f"{label}: {text}", extra={"payload": label, "sample_rate": rate})
@@ -0,0 +1,385 @@
+import sys
+import time
+import logging
+import threading
+from bisect import bisect_left
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from cache hits up to scrape + LLM round trips
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+
+# Endpoints with request metrics; other paths are not recorded so the
+# label set stays bounded whatever URLs clients send
+INSTRUMENTED_ENDPOINTS = frozenset({
+    '/api/scrape', '/api/compare', '/api/process-cv', '/api/analyze-resume'
+})
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _format_labels(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value):
+    if value == float('inf'):
+        return "+Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return repr(value) if isinstance(value, float) else str(value)
+
+class _Child:
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount=1):
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value):
+        self.value = value
+
+class _HistogramChild:
+    __slots__ = ('buckets', 'counts', 'sum', '_lock')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        # One slot per bucket plus +Inf; made cumulative when rendered
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def time(self):
+        return _Timer(self)
+
+class _Timer:
+    """Context manager that observes the seconds spent in its block."""
+    __slots__ = ('_child', '_start')
+
+    def __init__(self, child):
+        self._child = child
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._child.observe(time.perf_counter() - self._start)
+        return False
+
+class Metric:
+    """
+    A named metric with a fixed set of label names. labels() returns the
+    child holding the value for one combination of label values; children
+    are created on first use and kept for the life of the process.
+    """
+    type = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        child = self._children.get(values)
+        if child is None:
+            with self._lock:
+                child = self._children.get(values)
+                if child is None:
+                    child = self._children[values] = self._new_child()
+        return child
+
+    def _new_child(self):
+        return _Child()
+
+    def samples(self):
+        """Yield (suffix, label string, value) for every sample of this metric."""
+        for values, child in list(self._children.items()):
+            yield "", _format_labels(self.labelnames, values), child.value
+
+class Counter(Metric):
+    type = "counter"
+
+class Gauge(Metric):
+    type = "gauge"
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def samples(self):
+        for values, child in list(self._children.items()):
+            with child._lock:
+                counts = list(child.counts)
+                total = child.sum
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += count
+                yield "_bucket", _format_labels(self.labelnames, values, f'le="{_format_value(bound)}"'), cumulative
+            yield "_sum", _format_labels(self.labelnames, values), total
+            yield "_count", _format_labels(self.labelnames, values), cumulative
+
+class MetricsRegistry:
+    """
+    In-process registry of counters, gauges and histograms, rendered in the
+    Prometheus text exposition format.
+
+    Values are per process: under gunicorn or uvicorn with several workers,
+    each scrape of /api/metrics reports the worker that served it.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def _register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name, documentation, labelnames=()):
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector):
+        """
+        Add a function called on every render that returns a list of
+        (name, type, documentation, [(labels dict, value), ...]) for values
+        that live elsewhere, such as cache statistics.
+        """
+        self._collectors.append(collector)
+
+    def render(self):
+        """
+        Return every metric in the Prometheus text exposition format.
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.type}")
+            for suffix, labels, value in metric.samples():
+                lines.append(f"{metric.name}{suffix}{labels} {_format_value(value)}")
+        for collector in self._collectors:
+            try:
+                families = collector()
+            except Exception as e:
+                logger.warning(f"Metrics collector {getattr(collector, '__name__', collector)} failed: {e}")
+                continue
+            for name, metric_type, documentation, samples in families:
+                lines.append(f"# HELP {name} {documentation}")
+                lines.append(f"# TYPE {name} {metric_type}")
+                for labels, value in samples:
+                    label_string = _format_labels(labels.keys(), labels.values())
+                    lines.append(f"{name}{label_string} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+REQUESTS = registry.counter(
+    "http_requests_total", "Requests handled, by endpoint and status code.", ("endpoint", "status"))
+REQUEST_ERRORS = registry.counter(
+    "http_request_errors_total", "Requests answered with a 4xx or 5xx status, by endpoint and status code.",
+    ("endpoint", "status"))
+REQUEST_SECONDS = registry.histogram(
+    "http_request_duration_seconds", "Time from receiving a request to sending the last byte of its response.",
+    ("endpoint",))
+IN_FLIGHT = registry.gauge(
+    "http_requests_in_flight", "Requests currently being handled, by endpoint.", ("endpoint",))
+STAGE_SECONDS = registry.histogram(
+    "stage_duration_seconds", "Time spent in each processing stage: scrape, text_extraction, prompt_build, llm_call.",
+    ("stage",))
+
+def time_stage(stage):
+    """
+    Return a context manager that records the duration of its block in the
+    stage histogram. Works around awaits as well as blocking calls.
+
+    Args:
+        stage (str): Stage name, e.g. 'scrape' or 'llm_call'.
+    """
+    return STAGE_SECONDS.labels(stage).time()
+
+def timed_stage(stage):
+    """
+    Decorator form of time_stage() for synchronous functions.
+    """
+    def decorator(fn):
+        child = STAGE_SECONDS.labels(stage)
+
+        def wrapper(*args, **kwargs):
+            with child.time():
+                return fn(*args, **kwargs)
+        wrapper.__name__ = fn.__name__
+        wrapper.__doc__ = fn.__doc__
+        wrapper.__wrapped__ = fn
+        return wrapper
+    return decorator
+
+def start_request(endpoint):
+    """
+    Count a request as in flight.
+
+    Returns:
+        float: The start time to pass to finish_request, or None when the
+        endpoint is not instrumented.
+    """
+    if endpoint not in INSTRUMENTED_ENDPOINTS:
+        return None
+    IN_FLIGHT.labels(endpoint).inc()
+    return time.perf_counter()
+
+def finish_request(endpoint, status, start):
+    """
+    Record the outcome and latency of a request started with start_request.
+    """
+    if start is None:
+        return
+    IN_FLIGHT.labels(endpoint).dec()
+    REQUEST_SECONDS.labels(endpoint).observe(time.perf_counter() - start)
+    REQUESTS.labels(endpoint, str(status)).inc()
+    if int(status) >= 400:
+        REQUEST_ERRORS.labels(endpoint, str(status)).inc()
+
+class _ClosingIterable:
+    """Response body that records the request once the server has sent it all."""
+
+    def __init__(self, body, on_close):
+        self._body = body
+        self._on_close = on_close
+
+    def __iter__(self):
+        return iter(self._body)
+
+    def close(self):
+        try:
+            if hasattr(self._body, 'close'):
+                self._body.close()
+        finally:
+            self._on_close()
+
+class WsgiMetricsMiddleware:
+    """
+    WSGI middleware recording request metrics for INSTRUMENTED_ENDPOINTS.
+    Latency runs until the server closes the response, so streamed bodies
+    are measured to their last chunk.
+    """
+
+    def __init__(self, wsgi_app):
+        self.wsgi_app = wsgi_app
+
+    def __call__(self, environ, start_response):
+        endpoint = environ.get('PATH_INFO', '')
+        start = start_request(endpoint)
+        if start is None:
+            return self.wsgi_app(environ, start_response)
+
+        status = ["500"]
+
+        def recording_start_response(status_line, headers, exc_info=None):
+            status[0] = status_line.split(" ", 1)[0]
+            return start_response(status_line, headers, exc_info)
+
+        try:
+            body = self.wsgi_app(environ, recording_start_response)
+        except BaseException:
+            finish_request(endpoint, "500", start)
+            raise
+        return _ClosingIterable(body, lambda: finish_request(endpoint, status[0], start))
+
+class AsgiMetricsMiddleware:
+    """
+    ASGI middleware recording request metrics for INSTRUMENTED_ENDPOINTS,
+    measured until the last body chunk is sent.
+    """
+
+    def __init__(self, asgi_app):
+        self.asgi_app = asgi_app
+
+    async def __call__(self, scope, receive, send):
+        endpoint = scope.get('path', '') if scope['type'] == 'http' else ''
+        start = start_request(endpoint)
+        if start is None:
+            return await self.asgi_app(scope, receive, send)
+
+        state = {"status": "500", "done": False}
+
+        async def recording_send(message):
+            if message['type'] == 'http.response.start':
+                state["status"] = str(message['status'])
+            await send(message)
+            if message['type'] == 'http.response.body' and not message.get('more_body', False):
+                state["done"] = True
+                finish_request(endpoint, state["status"], start)
+
+        try:
+            await self.asgi_app(scope, receive, recording_send)
+        finally:
+            if not state["done"]:
+                # Failed or disconnected before the response completed
+                finish_request(endpoint, state["status"], start)
+
+def _cache_families(caches):
+    """Turn {cache name: (hits, misses, entries)} into collector families."""
+    hits = [({"cache": name}, values[0]) for name, values in caches.items()]
+    misses = [({"cache": name}, values[1]) for name, values in caches.items()]
+    entries = [({"cache": name}, values[2]) for name, values in caches.items()]
+    ratios = [({"cache": name}, values[0] / (values[0] + values[1]) if values[0] + values[1] else 0.0)
+              for name, values in caches.items()]
+    return [
+        ("cache_hits_total", "counter", "Cache lookups that found an entry.", hits),
+        ("cache_misses_total", "counter", "Cache lookups that found nothing.", misses),
+        ("cache_entries", "gauge", "Entries currently held by each cache.", entries),
+        ("cache_hit_ratio", "gauge", "Share of lookups that were hits since the process started.", ratios)
+    ]
+
+def collect_cache_metrics():
+    """
+    Collector for the caches of the modules this process has loaded: the
+    resume cache (CV), the job description profile cache and the WordNet
+    expansion memo (new). Modules that are not imported yet are skipped
+    rather than imported, so a scrape never pays for loading NLTK.
+    """
+    caches = {}
+    cv = sys.modules.get('CV')
+    if cv is not None:
+        stats = cv.resume_cache.stats()
+        caches["resume"] = (stats["hits"], stats["misses"], stats["entries"])
+    new = sys.modules.get('new')
+    if new is not None:
+        stats = new.job_profile_cache.stats()
+        caches["job_profile"] = (stats["hits"], stats["misses"], stats["entries"])
+        info = new.expand_keyword.cache_info()
+        caches["keyword_expansion"] = (info.hits, info.misses, info.currsize)
+    return _cache_families(caches)
+
+registry.register_collector(collect_cache_metrics)
@@ -4,11 +4,22 @@ import os
 from docx import Document
 from pdfminer.high_level import extract_text as extract_pdf_text
 from collections import Counter
+import time
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from functools import lru_cache
 import nltk
 from nltk.corpus import wordnet
 from nltk.tokenize import word_tokenize
 from nltk.stem import WordNetLemmatizer
 
+from synonym_index import SynonymIndex, SynonymIndexError, DEFAULT_INDEX_PATH
+from skill_phrases import match_skill_phrases, get_automaton
+
+logger = logging.getLogger(__name__)
+
 # Download required NLTK data
 try:
     nltk.data.find('tokenizers/punkt')
@@ -20,6 +31,17 @@ except LookupError:
     nltk.download('punkt_tab')
     nltk.download('averaged_perceptron_tagger_eng')
 
+# Common filler words that carry no signal when reporting keyword gaps
+STOPWORDS = frozenset("""
+a about above after again all also an and any are as at be because been being below
+between both but by can could did do does doing during each etc few for from further
+had has have having he her here hers him his how i if in into is it its itself just
+may more most must no nor not now of off on once only or other our ours out over own
+per same she should so some such than that the their theirs them then there these
+they this those through to too under until up using very via was we well were what
+when where which while who whom why will with within without would you your yours
+""".split())
+
 def extract_text_from_file(file_path):
     """
     Extract text from PDF, DOCX, or TXT file.
@@ -42,50 +64,202 @@ def extract_text_from_docx(file_path):
     doc = Document(file_path)
     return '\n'.join([para.text for para in doc.paragraphs])
 
+# Upper bound on memoized (word, POS) expansions kept per process
+KEYWORD_CACHE_SIZE = int(os.getenv("KEYWORD_CACHE_SIZE", "50000"))
+# Job descriptions whose extracted keywords are kept per process
+JOB_PROFILE_CACHE_SIZE = int(os.getenv("JOB_PROFILE_CACHE_SIZE", "256"))
+
+_lemmatizer = WordNetLemmatizer()
+
+_synonym_index = None
+_synonym_index_loaded = False
+
+def get_synonym_index():
+    """
+    Return the precompiled synonym index (see synonym_index.py), mapping it on
+    first use. Returns None when the index has not been built, in which case
+    keywords are expanded with live WordNet lookups.
+    """
+    global _synonym_index, _synonym_index_loaded
+    if not _synonym_index_loaded:
+        _synonym_index_loaded = True
+        try:
+            _synonym_index = SynonymIndex(DEFAULT_INDEX_PATH)
+        except SynonymIndexError as e:
+            logger.info(f"{e}. Falling back to live WordNet lookups "
+                        f"(run 'python synonym_index.py build' to create the index)")
+    return _synonym_index
+
+def wordnet_pos_from_tag(tag):
+    """
+    Map a Penn Treebank POS tag to the WordNet POS lemmatize() accepts
+    """
+    # Same values as wordnet.ADJ/NOUN/VERB/ADV, which would load the WordNet corpus
+    tag_dict = {"J": "a",
+                "N": "n",
+                "V": "v",
+                "R": "r"}
+    return tag_dict.get(tag[:1].upper(), "n")
+
 def get_wordnet_pos(word):
     """
     Map POS tag to first character lemmatize() accepts
     """
-    tag = nltk.pos_tag([word])[0][1][0].upper()
-    tag_dict = {"J": wordnet.ADJ,
-                "N": wordnet.NOUN,
-                "V": wordnet.VERB,
-                "R": wordnet.ADV}
-    return tag_dict.get(tag, wordnet.NOUN)
+    return wordnet_pos_from_tag(nltk.pos_tag([word])[0][1])
+
+@lru_cache(maxsize=KEYWORD_CACHE_SIZE)
+def expand_keyword(word, pos):
+    """
+    Return the lemma of a word and the names of all lemmas in its synsets.
+    Memoized per (word, POS), so repeated words only hit WordNet once.
+    """
+    index = get_synonym_index()
+    if index is not None:
+        return index.expand(word, pos)
+
+    lemma = _lemmatizer.lemmatize(word, pos)
+    synonyms = tuple(
+        syn_lemma.name().lower()
+        for syn in wordnet.synsets(word)
+        for syn_lemma in syn.lemmas()
+    )
+    return lemma, synonyms
+
+def warm_up():
+    """
+    Load the tokenizer, the POS tagger, the synonym index (or the WordNet
+    corpus when no index is built) and the skill phrase automaton so the first
+    extract_keywords call does not pay for them.
+
+    Returns:
+        dict: Seconds spent on each step, or the error message for steps that failed.
+    """
+    timings = {}
+    steps = (
+        ("tokenizer", lambda: word_tokenize("warm up")),
+        ("tagger", lambda: nltk.pos_tag(["warm"])),
+        ("synonyms", lambda: get_synonym_index() or wordnet.ensure_loaded()),
+        ("skill_phrases", get_automaton)
+    )
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            step()
+            timings[name] = round(time.perf_counter() - start, 4)
+        except Exception as e:
+            logger.warning(f"Warm-up of {name} failed: {e}")
+            timings[name] = f"error: {e}"
+    return timings
 
 def extract_keywords(text):
     """
     Extract and process keywords from text using NLP techniques.
     Returns a Counter object with keyword frequencies and their variations.
     """
-    # Initialize lemmatizer
-    lemmatizer = WordNetLemmatizer()
-    
     # Tokenize and clean text
     words = word_tokenize(text.lower())
     words = [word for word in words if word.isalnum()]
-    
-    # Lemmatize words and get their variations
+
+    # Tag the whole token list at once, so the tagger runs once with sentence context
+    tagged = Counter((word, wordnet_pos_from_tag(tag)) for word, tag in nltk.pos_tag(words))
+
+    # Lemmatize each distinct (word, POS) once and weight it by its frequency
     processed_keywords = Counter()
-    for word in words:
-        # Get base form of word
-        lemma = lemmatizer.lemmatize(word, get_wordnet_pos(word))
-        processed_keywords[lemma] += 1
-        
-        # Get synonyms
-        for syn in wordnet.synsets(word):
-            for lemma in syn.lemmas():
-                processed_keywords[lemma.name().lower()] += 0.5  # Weight synonyms lower
-    
+    for (word, pos), count in tagged.items():
+        lemma, synonyms = expand_keyword(word, pos)
+        processed_keywords[lemma] += count
+
+        for synonym in synonyms:
+            processed_keywords[synonym] += 0.5 * count  # Weight synonyms lower
+
+    # Multi-word and symbolic skills ("machine learning", "node.js", "c++") that
+    # tokenizing splits or drops, counted like any other keyword occurrence
+    processed_keywords.update(match_skill_phrases(text))
+
     return processed_keywords
 
-def compute_ats_score(resume_text, job_description_text):
+def normalize_job_description(text):
     """
-    Compute ATS score based on keyword matches with weighted scoring.
+    Lower-case a job description and collapse its whitespace. Texts that
+    normalize the same extract to the same keywords.
     """
-    resume_keywords = extract_keywords(resume_text)
-    job_keywords = extract_keywords(job_description_text)
+    return " ".join(text.lower().split())
 
+class JobProfile:
+    """
+    The keywords of one job description, extracted once and reused for every
+    resume scored against it. The keywords Counter is shared between callers
+    and must not be modified.
+    """
+
+    def __init__(self, key, keywords):
+        self.key = key
+        self.keywords = keywords
+        self.total_weight = sum(keywords.values())
+
+class JobProfileCache:
+    """
+    LRU cache of JobProfiles keyed by the SHA-256 of the normalized job description text.
+    """
+
+    def __init__(self, max_entries=JOB_PROFILE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, text):
+        """
+        Return the profile of a job description, extracting its keywords on a miss.
+        """
+        normalized = normalize_job_description(text)
+        key = hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+        with self._lock:
+            profile = self._profiles.get(key)
+            if profile is not None:
+                self._profiles.move_to_end(key)
+                self.hits += 1
+                return profile
+            self.misses += 1
+
+        # Extract outside the lock; two threads missing on the same text both
+        # compute it and the second simply replaces the first
+        profile = JobProfile(key, extract_keywords(normalized))
+        with self._lock:
+            self._profiles[key] = profile
+            self._profiles.move_to_end(key)
+            while len(self._profiles) > self.max_entries:
+                self._profiles.popitem(last=False)
+        return profile
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._profiles),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+
+job_profile_cache = JobProfileCache()
+
+def get_job_profile(job_description_text):
+    """
+    Return the cached keyword profile of a job description.
+    """
+    return job_profile_cache.get(job_description_text)
+
+def score_keywords(resume_keywords, job_keywords):
+    """
+    Score already-extracted resume keywords against already-extracted job keywords.
+    Returns the ATS score as a percentage and the set of matched keywords.
+    """
     if not job_keywords:
         raise ValueError("Job description has no valid keywords.")
 
@@ -108,34 +282,65 @@ def compute_ats_score(resume_text, job_description_text):
     
     return ats_score, matched_keywords
 
+def compute_ats_score(resume_text, job_description_text):
+    """
+    Compute ATS score based on keyword matches with weighted scoring.
+    """
+    resume_keywords = extract_keywords(resume_text)
+    job_keywords = get_job_profile(job_description_text).keywords
+    return score_keywords(resume_keywords, job_keywords)
+
+def keyword_gap(resume_keywords, job_keywords, limit=20):
+    """
+    Split the job description's keywords into those present in and missing from the resume.
+    Keywords are ranked by their weight in the job description; filler words are skipped.
+    """
+    ranked = sorted(
+        (kw for kw, weight in job_keywords.items()
+         if weight >= 1 and len(kw) > 2 and not kw.isdigit() and kw not in STOPWORDS),
+        key=lambda kw: (-job_keywords[kw], kw)
+    )
+    present = [kw for kw in ranked if kw in resume_keywords]
+    missing = [kw for kw in ranked if kw not in resume_keywords]
+    return present[:limit], missing[:limit]
+
 def main():
-    parser = argparse.ArgumentParser(description="ATS Resume Score (file resume + text job description)")
-    parser.add_argument('--resume', required=True, help="Path to resume file (.pdf, .docx, or .txt)")
+    parser = argparse.ArgumentParser(description="ATS Resume Score (file resumes + text job description)")
+    parser.add_argument('--resume', required=True, nargs='+', help="Path to one or more resume files (.pdf, .docx, or .txt)")
+    parser.add_argument('--jd', help="Path to a text file with the job description (prompted for if omitted)")
     args = parser.parse_args()
 
-    try:
-        resume_text = extract_text_from_file(args.resume)
-    except Exception as e:
-        print(f"\n❌ Error reading resume file: {e}")
-        return
-
-    print("\n📋 Paste the job description below (end with an empty line):")
-    job_lines = []
-    while True:
-        line = input()
-        if line.strip() == "":
-            break
-        job_lines.append(line)
-    job_description_text = '\n'.join(job_lines)
-
-    try:
-        score, matched_keywords = compute_ats_score(resume_text, job_description_text)
-        print(f"\n✅ ATS Score: {score:.2f}%")
-        print("\n🔍 Matched Keywords:")
-        for keyword in sorted(matched_keywords):
-            print(f"- {keyword}")
-    except Exception as e:
-        print(f"\n❌ Error computing ATS score: {e}")
+    if args.jd:
+        with open(args.jd, 'r', encoding='utf-8') as f:
+            job_description_text = f.read()
+    else:
+        print("\n📋 Paste the job description below (end with an empty line):")
+        job_lines = []
+        while True:
+            line = input()
+            if line.strip() == "":
+                break
+            job_lines.append(line)
+        job_description_text = '\n'.join(job_lines)
+
+    # The job description's keywords are extracted once and reused for every resume
+    for resume_path in args.resume:
+        if len(args.resume) > 1:
+            print(f"\n📄 {resume_path}")
+        try:
+            resume_text = extract_text_from_file(resume_path)
+        except Exception as e:
+            print(f"\n❌ Error reading resume file: {e}")
+            continue
+
+        try:
+            score, matched_keywords = compute_ats_score(resume_text, job_description_text)
+            print(f"\n✅ ATS Score: {score:.2f}%")
+            print("\n🔍 Matched Keywords:")
+            for keyword in sorted(matched_keywords):
+                print(f"- {keyword}")
+        except Exception as e:
+            print(f"\n❌ Error computing ATS score: {e}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,234 @@
+import os
+import re
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+# The disk tier's size is tracked as entries are written and only re-read
+# from the directory when it passes the budget, or after this many writes
+# to pick up entries written by other worker processes
+DISK_RESYNC_WRITES = 256
+
+# Every cache key is a SHA-256 hex digest. Keys also name the disk tier's
+# files, so anything else (such as a client's resume_hash of "../x") is refused
+_KEY_PATTERN = re.compile(r'[0-9a-f]{64}')
+
+def is_resume_hash(value):
+    """
+    Return True when value has the form of a cache key: a lowercase SHA-256 hex digest.
+    """
+    return isinstance(value, str) and _KEY_PATTERN.fullmatch(value) is not None
+
+def hash_bytes(data):
+    """
+    Return the SHA-256 hex digest used as the cache key for an uploaded file.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+def hash_file(file_path, chunk_size=1024 * 1024):
+    """
+    Return the SHA-256 hex digest of a file's contents.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def hash_stream(stream, chunk_size=1024 * 1024):
+    """
+    Return the SHA-256 hex digest of a seekable binary stream, leaving it rewound.
+    """
+    digest = hashlib.sha256()
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(chunk_size), b''):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+def _entry_size(entry):
+    # Approximate the memory held by an entry by the size of its JSON encoding
+    return len(json.dumps(entry, ensure_ascii=False).encode('utf-8'))
+
+class ResumeCache:
+    """
+    Size-bounded LRU cache of extracted resume text and parsed resume data,
+    keyed by the SHA-256 of the uploaded file.
+
+    Entries live in memory and, when a directory is given, in an on-disk tier
+    of one JSON file per hash that survives restarts and is shared between
+    worker processes. Each tier evicts least recently used entries once its
+    byte budget is exceeded; both keep a running total, so a write does not
+    rescan the directory. Entries written by a different parser version
+    are treated as misses.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, disk_dir=None, max_disk_bytes=512 * 1024 * 1024, version=1):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max_disk_bytes
+        self.version = version
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        # Running size of the disk tier; None until the directory is first scanned
+        self._disk_bytes = None
+        self._disk_writes = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+
+    def get(self, key):
+        """
+        Return the cached entry for a hash, or None. Keys that are not
+        SHA-256 hex digests are never looked up.
+        """
+        if not is_resume_hash(key):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        entry = self._read_disk(key)
+        if entry is not None:
+            self._store_memory(key, entry)
+            with self._lock:
+                self.hits += 1
+                self.disk_hits += 1
+            return entry
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key, entry):
+        """
+        Store an entry (a JSON-serializable dict) under a hash.
+
+        Raises:
+            ValueError: If the key is not a SHA-256 hex digest.
+        """
+        if not is_resume_hash(key):
+            raise ValueError(f"Invalid resume cache key: {key!r}")
+        self._store_memory(key, entry)
+        self._write_disk(key, entry)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._bytes = 0
+
+    def _store_memory(self, key, entry):
+        size = _entry_size(entry)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._sizes[key]
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            self._sizes[key] = size
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                old_key, _ = self._entries.popitem(last=False)
+                self._bytes -= self._sizes.pop(old_key)
+
+    def _disk_path(self, key):
+        if not is_resume_hash(key):
+            raise ValueError(f"Invalid resume cache key: {key!r}")
+        return os.path.join(self.disk_dir, f"{key}.json")
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if record.get("version") != self.version:
+            return None
+        try:
+            # Touch the file so disk eviction follows recency of use
+            os.utime(path)
+        except OSError:
+            pass
+        return record["entry"]
+
+    def _write_disk(self, key, entry):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            data = json.dumps({"version": self.version, "entry": entry}, ensure_ascii=False).encode('utf-8')
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            size = len(data)
+            try:
+                replaced = os.stat(path).st_size
+            except OSError:
+                replaced = 0
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write resume cache entry {key}: {e}")
+            return
+        with self._lock:
+            self._disk_writes += 1
+            if self._disk_bytes is not None:
+                self._disk_bytes += size - replaced
+            rescan = (self._disk_bytes is None or self._disk_bytes > self.max_disk_bytes
+                      or self._disk_writes % DISK_RESYNC_WRITES == 0)
+        if rescan:
+            self._evict_disk()
+
+    def _evict_disk(self):
+        files = []
+        total = 0
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith('.json'):
+                continue
+            path = os.path.join(self.disk_dir, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            files.append((st.st_mtime, st.st_size, path))
+            total += st.st_size
+        if total > self.max_disk_bytes:
+            for _, size, path in sorted(files):
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                if total <= self.max_disk_bytes:
+                    break
+        with self._lock:
+            self._disk_bytes = total
@@ -0,0 +1,299 @@
+import os
+import sys
+import json
+import math
+import heapq
+import time
+import argparse
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes
+INDEX_VERSION = 1
+DEFAULT_INDEX_PATH = os.getenv(
+    "RESUME_INDEX_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "resume_index.json")
+)
+
+SEARCH_METHODS = ("bm25", "weighted")
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+class ResumeIndex:
+    """
+    Inverted index over the keyword Counters extract_keywords produces for
+    stored resumes, for top-k retrieval against a job description.
+
+    Each keyword maps to a postings dict of {resume id: keyword weight}.
+    Document lengths (total keyword weight) and the largest weight in every
+    postings list are kept alongside, so a query only touches the postings
+    of the job's keywords and can stop admitting new candidates once the
+    keywords left to process cannot lift an unseen resume into the top k.
+    Resumes can be added, replaced and removed one at a time; each resume's
+    terms are remembered, so removing it only touches its own postings.
+    """
+
+    def __init__(self):
+        self.postings = {}
+        self.max_weights = {}
+        self.documents = {}
+        self.total_length = 0.0
+        # Resume id -> length, kept flat because BM25 reads it for every posting
+        self._lengths = {}
+        # Resume id -> the terms it has postings under, so remove() skips the rest of the vocabulary
+        self._terms = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.documents)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.documents
+
+    def add(self, doc_id, keywords, label=None):
+        """
+        Index a resume's keyword Counter under an id, replacing any earlier version.
+        """
+        with self._lock:
+            if doc_id in self.documents:
+                self.remove(doc_id)
+            length = 0.0
+            terms = []
+            for term, weight in keywords.items():
+                if weight <= 0:
+                    continue
+                self.postings.setdefault(term, {})[doc_id] = weight
+                if weight > self.max_weights.get(term, 0):
+                    self.max_weights[term] = weight
+                length += weight
+                terms.append(term)
+            self.documents[doc_id] = {"label": label or doc_id, "length": length}
+            self._lengths[doc_id] = length
+            self._terms[doc_id] = terms
+            self.total_length += length
+
+    def remove(self, doc_id):
+        """
+        Drop a resume from the index. Returns False if it was not indexed.
+        """
+        with self._lock:
+            document = self.documents.pop(doc_id, None)
+            if document is None:
+                return False
+            self.total_length -= document["length"]
+            del self._lengths[doc_id]
+            for term in self._terms.pop(doc_id):
+                postings = self.postings[term]
+                weight = postings.pop(doc_id)
+                if not postings:
+                    del self.postings[term]
+                    del self.max_weights[term]
+                elif weight >= self.max_weights[term]:
+                    self.max_weights[term] = max(postings.values())
+            return True
+
+    def _term_scorers(self, job_keywords, method):
+        """
+        Return (term, per-posting score function, upper bound) for every job
+        keyword that has postings, highest upper bound first.
+        """
+        n_docs = len(self.documents)
+        avg_length = self.total_length / n_docs if n_docs else 0.0
+        scorers = []
+        for term, weight in job_keywords.items():
+            postings = self.postings.get(term)
+            if not postings or weight <= 0:
+                continue
+            if method == "weighted":
+                # new.score_keywords: min(resume weight, job weight) * job weight
+                def score(doc_id, tf, weight=weight):
+                    return min(tf, weight) * weight
+                bound = min(self.max_weights[term], weight) * weight
+            else:
+                df = len(postings)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                factor = weight * idf * (BM25_K1 + 1)
+                base = BM25_K1 * (1 - BM25_B)
+                slope = BM25_K1 * BM25_B / avg_length if avg_length else 0.0
+                def score(doc_id, tf, factor=factor, base=base, slope=slope, lengths=self._lengths):
+                    return factor * tf / (tf + base + slope * lengths[doc_id])
+                bound = factor
+            scorers.append((term, score, bound))
+        scorers.sort(key=lambda scorer: -scorer[2])
+        return scorers
+
+    def search(self, job_keywords, k=10, method="bm25"):
+        """
+        Return the k indexed resumes that best match already-extracted job keywords.
+
+        Args:
+            job_keywords (Counter): Keyword weights of the job description.
+            k (int): Number of results.
+            method (str): 'bm25', or 'weighted' for the ATS score formula of
+                new.score_keywords (reported as a percentage).
+
+        Returns:
+            list: Dicts with the resume id, label, score and matched keywords, best first.
+        """
+        if method not in SEARCH_METHODS:
+            raise ValueError(f"Unknown search method: {method}")
+        if not job_keywords:
+            raise ValueError("Job description has no valid keywords.")
+
+        with self._lock:
+            scorers = self._term_scorers(job_keywords, method)
+            remaining = [0.0] * (len(scorers) + 1)
+            for i in range(len(scorers) - 1, -1, -1):
+                remaining[i] = remaining[i + 1] + scorers[i][2]
+
+            accumulators = {}
+            candidates_only = False
+            for i, (term, score, _) in enumerate(scorers):
+                postings = self.postings[term]
+                if not candidates_only and len(accumulators) >= k > 0:
+                    # Once the k-th best partial score reaches what the remaining
+                    # keywords could add, no unseen resume can make the top k
+                    candidates_only = heapq.nlargest(k, accumulators.values())[-1] >= remaining[i]
+                if not candidates_only:
+                    for doc_id, tf in postings.items():
+                        accumulators[doc_id] = accumulators.get(doc_id, 0.0) + score(doc_id, tf)
+                elif len(postings) < len(accumulators):
+                    for doc_id, tf in postings.items():
+                        if doc_id in accumulators:
+                            accumulators[doc_id] += score(doc_id, tf)
+                else:
+                    for doc_id in accumulators:
+                        tf = postings.get(doc_id)
+                        if tf is not None:
+                            accumulators[doc_id] += score(doc_id, tf)
+
+            best = heapq.nlargest(k, accumulators.items(), key=lambda item: (item[1], item[0]))
+            total_possible_score = sum(job_keywords.values())
+            results = []
+            for doc_id, value in best:
+                if method == "weighted":
+                    value = value / total_possible_score * 100 if total_possible_score > 0 else 0.0
+                results.append({
+                    "id": doc_id,
+                    "label": self.documents[doc_id]["label"],
+                    "score": round(value, 4),
+                    "matched_keywords": sorted(term for term, _, _ in scorers if doc_id in self.postings[term])
+                })
+            return results
+
+    def stats(self):
+        with self._lock:
+            return {
+                "documents": len(self.documents),
+                "terms": len(self.postings),
+                "postings": sum(len(postings) for postings in self.postings.values()),
+                "average_length": self.total_length / len(self.documents) if self.documents else 0.0
+            }
+
+    def save(self, path=DEFAULT_INDEX_PATH):
+        """
+        Write the index to a JSON file, replacing it atomically.
+        """
+        with self._lock:
+            data = {"version": INDEX_VERSION, "documents": self.documents, "postings": self.postings}
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=DEFAULT_INDEX_PATH):
+        """
+        Read an index written by save(). A missing file gives an empty index.
+        """
+        index = cls()
+        if not os.path.exists(path):
+            return index
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get("version") != INDEX_VERSION:
+            raise ValueError(f"Resume index {path} has version {data.get('version')}, expected {INDEX_VERSION}. Rebuild it")
+        index.documents = data["documents"]
+        index.postings = data["postings"]
+        index.max_weights = {term: max(postings.values()) for term, postings in index.postings.items()}
+        index._lengths = {doc_id: document["length"] for doc_id, document in index.documents.items()}
+        index._terms = {doc_id: [] for doc_id in index.documents}
+        for term, postings in index.postings.items():
+            for doc_id in postings:
+                index._terms[doc_id].append(term)
+        index.total_length = sum(index._lengths.values())
+        return index
+
+def index_resume_files(index, paths):
+    """
+    Extract, hash and index resume files, keyed by the same SHA-256 hash the
+    resume cache and /api/process-cv use. Returns the number indexed.
+    """
+    from CV import extract_text_from_resume
+    from new import extract_keywords
+    from resume_cache import hash_file
+
+    indexed = 0
+    for path in paths:
+        text = extract_text_from_resume(path)
+        if text.startswith("Error") or text.startswith("Unsupported"):
+            print(f"  skipped {path}: {text}")
+            continue
+        index.add(hash_file(path), extract_keywords(text), label=path)
+        indexed += 1
+    return indexed
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query an inverted index of stored resumes")
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH, help="Index file (default: %(default)s)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    add_parser = subparsers.add_parser("add", help="Index resume files or directories of resumes")
+    add_parser.add_argument('paths', nargs='+')
+
+    remove_parser = subparsers.add_parser("remove", help="Remove resumes by id (resume hash)")
+    remove_parser.add_argument('ids', nargs='+')
+
+    search_parser = subparsers.add_parser("search", help="Find the resumes that best match a job description")
+    search_parser.add_argument('--jd', required=True, help="Path to a text file with the job description")
+    search_parser.add_argument('--top', type=int, default=10)
+    search_parser.add_argument('--method', choices=SEARCH_METHODS, default="bm25")
+
+    subparsers.add_parser("info", help="Show index statistics")
+    args = parser.parse_args()
+
+    index = ResumeIndex.load(args.index)
+
+    if args.command == "add":
+        from batch_ingest import find_resumes
+        paths = []
+        for path in args.paths:
+            paths.extend(find_resumes(path) if os.path.isdir(path) else [path])
+        indexed = index_resume_files(index, paths)
+        index.save(args.index)
+        print(f"\n✅ Indexed {indexed} resumes ({len(index)} in {args.index})")
+    elif args.command == "remove":
+        removed = sum(index.remove(doc_id) for doc_id in args.ids)
+        index.save(args.index)
+        print(f"\n✅ Removed {removed} resumes ({len(index)} left)")
+    elif args.command == "search":
+        from new import get_job_profile
+        with open(args.jd, 'r', encoding='utf-8') as f:
+            job_keywords = get_job_profile(f.read()).keywords
+        start = time.perf_counter()
+        try:
+            results = index.search(job_keywords, args.top, args.method)
+        except ValueError as e:
+            print(f"\n❌ {e}")
+            sys.exit(1)
+        print(f"\n✅ Searched {len(index)} resumes in {(time.perf_counter() - start) * 1000:.1f} ms")
+        for rank, result in enumerate(results, 1):
+            print(f"\n{rank}. {result['label']} ({result['id'][:12]}): {result['score']:.2f}")
+            print(f"   Matched: {', '.join(result['matched_keywords'][:15])}")
+    else:
+        print(json.dumps(index.stats(), indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,286 @@
+import os
+import json
+import logging
+import threading
+from collections import Counter, deque
+
+logger = logging.getLogger(__name__)
+
+# Optional JSON file of {"canonical skill": ["alias", ...]} merged over SKILL_PHRASES
+SKILL_PHRASES_PATH = os.getenv("SKILL_PHRASES_PATH")
+
+# Skills that word_tokenize splits apart or extract_keywords drops as
+# non-alphanumeric, mapped to the aliases that should count as them. Plain
+# single words ("python", "docker") are left out because extract_keywords
+# already counts them; a single-word skill listed only for its aliases
+# ("postgresql") is matched through its aliases alone.
+SKILL_PHRASES = {
+    # Languages and runtimes
+    "c++": ["cpp", "cplusplus", "c plus plus"],
+    "c#": ["csharp", "c sharp"],
+    "f#": ["fsharp", "f sharp"],
+    "objective-c": ["objective c", "objc"],
+    ".net": ["dotnet", "dot net"],
+    "asp.net": ["asp.net core", "asp net", "aspnet"],
+    "node.js": ["nodejs", "node js"],
+    "vue.js": ["vuejs", "vue js"],
+    "react.js": ["reactjs", "react js"],
+    "react native": ["react-native"],
+    "next.js": ["nextjs", "next js"],
+    "nuxt.js": ["nuxtjs", "nuxt js"],
+    "express.js": ["expressjs", "express js"],
+    "nest.js": ["nestjs", "nest js"],
+    "three.js": ["threejs", "three js"],
+    "d3.js": ["d3js", "d3 js"],
+    "ember.js": ["emberjs", "ember js"],
+    "backbone.js": ["backbonejs"],
+    "socket.io": ["socketio", "socket io"],
+    "ruby on rails": ["rails", "ror"],
+    "spring boot": ["springboot", "spring-boot"],
+    "spring framework": ["spring mvc"],
+    "entity framework": ["ef core"],
+    "visual basic": ["vb.net", "vba"],
+    "shell scripting": ["bash scripting", "shell script"],
+    "pl/sql": ["plsql"],
+    "t-sql": ["tsql", "transact-sql"],
+    "html5": ["html 5"],
+    "css3": ["css 3"],
+    "es6": ["ecmascript 6", "es2015"],
+    # Data, ML and AI
+    "machine learning": ["ml engineering"],
+    "deep learning": ["deep neural networks"],
+    "reinforcement learning": [],
+    "transfer learning": [],
+    "natural language processing": ["nlp"],
+    "computer vision": [],
+    "large language models": ["large language model", "llms", "llm"],
+    "generative ai": ["gen ai", "genai"],
+    "prompt engineering": [],
+    "retrieval augmented generation": ["retrieval-augmented generation", "rag"],
+    "neural networks": ["neural network"],
+    "convolutional neural networks": ["convolutional neural network", "cnn", "cnns"],
+    "recurrent neural networks": ["recurrent neural network", "rnn", "rnns"],
+    "scikit-learn": ["scikit learn", "sklearn"],
+    "hugging face": ["huggingface", "hugging face transformers"],
+    "data science": [],
+    "data analysis": ["data analytics"],
+    "data engineering": [],
+    "data visualization": ["data visualisation", "dataviz"],
+    "data modeling": ["data modelling"],
+    "data warehousing": ["data warehouse"],
+    "big data": [],
+    "feature engineering": [],
+    "time series": ["time-series"],
+    "a/b testing": ["ab testing", "a/b tests", "split testing"],
+    "power bi": ["powerbi", "power-bi"],
+    "google analytics": [],
+    "apache spark": ["pyspark", "spark sql"],
+    "apache kafka": ["kafka streams"],
+    "apache airflow": ["airflow dags"],
+    "apache hadoop": ["hdfs", "mapreduce"],
+    "ms excel": ["microsoft excel", "advanced excel"],
+    # Databases
+    "sql server": ["ms sql", "mssql", "microsoft sql server"],
+    "postgresql": ["postgres"],
+    "mongodb": ["mongo db"],
+    "dynamodb": ["dynamo db"],
+    "nosql": ["no-sql", "no sql"],
+    "google bigquery": ["bigquery", "big query"],
+    # Cloud, DevOps and infrastructure
+    "ci/cd": ["cicd", "ci cd", "ci-cd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "amazon web services": ["aws"],
+    "google cloud platform": ["google cloud", "gcp"],
+    "microsoft azure": ["azure cloud"],
+    "aws lambda": ["lambda functions"],
+    "amazon s3": ["aws s3", "s3 buckets"],
+    "amazon ec2": ["aws ec2"],
+    "github actions": [],
+    "gitlab ci": ["gitlab ci/cd", "gitlab pipelines"],
+    "infrastructure as code": ["iac"],
+    "site reliability engineering": ["sre"],
+    "cloud computing": [],
+    "load balancing": ["load balancer", "load balancers"],
+    "unit testing": ["unit tests"],
+    "integration testing": ["integration tests"],
+    "end-to-end testing": ["end to end testing", "e2e testing", "e2e tests"],
+    "test-driven development": ["test driven development", "tdd"],
+    "behavior-driven development": ["behaviour driven development", "bdd"],
+    "version control": ["source control"],
+    "rest api": ["rest apis", "restful api", "restful apis", "restful services", "rest services"],
+    "graphql": ["graph ql"],
+    "grpc": ["g rpc"],
+    "web services": ["web service"],
+    "microservices": ["micro services", "micro-services", "microservice architecture"],
+    "event-driven architecture": ["event driven architecture"],
+    "distributed systems": ["distributed system", "distributed computing"],
+    "system design": ["systems design"],
+    "object-oriented programming": ["object oriented programming", "oop", "ood", "object-oriented design"],
+    "functional programming": [],
+    "data structures": ["data structure"],
+    "design patterns": ["design pattern"],
+    "operating systems": ["operating system"],
+    "computer networks": ["computer networking", "networking protocols"],
+    "tcp/ip": ["tcp ip"],
+    "linux administration": ["linux system administration", "linux sysadmin"],
+    # Web and mobile
+    "front end": ["front-end", "frontend"],
+    "back end": ["back-end", "backend"],
+    "full stack": ["full-stack", "fullstack"],
+    "web development": ["web dev"],
+    "mobile development": ["mobile app development"],
+    "responsive design": ["responsive web design"],
+    "user experience": ["ux design", "ux"],
+    "user interface": ["ui design", "ui"],
+    "ui/ux": ["ui ux", "ux/ui"],
+    "tailwind css": ["tailwindcss", "tailwind"],
+    "material ui": ["material-ui", "mui"],
+    "jquery": ["j query"],
+    "web sockets": ["websockets", "websocket"],
+    "progressive web apps": ["progressive web app", "pwa", "pwas"],
+    "search engine optimization": ["seo"],
+    # Security
+    "cyber security": ["cybersecurity", "cyber-security", "information security", "infosec"],
+    "penetration testing": ["pen testing", "pentesting"],
+    "identity and access management": ["iam"],
+    "oauth 2.0": ["oauth2", "oauth"],
+    # Process and roles
+    "agile methodologies": ["agile methodology", "agile development"],
+    "project management": [],
+    "product management": [],
+    "stakeholder management": [],
+    "code review": ["code reviews"],
+    "problem solving": ["problem-solving"],
+    "critical thinking": [],
+    "cross-functional teams": ["cross functional teams", "cross-functional collaboration"],
+    "software development life cycle": ["software development lifecycle", "sdlc"],
+    "software engineering": [],
+    "quality assurance": ["qa testing"],
+    "technical writing": ["technical documentation"],
+    "business intelligence": ["bi tools"],
+    "customer relationship management": ["crm"],
+    "enterprise resource planning": ["erp"]
+}
+
+class PhraseAutomaton:
+    """
+    Aho-Corasick automaton over a dictionary of phrases, which finds every
+    occurrence of every phrase in one left-to-right pass over the text,
+    whatever the size of the dictionary.
+
+    Phrases and text are matched lower-cased with whitespace runs collapsed,
+    and a match only counts when it is not glued to a letter or digit on
+    either side, so "java" does not match inside "javascript".
+    """
+
+    def __init__(self, phrases):
+        """
+        Args:
+            phrases (dict): Maps each phrase to the canonical name reported for it.
+        """
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [()]
+        for phrase, canonical in phrases.items():
+            self._add(normalize_text(phrase), canonical)
+        self._build_fail_links()
+        self.size = len(phrases)
+
+    def _add(self, phrase, canonical):
+        if not phrase:
+            return
+        state = 0
+        for ch in phrase:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(())
+            state = next_state
+        self._out[state] = self._out[state] + ((len(phrase), canonical),)
+
+    def _build_fail_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(ch, 0)
+                # A state also reports every phrase that ends at its fail state
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def scan(self, text):
+        """
+        Return a Counter of canonical names for every phrase occurrence in already-normalized text.
+        """
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        matches = Counter()
+        last = len(text) - 1
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if out[state]:
+                if i < last and text[i + 1].isalnum():
+                    continue
+                for length, canonical in out[state]:
+                    start = i - length + 1
+                    if start == 0 or not text[start - 1].isalnum():
+                        matches[canonical] += 1
+        return matches
+
+def normalize_text(text):
+    """
+    Lower-case text and collapse whitespace, so phrases match across line breaks.
+    """
+    return " ".join(text.lower().split())
+
+def load_skill_phrases(path=SKILL_PHRASES_PATH):
+    """
+    Return {phrase: canonical skill} for SKILL_PHRASES and their aliases,
+    plus the entries of the optional JSON dictionary at path.
+    """
+    skills = dict(SKILL_PHRASES)
+    if path:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                skills.update(json.load(f))
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load skill phrases from {path}: {e}")
+
+    phrases = {}
+    for canonical, aliases in skills.items():
+        canonical = normalize_text(canonical)
+        # extract_keywords already counts a single alphanumeric word once per mention
+        if not canonical.isalnum():
+            phrases[canonical] = canonical
+        for alias in aliases:
+            phrases.setdefault(normalize_text(alias), canonical)
+    return phrases
+
+_automaton = None
+_automaton_lock = threading.Lock()
+
+def get_automaton():
+    """
+    Return the automaton over the skill dictionary, compiling it on first use.
+    """
+    global _automaton
+    if _automaton is None:
+        with _automaton_lock:
+            if _automaton is None:
+                _automaton = PhraseAutomaton(load_skill_phrases())
+    return _automaton
+
+def match_skill_phrases(text):
+    """
+    Count the occurrences of every dictionary skill (under its canonical name) in raw text.
+    """
+    return get_automaton().scan(normalize_text(text))
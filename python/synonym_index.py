@@ -0,0 +1,325 @@
+import os
+import sys
+import mmap
+import zlib
+import time
+import struct
+import argparse
+
+# Bump when the file layout or the morphology rules below change
+FORMAT_VERSION = 1
+MAGIC = b"FCSYNIDX"
+DEFAULT_INDEX_PATH = os.getenv(
+    "SYNONYM_INDEX_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "synonym_index.bin")
+)
+
+# Part-of-speech order used by wordnet.synsets() when no POS is given
+POS_ORDER = ("n", "v", "a", "r")
+
+# WordNet's detachment rules, as applied by nltk's WordNetCorpusReader._morphy
+MORPHOLOGICAL_SUBSTITUTIONS = {
+    "n": (("s", ""), ("ses", "s"), ("ves", "f"), ("xes", "x"), ("zes", "z"),
+          ("ches", "ch"), ("shes", "sh"), ("men", "man"), ("ies", "y")),
+    "v": (("s", ""), ("ies", "y"), ("es", "e"), ("es", ""), ("ed", "e"),
+          ("ed", ""), ("ing", "e"), ("ing", "")),
+    "a": (("er", ""), ("est", ""), ("er", "e"), ("est", "e")),
+    "r": ()
+}
+MORPHOLOGICAL_SUBSTITUTIONS["s"] = MORPHOLOGICAL_SUBSTITUTIONS["a"]
+
+# Header: magic, format version, string count, record count, hash slot count,
+# reference count, blob size, then the source versions as fixed-width text
+_HEADER = struct.Struct("<8sIIIIII16s16s")
+# Record: key string id, POS bitmask, then (start, count) into the reference
+# array for the synonyms of each POS, then the same for its exception bases
+_RECORD_FIELDS = 2 + 4 * 2 * 2
+
+class SynonymIndexError(Exception):
+    """Raised when an index file is missing, corrupt or built for another format version."""
+
+class SynonymIndex:
+    """
+    Read-only, memory-mapped WordNet lemma and synonym index.
+
+    The file holds a string table, a table of per-word records (which parts of
+    speech the word is a lemma for, the lemma names of its synsets, and its
+    morphological exceptions) and an open-addressing hash table over the
+    records. Lookups hash the word with CRC-32 and probe the table directly in
+    the mapping, so nothing is parsed at load time and the pages are shared by
+    every process that maps the same file.
+    """
+
+    def __init__(self, path=DEFAULT_INDEX_PATH):
+        self.path = path
+        try:
+            with open(path, "rb") as f:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise SynonymIndexError(f"Cannot open synonym index {path}: {e}")
+
+        if len(self._mm) < _HEADER.size:
+            raise SynonymIndexError(f"Synonym index {path} is truncated")
+        (magic, version, n_strings, n_records, n_slots, n_refs, blob_size,
+         wordnet_version, nltk_version) = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise SynonymIndexError(f"{path} is not a synonym index")
+        if version != FORMAT_VERSION:
+            raise SynonymIndexError(
+                f"Synonym index {path} has format version {version}, expected {FORMAT_VERSION}. Rebuild it"
+            )
+        self.wordnet_version = wordnet_version.rstrip(b"\0").decode()
+        self.nltk_version = nltk_version.rstrip(b"\0").decode()
+
+        view = memoryview(self._mm)
+        offset = _HEADER.size
+        self._string_offsets = view[offset:offset + (n_strings + 1) * 4].cast("I")
+        offset += (n_strings + 1) * 4
+        self._records = view[offset:offset + n_records * _RECORD_FIELDS * 4].cast("I")
+        offset += n_records * _RECORD_FIELDS * 4
+        self._slots = view[offset:offset + n_slots * 4].cast("I")
+        offset += n_slots * 4
+        self._refs = view[offset:offset + n_refs * 4].cast("I")
+        offset += n_refs * 4
+        self._blob_start = offset
+        if offset + blob_size != len(self._mm):
+            raise SynonymIndexError(f"Synonym index {path} is truncated or corrupt")
+
+        self._mask = n_slots - 1
+        self.n_words = n_records
+
+    def _string(self, sid):
+        start = self._blob_start + self._string_offsets[sid]
+        end = self._blob_start + self._string_offsets[sid + 1]
+        return self._mm[start:end].decode("utf-8")
+
+    def _record(self, word):
+        """Return the record number of a word, or -1."""
+        key = word.encode("utf-8")
+        slot = zlib.crc32(key) & self._mask
+        while True:
+            entry = self._slots[slot]
+            if entry == 0:
+                return -1
+            record = entry - 1
+            sid = self._records[record * _RECORD_FIELDS]
+            start = self._blob_start + self._string_offsets[sid]
+            end = self._blob_start + self._string_offsets[sid + 1]
+            if self._mm[start:end] == key:
+                return record
+            slot = (slot + 1) & self._mask
+
+    def _refs_at(self, record, field):
+        base = record * _RECORD_FIELDS + field
+        start, count = self._records[base], self._records[base + 1]
+        return [self._string(sid) for sid in self._refs[start:start + count]]
+
+    def _morphy_records(self, form, pos):
+        """(base form, record number) pairs for the base forms of a word, in nltk's order."""
+        pos_index = POS_ORDER.index("a" if pos == "s" else pos)
+        bit = 1 << pos_index
+        form_record = self._record(form)
+        exceptions = None
+        if form_record >= 0:
+            exceptions = self._refs_at(form_record, 2 + 8 + pos_index * 2) or None
+        if exceptions is not None:
+            forms = exceptions
+        else:
+            forms = [form[:-len(old)] + new for old, new in MORPHOLOGICAL_SUBSTITUTIONS[POS_ORDER[pos_index]]
+                     if form.endswith(old)]
+
+        result = []
+        seen = set()
+        for candidate in [form] + forms:
+            if candidate in seen:
+                continue
+            record = form_record if candidate == form else self._record(candidate)
+            if record >= 0 and self._records[record * _RECORD_FIELDS + 1] & bit:
+                result.append((candidate, record))
+                seen.add(candidate)
+        return result
+
+    def is_lemma(self, word, pos):
+        record = self._record(word)
+        bit = 1 << POS_ORDER.index("a" if pos == "s" else pos)
+        return record >= 0 and bool(self._records[record * _RECORD_FIELDS + 1] & bit)
+
+    def synonyms_for_lemma(self, lemma, pos):
+        """Lemma names of all synsets of a base form for one POS, in WordNet order."""
+        record = self._record(lemma)
+        if record < 0:
+            return []
+        return self._refs_at(record, 2 + POS_ORDER.index(pos) * 2)
+
+    def exceptions(self, word, pos):
+        """The exception-list base forms of an irregular word for one POS, or None."""
+        record = self._record(word)
+        if record < 0:
+            return None
+        return self._refs_at(record, 2 + 8 + POS_ORDER.index(pos) * 2) or None
+
+    def morphy(self, form, pos):
+        """The base forms of a word for one POS, as nltk's _morphy computes them."""
+        return [candidate for candidate, _ in self._morphy_records(form, pos)]
+
+    def lemmatize(self, word, pos="n"):
+        """Same result as nltk's WordNetLemmatizer().lemmatize(word, pos)."""
+        lemmas = self.morphy(word, pos)
+        return min(lemmas, key=len) if lemmas else word
+
+    def synonyms(self, word):
+        """
+        Lower-cased lemma names of every synset of a word across all parts of
+        speech, in the order of [l.name() for s in wordnet.synsets(word) for l in s.lemmas()].
+        """
+        word = word.lower()
+        return [
+            name.lower()
+            for pos_index, pos in enumerate(POS_ORDER)
+            for _, record in self._morphy_records(word, pos)
+            for name in self._refs_at(record, 2 + pos_index * 2)
+        ]
+
+    def expand(self, word, pos):
+        """Return (lemma, synonyms) for a word and WordNet POS, like new.expand_keyword."""
+        return self.lemmatize(word, pos), tuple(self.synonyms(word))
+
+    def close(self):
+        self._string_offsets.release()
+        self._records.release()
+        self._slots.release()
+        self._refs.release()
+        self._mm.close()
+
+def build_index(output_path=DEFAULT_INDEX_PATH):
+    """
+    Compile WordNet (through nltk) into an index file. The file is written
+    next to the target and renamed into place, so readers never see a partial file.
+
+    Returns:
+        dict: Counts and sizes describing the built index.
+    """
+    import nltk
+    from nltk.corpus import wordnet
+
+    wordnet.ensure_loaded()
+    lemma_map = wordnet._lemma_pos_offset_map
+    exception_map = wordnet._exception_map
+
+    strings = {}
+    def sid(text):
+        if text not in strings:
+            strings[text] = len(strings)
+        return strings[text]
+
+    words = set(lemma_map)
+    for pos in POS_ORDER:
+        words.update(exception_map[pos])
+    words = sorted(words)
+
+    refs = []
+    records = []
+    for word in words:
+        record = [sid(word), 0]
+        offsets_by_pos = lemma_map.get(word, {})
+        for i, pos in enumerate(POS_ORDER):
+            offsets = offsets_by_pos.get(pos, [])
+            if offsets:
+                record[1] |= 1 << i
+            names = [
+                lemma.name().lower()
+                for offset in offsets
+                for lemma in wordnet.synset_from_pos_and_offset(pos, offset).lemmas()
+            ]
+            record += [len(refs), len(names)]
+            refs.extend(sid(name) for name in names)
+        for pos in POS_ORDER:
+            bases = exception_map[pos].get(word, [])
+            record += [len(refs), len(bases)]
+            refs.extend(sid(base) for base in bases)
+        records.append(record)
+
+    n_slots = 1
+    while n_slots < len(records) * 2:
+        n_slots *= 2
+    slots = [0] * n_slots
+    for number, word in enumerate(words):
+        slot = zlib.crc32(word.encode("utf-8")) & (n_slots - 1)
+        while slots[slot]:
+            slot = (slot + 1) & (n_slots - 1)
+        slots[slot] = number + 1
+
+    encoded = [text.encode("utf-8") for text in sorted(strings, key=strings.get)]
+    string_offsets = [0]
+    for data in encoded:
+        string_offsets.append(string_offsets[-1] + len(data))
+    blob = b"".join(encoded)
+
+    header = _HEADER.pack(
+        MAGIC, FORMAT_VERSION, len(encoded), len(records), n_slots, len(refs), len(blob),
+        wordnet.get_version().encode()[:16], nltk.__version__.encode()[:16]
+    )
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(struct.pack(f"<{len(string_offsets)}I", *string_offsets))
+        f.write(struct.pack(f"<{len(records) * _RECORD_FIELDS}I", *(v for record in records for v in record)))
+        f.write(struct.pack(f"<{n_slots}I", *slots))
+        f.write(struct.pack(f"<{len(refs)}I", *refs))
+        f.write(blob)
+    os.replace(tmp_path, output_path)
+
+    return {
+        "words": len(records),
+        "strings": len(encoded),
+        "references": len(refs),
+        "slots": n_slots,
+        "bytes": os.path.getsize(output_path)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Build or inspect the compiled WordNet synonym index")
+    parser.add_argument('--index', default=DEFAULT_INDEX_PATH, help="Path of the index file")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('build', help="Compile WordNet into the index (requires the NLTK wordnet corpus)")
+    subparsers.add_parser('info', help="Show the index version and size")
+    subparsers.add_parser('check', help="Exit non-zero if the index is missing or older than the installed WordNet/NLTK")
+    lookup = subparsers.add_parser('lookup', help="Show the lemma and synonyms of words")
+    lookup.add_argument('words', nargs='+')
+    lookup.add_argument('--pos', default='n', choices=['n', 'v', 'a', 'r'])
+    args = parser.parse_args()
+
+    if args.command == 'build':
+        start = time.perf_counter()
+        stats = build_index(args.index)
+        print(f"✅ Built {args.index} in {time.perf_counter() - start:.1f}s: "
+              f"{stats['words']} words, {stats['references']} synonym references, {stats['bytes'] / 1e6:.1f} MB")
+        return
+
+    try:
+        index = SynonymIndex(args.index)
+    except SynonymIndexError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    if args.command == 'info':
+        print(f"Index: {index.path}")
+        print(f"Format version: {FORMAT_VERSION}")
+        print(f"Built from WordNet {index.wordnet_version} with NLTK {index.nltk_version}")
+        print(f"Words: {index.n_words}, size: {os.path.getsize(index.path) / 1e6:.1f} MB")
+    elif args.command == 'check':
+        import nltk
+        from nltk.corpus import wordnet
+        current = (wordnet.get_version(), nltk.__version__)
+        if (index.wordnet_version, index.nltk_version) != current:
+            print(f"❌ Index was built from WordNet {index.wordnet_version} with NLTK {index.nltk_version}, "
+                  f"installed are WordNet {current[0]} with NLTK {current[1]}. Run: python synonym_index.py build")
+            sys.exit(1)
+        print("✅ Index is up to date")
+    elif args.command == 'lookup':
+        for word in args.words:
+            lemma, synonyms = index.expand(word.lower(), args.pos)
+            print(f"{word}: lemma={lemma}, synonyms={', '.join(dict.fromkeys(synonyms)) or '-'}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+import os
+import sys
+
+# The python/, backend/ and Scrapper/ scripts import each other by module name
+root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+for directory in ('python', 'backend', 'Scrapper'):
+    path = os.path.join(root, directory)
+    if path not in sys.path:
+        sys.path.insert(0, path)
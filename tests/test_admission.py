@@ -0,0 +1,42 @@
+import io
+import asyncio
+
+import admission
+
+def test_process_cv_is_classed_by_mode():
+    assert admission.process_cv_endpoint(None) == 'process-cv'
+    assert admission.process_cv_endpoint(' Parse ') == 'process-cv'
+    assert admission.process_cv_endpoint('analyze') == 'process-cv-analyze'
+    assert admission.ENDPOINT_CLASSES['process-cv'] == 'cpu'
+    assert admission.ENDPOINT_CLASSES['process-cv-analyze'] == 'llm'
+
+def _record_limiters(monkeypatch, tmp_path):
+    monkeypatch.setattr(admission, 'ADMISSION_CONTROL', True)
+    controller = admission.AdmissionController(str(tmp_path / 'limits.json'))
+    names = []
+    limiter = controller.limiter
+    monkeypatch.setattr(controller, 'limiter', lambda name: names.append(name) or limiter(name))
+    monkeypatch.setattr(admission, 'get_controller', lambda: controller)
+    return names
+
+def test_flask_process_cv_uses_the_mode_limiter(monkeypatch, tmp_path):
+    import app
+    names = _record_limiters(monkeypatch, tmp_path)
+    client = app.app.test_client()
+    for mode in ('parse', 'analyze'):
+        client.post('/api/process-cv', data={'mode': mode, 'cv_file': (io.BytesIO(b'not a resume'), 'cv.txt')})
+    assert names == ['process-cv', 'process-cv-analyze']
+
+def test_quart_process_cv_uses_the_mode_limiter(monkeypatch, tmp_path):
+    import asgi
+    from quart.datastructures import FileStorage
+    names = _record_limiters(monkeypatch, tmp_path)
+
+    async def main():
+        client = asgi.app.test_client()
+        for mode in ('parse', 'analyze'):
+            await client.post('/api/process-cv', form={'mode': mode},
+                              files={'cv_file': FileStorage(io.BytesIO(b'not a resume'), 'cv.txt')})
+
+    asyncio.run(main())
+    assert names == ['process-cv', 'process-cv-analyze']
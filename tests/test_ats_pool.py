@@ -0,0 +1,50 @@
+import os
+
+import pytest
+
+import ats_pool
+
+def _no_init():
+    pass
+
+def _crash_once(marker):
+    def score(resume_text, job_description):
+        if not os.path.exists(marker):
+            open(marker, 'w').close()
+            os._exit(1)
+        return {"ats_score": 50.0}
+    return score
+
+def _crash(resume_text, job_description):
+    os._exit(1)
+
+_crash_first = None
+
+def _score_with_crash_first(resume_text, job_description):
+    return _crash_first(resume_text, job_description)
+
+@pytest.fixture(autouse=True)
+def fresh_pool(monkeypatch):
+    monkeypatch.setattr(ats_pool, '_init_worker', _no_init)
+    ats_pool._pool = None
+    yield
+    if ats_pool._pool is not None:
+        ats_pool._pool.shutdown(wait=True, cancel_futures=True)
+        ats_pool._pool = None
+
+def test_crashed_worker_pool_is_replaced(tmp_path, monkeypatch):
+    global _crash_first
+    _crash_first = _crash_once(os.path.join(tmp_path, 'crashed'))
+    monkeypatch.setattr(ats_pool, 'score_resume_text', _score_with_crash_first)
+    assert ats_pool.score("resume", "job") == {"ats_score": 50.0}
+    # Later requests keep working on the new pool
+    assert ats_pool.score("resume", "job") == {"ats_score": 50.0}
+
+def test_pool_that_keeps_breaking_is_unavailable(monkeypatch):
+    monkeypatch.setattr(ats_pool, 'score_resume_text', _crash)
+    result = ats_pool.score("resume", "job")
+    assert result.get("unavailable")
+
+def test_warm_up_starts_every_worker(monkeypatch):
+    monkeypatch.setattr(ats_pool, 'ATS_WORKERS', 3)
+    assert ats_pool.warm_up()["workers"] == 3
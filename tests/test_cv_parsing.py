@@ -0,0 +1,12 @@
+import CV
+
+def test_bare_bullet_line_in_experience():
+    data = CV.parse_resume_text("Experience\n•\nSoftware Engineer Jan 2020 - Present\n")
+    assert data["experience"] == [{"title": "Software Engineer", "duration": "Jan 2020 - Present"}]
+
+def test_bare_bullet_line_in_education():
+    data = CV.parse_resume_text("Education\n-\nBachelor of Science\n")
+    assert data["education"] == [{"degree": "Bachelor of Science"}]
+
+def test_split_date_of_empty_text():
+    assert CV._split_date("") == ("", None)
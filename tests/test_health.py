@@ -0,0 +1,14 @@
+import app
+
+def test_health_is_ready_when_warm_up_never_started(monkeypatch):
+    monkeypatch.setattr(app, 'WARM_UP_STATUS', {name: "cold" for name in app.WARM_UP})
+    response = app.app.test_client().get('/api/health')
+    assert response.status_code == 200
+    assert response.json['status'] == "ready"
+    assert set(response.json['subsystems'].values()) <= {"cold"}
+
+def test_health_is_starting_while_warming_up(monkeypatch):
+    monkeypatch.setattr(app, 'WARM_UP_STATUS', {"nlp": "starting", "cv": "ready"})
+    response = app.app.test_client().get('/api/health')
+    assert response.status_code == 503
+    assert response.json['status'] == "starting"
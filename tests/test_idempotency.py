@@ -0,0 +1,44 @@
+import os
+import time
+import asyncio
+import threading
+
+import idempotency
+from idempotency import IdempotencyStore, resolve_key, client_identity
+
+def test_derived_keys_are_scoped_per_client(monkeypatch):
+    monkeypatch.setattr(idempotency, 'IDEMPOTENCY_AUTO_KEYS', True)
+    alice = client_identity(['10.0.0.1'], 'browser')
+    bob = client_identity(['10.0.0.2'], 'browser')
+    assert resolve_key('/api/compare', None, 'abc', alice)[0] != resolve_key('/api/compare', None, 'abc', bob)[0]
+    assert resolve_key('/api/compare', None, 'abc', alice)[0] == resolve_key('/api/compare', None, 'abc', alice)[0]
+
+def test_duplicate_wakes_when_original_completes(tmp_path):
+    store = IdempotencyStore(os.path.join(tmp_path, 'keys.db'))
+    assert store.begin('k', 'fp')[0] == idempotency.NEW
+    calls = []
+    begin = store.begin
+    store.begin = lambda *args: calls.append(args) or begin(*args)
+    threading.Timer(0.2, store.complete, ('k', 200, 'application/json', b'{}', 60)).start()
+    start = time.monotonic()
+    state, stored = store.acquire('k', 'fp', wait=5)
+    assert state == idempotency.DONE and stored[2] == b'{}'
+    assert time.monotonic() - start < 2
+    # One check before waiting and one after, no polling in between
+    assert len(calls) == 2
+
+def test_duplicate_gives_up_after_the_cap(tmp_path):
+    store = IdempotencyStore(os.path.join(tmp_path, 'keys.db'))
+    store.begin('k', 'fp')
+    assert store.acquire('k', 'fp', wait=0.1)[0] == idempotency.IN_FLIGHT
+
+def test_async_duplicate_wakes_when_original_is_abandoned(tmp_path):
+    store = IdempotencyStore(os.path.join(tmp_path, 'keys.db'))
+    store.begin('k', 'fp')
+
+    async def main():
+        asyncio.get_running_loop().call_later(0.2, lambda: threading.Thread(target=store.abandon, args=('k',)).start())
+        return await store.acquire_async('k', 'fp', wait=5)
+
+    # The abandoned key is claimed by the waiting duplicate, which then runs
+    assert asyncio.run(main())[0] == idempotency.NEW
@@ -0,0 +1,54 @@
+import io
+import time
+
+import pytest
+from PyPDF2 import PdfWriter
+
+import CV
+
+def _blank_pdf(pages):
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=200, height=200)
+    stream = io.BytesIO()
+    writer.write(stream)
+    return stream.getvalue()
+
+def _label_range(source, start, stop):
+    return [f"page {i}" for i in range(start, stop)]
+
+def _hang(source, start, stop):
+    time.sleep(60)
+
+@pytest.fixture(autouse=True)
+def fresh_pool():
+    CV._pdf_pool = None
+    yield
+    if CV._pdf_pool is not None:
+        CV._discard_pdf_pool(CV._pdf_pool)
+
+def test_each_worker_gets_one_contiguous_range(monkeypatch):
+    monkeypatch.setattr(CV, '_extract_pdf_page_range', _label_range)
+    submitted = []
+    pool = CV._get_pdf_pool()
+    submit = pool.submit
+    monkeypatch.setattr(pool, 'submit', lambda fn, *args: submitted.append(args[1:]) or submit(fn, *args))
+    pages = list(CV.iter_pdf_pages(_blank_pdf(20), workers=3))
+    assert pages == [f"page {i}" for i in range(20)]
+    assert submitted == [(0, 7), (7, 14), (14, 20)]
+
+def test_timeout_kills_the_workers(monkeypatch):
+    monkeypatch.setattr(CV, '_extract_pdf_page_range', _hang)
+    pool = CV._get_pdf_pool()
+    processes = []
+    discard = CV._discard_pdf_pool
+    monkeypatch.setattr(CV, '_discard_pdf_pool', lambda p: processes.extend(p._processes.values()) or discard(p))
+    start = time.monotonic()
+    with pytest.raises(CV.ExtractionLimitError):
+        list(CV.iter_pdf_pages(_blank_pdf(20), time_budget=0.5, workers=2))
+    assert time.monotonic() - start < 5
+    assert processes
+    for process in processes:
+        process.join(timeout=5)
+        assert not process.is_alive()
+    assert CV._pdf_pool is not pool
@@ -0,0 +1,44 @@
+import os
+import json
+import sqlite3
+
+from bs4 import BeautifulSoup
+
+import scrapper
+from models import Profile, clean_text
+from analysis_store import AnalysisStore
+
+def test_repeated_words_are_kept():
+    assert clean_text("New York New York") == "New York New York"
+    assert clean_text("Sam Sam") == "Sam Sam"
+    assert clean_text("  Software   Engineer ") == "Software Engineer"
+    assert clean_text("Name not found") is None
+
+def test_about_heading_is_stripped_only_as_a_heading():
+    assert Profile.from_dict({'about': "About me and my work"}).about == "About me and my work"
+    assert Profile.from_dict({'about': "AboutAbout\n\n\nLearning day by day"}).about == "Learning day by day"
+    assert Profile.from_dict({'about': "About\n\nLearning day by day"}).about == "Learning day by day"
+
+def test_visible_text_drops_screen_reader_copy():
+    soup = BeautifulSoup(
+        '<section><h2><span aria-hidden="true">About</span><span class="visually-hidden">About</span></h2>'
+        '<div><span aria-hidden="true">New York New York</span>'
+        '<span class="visually-hidden">New York New York</span></div></section>', 'lxml')
+    assert scrapper.visible_text(soup.find('div')) == "New York New York"
+    assert scrapper.visible_text(soup.find('h2')) == "About"
+    plain = BeautifulSoup('<h1>Sam Sam</h1>', 'lxml')
+    assert scrapper.visible_text(plain.find('h1')) == "Sam Sam"
+
+def test_stored_rows_are_not_rewritten(tmp_path):
+    path = os.path.join(tmp_path, 'analyses.db')
+    AnalysisStore(path)
+    raw = {'url': 'https://www.linkedin.com/in/sam', 'name': 'Sam  Sam', 'headline': 'Headline not found'}
+    connection = sqlite3.connect(path)
+    connection.execute("INSERT INTO profiles VALUES (?, ?, ?, ?, ?, ?)",
+                       ('sam', raw['url'], raw['name'], raw['headline'], json.dumps(raw), 1.0))
+    connection.commit()
+    store = AnalysisStore(path)
+    profile = store.get_profile('sam')
+    assert profile['name'] == "Sam Sam"
+    assert profile['headline'] is None
+    assert json.loads(connection.execute("SELECT data FROM profiles").fetchone()[0]) == raw
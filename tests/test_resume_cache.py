@@ -0,0 +1,67 @@
+import os
+import json
+import asyncio
+
+import pytest
+
+import resume_cache
+from resume_cache import ResumeCache, hash_bytes
+
+def _key(i):
+    return hash_bytes(str(i).encode())
+
+def _disk_total(directory):
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+def test_disk_writes_do_not_rescan_below_the_budget(tmp_path, monkeypatch):
+    cache = ResumeCache(disk_dir=str(tmp_path), max_disk_bytes=10 * 1024 * 1024)
+    scans = []
+    listdir = os.listdir
+    monkeypatch.setattr(resume_cache.os, 'listdir', lambda path: scans.append(path) or listdir(path))
+    for i in range(50):
+        cache.put(_key(i), {"text": "x" * 100, "i": i})
+    # Only the first write scans, to learn what earlier runs left on disk
+    assert len(scans) == 1
+    assert cache._disk_bytes == _disk_total(str(tmp_path))
+
+def test_disk_tier_stays_within_budget(tmp_path):
+    cache = ResumeCache(disk_dir=str(tmp_path), max_disk_bytes=2000)
+    for i in range(40):
+        cache.put(_key(i), {"text": "x" * 100, "i": i})
+        # Rewriting an entry replaces its size rather than adding to it
+        cache.put(_key(i), {"text": "y" * 100, "i": i})
+    assert _disk_total(str(tmp_path)) <= 2000
+    assert cache._disk_bytes == _disk_total(str(tmp_path))
+    assert cache.get(_key(39))["text"] == "y" * 100
+
+def _outside_entry(tmp_path):
+    # A valid cache record next to, not inside, the cache directory
+    (tmp_path / "outside.json").write_text(json.dumps(
+        {"version": 1, "entry": {"text": "secret", "resume_data": {}}}))
+    return ResumeCache(disk_dir=str(tmp_path / "cache"))
+
+def test_keys_that_are_not_hashes_are_refused(tmp_path):
+    cache = _outside_entry(tmp_path)
+    assert cache.get("../outside") is None
+    assert cache.get(_key(1).upper()) is None
+    with pytest.raises(ValueError):
+        cache.put("../outside", {"text": "x"})
+    assert os.listdir(tmp_path / "cache") == []
+
+def test_routes_reject_a_resume_hash_that_is_not_a_hash(tmp_path, monkeypatch):
+    import CV
+    import app
+    import asgi
+    monkeypatch.setattr(CV, 'resume_cache', _outside_entry(tmp_path))
+    form = {'resume_hash': '../outside', 'job_description': 'Python developer'}
+    client = app.app.test_client()
+    for path in ('/api/ats-score', '/api/analyze-resume'):
+        response = client.post(path, data=form)
+        assert response.status_code == 400
+        assert 'secret' not in response.get_data(as_text=True)
+
+    async def main():
+        client = asgi.app.test_client()
+        return [(await client.post(path, form=form)).status_code
+                for path in ('/api/ats-score', '/api/analyze-resume')]
+    assert asyncio.run(main()) == [400, 400]
@@ -0,0 +1,46 @@
+import os
+from collections import Counter
+
+from resume_index import ResumeIndex
+
+def _index():
+    index = ResumeIndex()
+    index.add("a", Counter({"python": 3, "sql": 1}))
+    index.add("b", Counter({"python": 1, "docker": 2}))
+    for i in range(1000):
+        index.add(f"filler{i}", Counter({f"term{i}": 1}))
+    return index
+
+class _CountingDict(dict):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.iterated = 0
+
+    def items(self):
+        self.iterated += 1
+        return super().items()
+
+def test_remove_touches_only_the_documents_postings():
+    index = _index()
+    index.postings = _CountingDict(index.postings)
+    assert index.remove("a")
+    assert index.postings.iterated == 0
+    assert "sql" not in index.postings
+    assert index.postings["python"] == {"b": 1}
+    assert index.max_weights["python"] == 1
+    assert not index.remove("a")
+
+def test_re_adding_replaces_the_documents_terms():
+    index = _index()
+    index.add("a", Counter({"java": 2}))
+    assert "python" in index.postings and "a" not in index.postings["python"]
+    assert "sql" not in index.postings
+    assert [result["id"] for result in index.search(Counter({"java": 1}), k=1)] == ["a"]
+
+def test_loaded_index_can_remove(tmp_path):
+    path = os.path.join(tmp_path, "index.json")
+    _index().save(path)
+    index = ResumeIndex.load(path)
+    assert index.remove("b")
+    assert "docker" not in index.postings
+    assert index.postings["python"] == {"a": 3}
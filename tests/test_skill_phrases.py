@@ -0,0 +1,19 @@
+import new
+from skill_phrases import match_skill_phrases
+
+def test_single_word_skills_count_once_per_mention():
+    counts = new.extract_keywords("Experience with PostgreSQL, GraphQL and microservices.")
+    assert counts["postgresql"] == 1
+    assert counts["graphql"] == 1
+    assert counts["microservices"] == 1
+    assert new.extract_keywords("postgresql postgresql")["postgresql"] == 2
+
+def test_aliases_still_map_to_single_word_skills():
+    assert match_skill_phrases("Postgres and Mongo DB")["postgresql"] == 1
+    assert match_skill_phrases("Postgres and Mongo DB")["mongodb"] == 1
+
+def test_phrases_and_symbols_are_matched():
+    counts = new.extract_keywords("Machine learning in C++ and Node.js")
+    assert counts["machine learning"] == 1
+    assert counts["c++"] == 1
+    assert counts["node.js"] == 1